@@ -1,8 +1,10 @@
+import logging
 from logging.config import fileConfig
 from alembic import context
 
 from src.backend.models import SQLModel
-from src.backend.database import engine
+from src.backend.database import engine, make_engine
+from src.backend.shards import shard_router
 
 # Alembic Config
 config = context.config
@@ -14,19 +16,31 @@ if config.config_file_name is not None:
 # Use SQLModel metadata
 target_metadata = SQLModel.metadata
 
+logger = logging.getLogger("alembic.env")
 
-def run_migrations_online() -> None:
-    connectable = engine
 
-    with connectable.connect() as connection:
-        context.configure(
-            connection=connection,
-            target_metadata=target_metadata,
-            compare_type=True,
-        )
+# The directory database, then every shard the app is configured with (DATABASE_SHARDS /
+# DATABASE_SHARD_URLS). Every database gets the whole schema, like create_all at startup.
+# One database only: alembic -x db_url=sqlite:///hoainfo_shard0.db upgrade head
+def _connectables():
+    db_url = context.get_x_argument(as_dictionary=True).get("db_url")
+    if db_url:
+        return [make_engine(db_url)]
+    return [engine] + [shard.engine for shard in shard_router.shards.values() if shard.engine is not engine]
+
 
-        with context.begin_transaction():
-            context.run_migrations()
+def run_migrations_online() -> None:
+    for connectable in _connectables():
+        logger.info("Migrating %s", connectable.url)
+        with connectable.connect() as connection:
+            context.configure(
+                connection=connection,
+                target_metadata=target_metadata,
+                compare_type=True,
+            )
+
+            with context.begin_transaction():
+                context.run_migrations()
 
 
 if context.is_offline_mode():
@@ -0,0 +1,50 @@
+"""Add refresh tokens with rotation families
+
+Revision ID: 1a6f4c8e3b95
+Revises: d7c3a5e1f902
+Create Date: 2026-10-18 23:04:51.217804
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1a6f4c8e3b95'
+down_revision: Union[str, None] = 'd7c3a5e1f902'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('refresh_token',
+    sa.Column('id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('token_hash', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('user_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('family_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('issued_at', sa.DateTime(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.Column('used_at', sa.DateTime(), nullable=True),
+    sa.Column('revoked_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # Exchanges look tokens up by digest; sign-out and replay revoke by family
+    op.create_index('ix_refresh_token_token_hash', 'refresh_token', ['token_hash'], unique=True)
+    op.create_index('ix_refresh_token_user_id', 'refresh_token', ['user_id'], unique=False)
+    op.create_index('ix_refresh_token_family_id', 'refresh_token', ['family_id'], unique=False)
+    # Workers rebuild their Bloom filter from families revoked within one token lifetime
+    op.create_index('ix_refresh_token_revoked_at', 'refresh_token', ['revoked_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_refresh_token_revoked_at', table_name='refresh_token')
+    op.drop_index('ix_refresh_token_family_id', table_name='refresh_token')
+    op.drop_index('ix_refresh_token_user_id', table_name='refresh_token')
+    op.drop_index('ix_refresh_token_token_hash', table_name='refresh_token')
+    op.drop_table('refresh_token')
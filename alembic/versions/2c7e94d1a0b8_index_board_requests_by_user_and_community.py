@@ -0,0 +1,35 @@
+"""Index board verification requests by user and community
+
+Revision ID: 2c7e94d1a0b8
+Revises: f4a9c27e8b61
+Create Date: 2026-10-18 20:02:45.731806
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c7e94d1a0b8'
+down_revision: Union[str, None] = 'f4a9c27e8b61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # /board/request and /board/requests/my filter by user_id; /board/requests by community_id
+    op.create_index(
+        'ix_boardverificationrequest_user_id', 'boardverificationrequest', ['user_id'], unique=False
+    )
+    op.create_index(
+        'ix_boardverificationrequest_community_id', 'boardverificationrequest', ['community_id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_boardverificationrequest_community_id', table_name='boardverificationrequest')
+    op.drop_index('ix_boardverificationrequest_user_id', table_name='boardverificationrequest')
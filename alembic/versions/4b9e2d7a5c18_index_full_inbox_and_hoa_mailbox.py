@@ -0,0 +1,35 @@
+"""Index the full inbox and the HOA mailbox
+
+Revision ID: 4b9e2d7a5c18
+Revises: e1b7c3f9a284
+Create Date: 2026-10-19 10:41:52.907316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b9e2d7a5c18'
+down_revision: Union[str, None] = 'e1b7c3f9a284'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The full inbox can't use (recipient_id, read, ...) in timestamp order; this one walks it unsorted
+    op.create_index('ix_message_recipient_timestamp_id', 'message', ['recipient_id', 'timestamp', 'id'], unique=False)
+    # Messages addressed to the HOA (recipient_id IS NULL), per community, for its board members
+    op.create_index(
+        'ix_message_community_recipient_timestamp_id', 'message',
+        ['community_id', 'recipient_id', 'timestamp', 'id'], unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_message_community_recipient_timestamp_id', table_name='message')
+    op.drop_index('ix_message_recipient_timestamp_id', table_name='message')
@@ -0,0 +1,35 @@
+"""Add composite complaint index for keyset pagination
+
+Revision ID: 5b1e7c2d9a40
+Revises: a0804c3f320b
+Create Date: 2026-10-18 16:02:11.408213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1e7c2d9a40'
+down_revision: Union[str, None] = 'a0804c3f320b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keyset cursors compare (timestamp, id); NULL timestamps would fall out of every page
+    op.execute("UPDATE complaint SET timestamp = '1970-01-01 00:00:00' WHERE timestamp IS NULL")
+    op.create_index(
+        'ix_complaint_community_timestamp_id',
+        'complaint',
+        ['community_id', 'timestamp', 'id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_complaint_community_timestamp_id', table_name='complaint')
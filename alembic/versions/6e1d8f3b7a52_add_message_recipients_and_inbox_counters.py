@@ -0,0 +1,46 @@
+"""Add message recipients, inbox/outbox indexes and inbox counters
+
+Revision ID: 6e1d8f3b7a52
+Revises: 2c7e94d1a0b8
+Create Date: 2026-10-18 20:41:07.318254
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e1d8f3b7a52'
+down_revision: Union[str, None] = '2c7e94d1a0b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Nullable, so SQLite adds it in place; existing messages were addressed to the HOA
+    op.add_column('message', sa.Column('recipient_id', sa.String(), nullable=True))
+    op.create_index(
+        'ix_message_recipient_read_timestamp_id', 'message',
+        ['recipient_id', 'read', 'timestamp', 'id'], unique=False
+    )
+    op.create_index('ix_message_sender_timestamp_id', 'message', ['user_id', 'timestamp', 'id'], unique=False)
+    # Starts empty: no existing message has a recipient to count for
+    op.create_table(
+        'inbox_counter',
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('community_id', sa.String(), nullable=False),
+        sa.Column('unread', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('inbox_counter')
+    op.drop_index('ix_message_sender_timestamp_id', table_name='message')
+    op.drop_index('ix_message_recipient_read_timestamp_id', table_name='message')
+    with op.batch_alter_table('message') as batch_op:
+        batch_op.drop_column('recipient_id')
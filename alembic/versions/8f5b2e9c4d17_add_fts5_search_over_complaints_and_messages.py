@@ -0,0 +1,57 @@
+"""Add FTS5 search over complaints and messages
+
+Revision ID: 8f5b2e9c4d17
+Revises: 6e1d8f3b7a52
+Create Date: 2026-10-18 21:06:29.504113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f5b2e9c4d17'
+down_revision: Union[str, None] = '6e1d8f3b7a52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of models.FTS_INDEXES / fts_ddl as of this revision
+FTS_INDEXES = {
+    'complaint': ('complaint_fts', ('title', 'description', 'community_id')),
+    'message': ('message_fts', ('subject', 'body', 'community_id')),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, (fts, columns) in FTS_INDEXES.items():
+        names = ', '.join(columns)
+        new_values = ', '.join(f'new.{column}' for column in columns)
+        old_values = ', '.join(f'old.{column}' for column in columns)
+        op.execute(f"CREATE VIRTUAL TABLE {fts} USING fts5({names}, content='{table}', content_rowid='rowid')")
+        op.execute(
+            f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO {fts}(rowid, {names}) VALUES (new.rowid, {new_values}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.rowid, {old_values}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {names} ON {table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.rowid, {old_values}); "
+            f"INSERT INTO {fts}(rowid, {names}) VALUES (new.rowid, {new_values}); END"
+        )
+        # Index the rows already there in one pass over the base table
+        op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+        op.execute(f"INSERT INTO {fts}({fts}) VALUES ('optimize')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, (fts, _) in FTS_INDEXES.items():
+        for suffix in ('au', 'ad', 'ai'):
+            op.execute(f'DROP TRIGGER IF EXISTS {fts}_{suffix}')
+        op.execute(f'DROP TABLE IF EXISTS {fts}')
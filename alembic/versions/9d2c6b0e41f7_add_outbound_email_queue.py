@@ -0,0 +1,48 @@
+"""Add outbound_email queue table
+
+Revision ID: 9d2c6b0e41f7
+Revises: e7a3d51f8c26
+Create Date: 2026-10-18 18:12:04.518337
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d2c6b0e41f7'
+down_revision: Union[str, None] = 'e7a3d51f8c26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'outbound_email',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('recipient', sa.String(), nullable=False),
+        sa.Column('subject', sa.String(), nullable=False),
+        sa.Column('html', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('next_attempt_at', sa.Float(), nullable=False),
+        sa.Column('created_at', sa.Float(), nullable=False),
+        sa.Column('last_error', sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    # The sender's claim query filters on status and orders by next_attempt_at
+    op.create_index(
+        'ix_outbound_email_status_next_attempt',
+        'outbound_email',
+        ['status', 'next_attempt_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_outbound_email_status_next_attempt', table_name='outbound_email')
+    op.drop_table('outbound_email')
@@ -0,0 +1,119 @@
+"""Store complaint/message/activitylog timestamps as UTC datetimes
+
+Revision ID: b3f81a6d2c59
+Revises: 9d2c6b0e41f7
+Create Date: 2026-10-18 18:47:20.113590
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+from zoneinfo import ZoneInfo
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f81a6d2c59'
+down_revision: Union[str, None] = '9d2c6b0e41f7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CHUNK_SIZE = 5000
+# SQLAlchemy's SQLite DATETIME storage format — keeps lexical order == time order
+STORAGE_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+LEGACY_FORMAT = "%Y-%m-%d %H:%M:%S"
+EPOCH = "1970-01-01 00:00:00.000000"
+
+# Complaints (and messages, by the same convention) were written as Los Angeles
+# wall-clock strings; activity rows have been written in UTC.
+LEGACY_ZONES = {
+    'complaint': ZoneInfo("America/Los_Angeles"),
+    'message': ZoneInfo("America/Los_Angeles"),
+    'activitylog': timezone.utc,
+}
+
+
+def _to_utc(value, zone):
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=zone)
+    return parsed.astimezone(timezone.utc).strftime(STORAGE_FORMAT)
+
+
+def _to_legacy(value, zone):
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+    return parsed.astimezone(zone).strftime(LEGACY_FORMAT)
+
+
+# Walk the table by rowid so memory and each UPDATE batch stay bounded
+def _backfill(table, source, target, convert, fallback):
+    bind = op.get_bind()
+    last_rowid = 0
+    unparsed = 0
+    while True:
+        rows = bind.execute(
+            sa.text(f"SELECT rowid, {source} FROM {table} WHERE rowid > :last ORDER BY rowid LIMIT :n"),
+            {"last": last_rowid, "n": CHUNK_SIZE},
+        ).all()
+        if not rows:
+            break
+        updates = []
+        for rowid, value in rows:
+            converted = convert(value, LEGACY_ZONES[table])
+            if converted is None:
+                unparsed += 1
+                converted = fallback
+            updates.append({"rid": rowid, "ts": converted})
+        bind.execute(sa.text(f"UPDATE {table} SET {target} = :ts WHERE rowid = :rid"), updates)
+        last_rowid = rows[-1][0]
+    if unparsed:
+        print(f"  {table}: {unparsed} empty or unparseable timestamps set to {fallback!r}")
+
+
+# A plain ALTER COLUMN TYPE would CAST through SQLite's NUMERIC affinity and
+# truncate '2025-01-15 ...' to 2025, so the converted values go into a fresh
+# column which then replaces the old one.
+def _swap_column(table, new_type, nullable, convert, fallback):
+    op.add_column(table, sa.Column('timestamp_new', new_type, nullable=True))
+    _backfill(table, 'timestamp', 'timestamp_new', convert, fallback)
+    with op.batch_alter_table(table) as batch_op:
+        batch_op.drop_column('timestamp')
+        batch_op.alter_column(
+            'timestamp_new', new_column_name='timestamp', existing_type=new_type, nullable=nullable
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index('ix_complaint_community_timestamp_id', table_name='complaint')
+    for table in LEGACY_ZONES:
+        _swap_column(table, sa.DateTime(), False, _to_utc, EPOCH)
+    op.create_index(
+        'ix_complaint_community_timestamp_id',
+        'complaint',
+        ['community_id', 'timestamp', 'id'],
+        unique=False,
+    )
+    op.create_index('ix_activitylog_timestamp', 'activitylog', ['timestamp'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_activitylog_timestamp', table_name='activitylog')
+    op.drop_index('ix_complaint_community_timestamp_id', table_name='complaint')
+    for table in LEGACY_ZONES:
+        _swap_column(table, sa.String(), table != 'activitylog', _to_legacy, None)
+    op.create_index(
+        'ix_complaint_community_timestamp_id',
+        'complaint',
+        ['community_id', 'timestamp', 'id'],
+        unique=False,
+    )
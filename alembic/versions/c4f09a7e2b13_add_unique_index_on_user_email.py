@@ -0,0 +1,35 @@
+"""Add unique index on user.email
+
+Revision ID: c4f09a7e2b13
+Revises: 5b1e7c2d9a40
+Create Date: 2026-10-18 16:20:43.117502
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f09a7e2b13'
+down_revision: Union[str, None] = '5b1e7c2d9a40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    duplicates = op.get_bind().execute(
+        sa.text('SELECT email FROM "user" GROUP BY email HAVING COUNT(*) > 1')
+    ).scalars().all()
+    if duplicates:
+        raise RuntimeError(
+            f"❌ Resolve duplicate user emails before adding the unique index: {', '.join(duplicates)}"
+        )
+    op.create_index('ix_user_email', 'user', ['email'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_user_email', table_name='user')
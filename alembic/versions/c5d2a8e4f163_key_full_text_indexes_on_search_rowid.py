@@ -0,0 +1,82 @@
+"""Key full-text indexes on an explicit search_rowid
+
+Revision ID: c5d2a8e4f163
+Revises: 1a6f4c8e3b95
+Create Date: 2026-10-19 09:12:40.318245
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d2a8e4f163'
+down_revision: Union[str, None] = '1a6f4c8e3b95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of models.FTS_INDEXES as of this revision
+FTS_INDEXES = {
+    'complaint': ('complaint_fts', ('title', 'description', 'community_id')),
+    'message': ('message_fts', ('subject', 'body', 'community_id')),
+}
+
+
+def _drop_fts(fts: str) -> None:
+    for suffix in ('au', 'ad', 'ai'):
+        op.execute(f'DROP TRIGGER IF EXISTS {fts}_{suffix}')
+    op.execute(f'DROP TABLE IF EXISTS {fts}')
+
+
+def _create_fts(table: str, fts: str, columns: Sequence[str], key: str) -> None:
+    names = ', '.join(columns)
+    new_values = ', '.join(f'new.{column}' for column in columns)
+    old_values = ', '.join(f'old.{column}' for column in columns)
+    op.execute(f"CREATE VIRTUAL TABLE {fts} USING fts5({names}, content='{table}', content_rowid='{key}')")
+    if key == 'rowid':
+        op.execute(
+            f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO {fts}(rowid, {names}) VALUES (new.rowid, {new_values}); END"
+        )
+    else:
+        op.execute(
+            f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+            f"UPDATE {table} SET {key} = (SELECT COALESCE(MAX({key}), 0) + 1 FROM {table}) "
+            f"WHERE rowid = new.rowid AND new.{key} IS NULL; "
+            f"INSERT INTO {fts}(rowid, {names}) SELECT {key}, {names} FROM {table} WHERE rowid = new.rowid; END"
+        )
+    op.execute(
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.{key}, {old_values}); END"
+    )
+    op.execute(
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {names} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.{key}, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {names}) VALUES (new.{key}, {new_values}); END"
+    )
+    op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+    op.execute(f"INSERT INTO {fts}({fts}) VALUES ('optimize')")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, (fts, columns) in FTS_INDEXES.items():
+        _drop_fts(fts)
+        op.add_column(table, sa.Column('search_rowid', sa.Integer(), nullable=True))
+        # Existing rows keep the numbers they are indexed under today
+        op.execute(f'UPDATE {table} SET search_rowid = rowid')
+        op.create_index(f'ix_{table}_search_rowid', table, ['search_rowid'], unique=True)
+        _create_fts(table, fts, columns, 'search_rowid')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, (fts, columns) in FTS_INDEXES.items():
+        _drop_fts(fts)
+        op.drop_index(f'ix_{table}_search_rowid', table_name=table)
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_column('search_rowid')
+        # The recreate renumbered rowids; the rebuild indexes the rows under their new ones
+        _create_fts(table, fts, columns, 'rowid')
@@ -0,0 +1,35 @@
+"""Add user token versions for access-token revocation
+
+Revision ID: d7c3a5e1f902
+Revises: 8f5b2e9c4d17
+Create Date: 2026-10-18 21:38:12.906437
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7c3a5e1f902'
+down_revision: Union[str, None] = '8f5b2e9c4d17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Constant default, so SQLite adds both columns without rewriting the table
+    op.add_column('user', sa.Column('token_version', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('user', sa.Column('token_revoked_at', sa.DateTime(), nullable=True))
+    # Workers reload only the users revoked within one token lifetime
+    op.create_index('ix_user_token_revoked_at', 'user', ['token_revoked_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_user_token_revoked_at', table_name='user')
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.drop_column('token_revoked_at')
+        batch_op.drop_column('token_version')
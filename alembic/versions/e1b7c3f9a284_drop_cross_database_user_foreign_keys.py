@@ -0,0 +1,75 @@
+"""Drop foreign keys from sharded tables to user
+
+Revision ID: e1b7c3f9a284
+Revises: c5d2a8e4f163
+Create Date: 2026-10-19 10:03:17.642908
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1b7c3f9a284'
+down_revision: Union[str, None] = 'c5d2a8e4f163'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Sharded tables whose rows point at a user in the directory database
+USER_REFERENCES = (
+    ('boardverificationrequest', 'user_id'),
+    ('board_approval', 'approver_id'),
+    ('complaint', 'user_id'),
+    ('message', 'user_id'),
+)
+# Names the unnamed constraints so batch mode can find them
+NAMING_CONVENTION = {'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s'}
+
+# Frozen copy of models.FTS_INDEXES / fts_trigger_ddl as of this revision
+FTS_INDEXES = {
+    'complaint': ('complaint_fts', ('title', 'description', 'community_id')),
+    'message': ('message_fts', ('subject', 'body', 'community_id')),
+}
+
+
+# A batch "recreate" drops the table's triggers; search_rowid survives it, so the index needs no rebuild
+def _create_fts_triggers(table: str) -> None:
+    if table not in FTS_INDEXES:
+        return
+    fts, columns = FTS_INDEXES[table]
+    names = ', '.join(columns)
+    new_values = ', '.join(f'new.{column}' for column in columns)
+    old_values = ', '.join(f'old.{column}' for column in columns)
+    op.execute(
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"UPDATE {table} SET search_rowid = (SELECT COALESCE(MAX(search_rowid), 0) + 1 FROM {table}) "
+        f"WHERE rowid = new.rowid AND new.search_rowid IS NULL; "
+        f"INSERT INTO {fts}(rowid, {names}) SELECT search_rowid, {names} FROM {table} WHERE rowid = new.rowid; END"
+    )
+    op.execute(
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.search_rowid, {old_values}); END"
+    )
+    op.execute(
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {names} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.search_rowid, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {names}) VALUES (new.search_rowid, {new_values}); END"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column in USER_REFERENCES:
+        with op.batch_alter_table(table, naming_convention=NAMING_CONVENTION) as batch_op:
+            batch_op.drop_constraint(f'fk_{table}_{column}_user', type_='foreignkey')
+        _create_fts_triggers(table)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column in USER_REFERENCES:
+        with op.batch_alter_table(table, naming_convention=NAMING_CONVENTION) as batch_op:
+            batch_op.create_foreign_key(f'fk_{table}_{column}_user', 'user', [column], ['id'])
+        _create_fts_triggers(table)
@@ -0,0 +1,62 @@
+"""Normalize board approvals into board_approval with a counter column
+
+Revision ID: e7a3d51f8c26
+Revises: c4f09a7e2b13
+Create Date: 2026-10-18 17:05:37.902144
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a3d51f8c26'
+down_revision: Union[str, None] = 'c4f09a7e2b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'board_approval',
+        sa.Column('request_id', sa.String(), nullable=False),
+        sa.Column('approver_id', sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(['request_id'], ['boardverificationrequest.id']),
+        sa.ForeignKeyConstraint(['approver_id'], ['user.id']),
+        sa.PrimaryKeyConstraint('request_id', 'approver_id'),
+    )
+    with op.batch_alter_table('boardverificationrequest') as batch_op:
+        batch_op.add_column(sa.Column('approval_count', sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill: one row per distinct approver in the old JSON list
+    op.execute(
+        "INSERT OR IGNORE INTO board_approval (request_id, approver_id) "
+        "SELECT b.id, j.value FROM boardverificationrequest AS b, json_each(b.approved_by) AS j "
+        "WHERE b.approved_by IS NOT NULL AND json_valid(b.approved_by)"
+    )
+    op.execute(
+        "UPDATE boardverificationrequest SET approval_count = "
+        "(SELECT COUNT(*) FROM board_approval WHERE board_approval.request_id = boardverificationrequest.id)"
+    )
+
+    with op.batch_alter_table('boardverificationrequest') as batch_op:
+        batch_op.drop_column('approved_by')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('boardverificationrequest') as batch_op:
+        batch_op.add_column(sa.Column('approved_by', sa.JSON(), nullable=True))
+
+    op.execute(
+        "UPDATE boardverificationrequest SET approved_by = COALESCE("
+        "(SELECT json_group_array(approver_id) FROM board_approval "
+        "WHERE board_approval.request_id = boardverificationrequest.id), '[]')"
+    )
+
+    with op.batch_alter_table('boardverificationrequest') as batch_op:
+        batch_op.drop_column('approval_count')
+    op.drop_table('board_approval')
@@ -0,0 +1,34 @@
+"""Add community_shard placement table
+
+Revision ID: f4a9c27e8b61
+Revises: b3f81a6d2c59
+Create Date: 2026-10-18 19:31:52.660419
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a9c27e8b61'
+down_revision: Union[str, None] = 'b3f81a6d2c59'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'community_shard',
+        sa.Column('community_id', sa.String(), nullable=False),
+        sa.Column('shard', sa.String(), nullable=False),
+        sa.Column('moved_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('community_id'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('community_shard')
@@ -0,0 +1,186 @@
+"""In-process load test: simulated residents drive the FastAPI app over httpx's ASGI transport.
+
+Usage: python -m benchmarks.load_test [--communities 4] [--residents 25] [--concurrency 32] [--seed 1]
+                                      [--max-retries 10] [--max-error-share 0.5]
+
+Each resident registers, logs in (OTP captured through main.otp_delivery_hook),
+files complaints, pages the community complaint list, optionally upgrades and
+hits /ai/helpdesk. Latency percentiles and throughput are reported per endpoint.
+
+PASSWORD_HASH_MAX_PENDING defaults to --concurrency for the run. A 429 from
+bcrypt admission control is still retried after its Retry-After, so the
+percentiles time completed work rather than rejections; only the final attempt
+is timed and retries are counted per endpoint. The run exits non-zero when
+non-2xx responses exceed --max-error-share of the total.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+class Recorder:
+    def __init__(self, max_retries: int = 0):
+        self.max_retries = max_retries
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self.retries: Dict[str, int] = defaultdict(int)
+
+    async def call(self, client, label: str, method: str, url: str, **kwargs):
+        for attempt in range(self.max_retries + 1):
+            start = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            elapsed = time.perf_counter() - start
+            if response.status_code != 429 or attempt == self.max_retries:
+                break
+            self.retries[label] += 1
+            # Jitter, or every rejected resident comes back in the same instant
+            await asyncio.sleep(float(response.headers.get("Retry-After", "1")) * random.uniform(1, 2))
+        self.latencies[label].append(elapsed)
+        self.statuses[label][response.status_code] += 1
+        return response
+
+    def error_share(self) -> float:
+        counts = [(code, n) for statuses in self.statuses.values() for code, n in statuses.items()]
+        total = sum(n for _, n in counts)
+        return sum(n for code, n in counts if not 200 <= code < 300) / total if total else 0.0
+
+    def report(self, wall: float) -> str:
+        lines = [
+            f"{'endpoint':<22} {'count':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>8}"
+            f" {'retries':>8}  statuses"
+        ]
+        total = 0
+        for label in sorted(self.latencies):
+            samples = self.latencies[label]
+            total += len(samples)
+            statuses = " ".join(f"{code}:{n}" for code, n in sorted(self.statuses[label].items()))
+            lines.append(
+                f"{label:<22} {len(samples):>6} {percentile(samples, 50) * 1000:>8.1f}"
+                f" {percentile(samples, 95) * 1000:>8.1f} {percentile(samples, 99) * 1000:>8.1f}"
+                f" {len(samples) / wall:>8.1f} {self.retries[label]:>8}  {statuses}"
+            )
+        lines.append(f"{'total':<22} {total:>6} {'':>8} {'':>8} {'':>8} {total / wall:>8.1f}")
+        return "\n".join(lines)
+
+
+async def simulate_resident(client, recorder: Recorder, resident, otps: Dict[str, str], pages: int):
+    await recorder.call(
+        client, "POST /register", "POST", "/register",
+        json={"email": resident.email, "password": resident.password, "community_id": resident.community_id},
+    )
+    response = await recorder.call(
+        client, "POST /login", "POST", "/login",
+        json={"email": resident.email, "password": resident.password, "otp": otps.get(resident.email, "")},
+    )
+    if response.status_code != 200:
+        return
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    for title, description in resident.complaints:
+        await recorder.call(
+            client, "POST /complaints", "POST", "/complaints",
+            json={"title": title, "description": description}, headers=headers,
+        )
+
+    cursor = None
+    for _ in range(pages):
+        params = {"limit": 20}
+        if cursor:
+            params["cursor"] = cursor
+        page = await recorder.call(client, "GET /complaints", "GET", "/complaints", params=params, headers=headers)
+        cursor = page.json().get("next_cursor") if page.status_code == 200 else None
+        if not cursor:
+            break
+
+    if resident.upgrades:
+        upgraded = await recorder.call(client, "POST /upgrade", "POST", "/upgrade", headers=headers)
+        # Upgrading revokes the old token; the response carries one with the new tier
+        if upgraded.status_code == 200:
+            headers = {"Authorization": f"Bearer {upgraded.json()['access_token']}"}
+    await recorder.call(client, "GET /ai/helpdesk", "GET", "/ai/helpdesk", headers=headers)
+
+
+async def run(args):
+    # Imported late so DATABASE_URL points at the scratch database before engines exist
+    import httpx
+    from benchmarks.population import build_population
+    from src.backend import main
+
+    otps: Dict[str, str] = {}
+    main.otp_delivery_hook = otps.__setitem__
+    # ASGITransport does not drive lifespan events, so run startup/shutdown by hand
+    await main.app.router.startup()
+
+    population = build_population(args.seed, args.communities, args.residents, args.complaints)
+    residents = [r for community in population for r in community.residents]
+    random.Random(args.seed).shuffle(residents)
+
+    recorder = Recorder(args.max_retries)
+    gate = asyncio.Semaphore(args.concurrency)
+
+    async def bounded(resident):
+        async with gate:
+            await simulate_resident(client, recorder, resident, otps, args.pages)
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(bounded(r) for r in residents))
+        wall = time.perf_counter() - start
+
+    await main.app.router.shutdown()
+    report = (
+        f"seed={args.seed} communities={args.communities} residents/community={args.residents}"
+        f" concurrency={args.concurrency} wall={wall:.2f}s\n" + recorder.report(wall)
+    )
+    return report, recorder.error_share()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--communities", type=int, default=4)
+    parser.add_argument("--residents", type=int, default=25, help="residents per community")
+    parser.add_argument("--complaints", type=int, default=3, help="complaints filed per resident")
+    parser.add_argument("--pages", type=int, default=3, help="complaint pages read per resident")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--max-retries", type=int, default=10, help="retries per request on 429")
+    parser.add_argument(
+        "--max-error-share", type=float, default=0.5, help="fail when non-2xx responses exceed this share"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ.setdefault("OTP_STORE_BACKEND", "memory")
+        # Admission control defaults to 4 pending hashes per CPU; let every simulated
+        # resident queue for bcrypt so the run measures the queue, not rejections
+        os.environ.setdefault("PASSWORD_HASH_MAX_PENDING", str(args.concurrency))
+        # Every simulated resident shares the ASGITransport client address, as in tests/conftest.py
+        os.environ["RATE_LIMIT_ENABLED"] = "0"
+        report, error_share = asyncio.run(run(args))
+    print(report)
+    if error_share > args.max_error_share:
+        print(
+            f"FAIL: {error_share:.0%} of responses were non-2xx; the percentiles above mostly time errors",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import random
+from dataclasses import dataclass, field
+from typing import List
+
+COMPLAINT_TOPICS = [
+    ("Gate Still Broken", "Gate not opening for deliveries."),
+    ("Pool Light Out", "The deep-end light has been out all week."),
+    ("Sprinkler Leak", "Front yard sprinkler leaking onto the sidewalk."),
+    ("Noise After Hours", "Construction noise well past 9pm."),
+    ("Trash Pickup Missed", "Bins on our street were skipped again."),
+    ("Parking Violation", "Visitor spot occupied by the same car for days."),
+]
+
+
+@dataclass
+class Resident:
+    email: str
+    password: str
+    community_id: str
+    complaints: List[tuple] = field(default_factory=list)
+    upgrades: bool = False
+
+
+@dataclass
+class Community:
+    community_id: str
+    residents: List[Resident]
+
+
+# 🏘️ Deterministic population: the same seed always yields the same residents and workload
+def build_population(
+    seed: int,
+    communities: int,
+    residents_per_community: int,
+    complaints_per_resident: int,
+    upgrade_ratio: float = 0.25,
+) -> List[Community]:
+    rng = random.Random(seed)
+    population = []
+    for c in range(communities):
+        community_id = f"bench-{seed}-{c:05d}"
+        residents = []
+        for r in range(residents_per_community):
+            residents.append(
+                Resident(
+                    email=f"resident{r:05d}@{community_id}.example.com",
+                    password=f"pw-{rng.getrandbits(48):012x}",
+                    community_id=community_id,
+                    complaints=[
+                        rng.choice(COMPLAINT_TOPICS) for _ in range(complaints_per_resident)
+                    ],
+                    upgrades=rng.random() < upgrade_ratio,
+                )
+            )
+        population.append(Community(community_id, residents))
+    return population
@@ -0,0 +1,118 @@
+"""Concurrent read/write throughput: stock SQLite engine vs. the tuned make_engine() profile.
+
+Usage: python -m scripts.bench_sqlite_tuning [--seconds 5] [--readers 8] [--writers 2]
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+import uuid
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from src.backend.database import make_engine
+
+SCHEMA = (
+    "CREATE TABLE complaint (id VARCHAR PRIMARY KEY, user_id VARCHAR NOT NULL,"
+    " title VARCHAR NOT NULL, description VARCHAR NOT NULL, timestamp VARCHAR,"
+    " photo_url VARCHAR, community_id VARCHAR NOT NULL, read BOOLEAN NOT NULL)"
+)
+SEED_ROWS = 20000
+COMMUNITIES = 50
+
+
+def seed(engine):
+    with engine.begin() as conn:
+        conn.execute(text(SCHEMA))
+        conn.execute(
+            text("CREATE INDEX ix_complaint_community_timestamp_id ON complaint (community_id, timestamp, id)")
+        )
+        conn.execute(
+            text(
+                "INSERT INTO complaint VALUES (:id, 'u', 'title', 'description', :ts, NULL, :c, 0)"
+            ),
+            [
+                {"id": str(uuid.uuid4()), "ts": f"2025-01-01 00:{i % 60:02d}:00", "c": f"c{i % COMMUNITIES}"}
+                for i in range(SEED_ROWS)
+            ],
+        )
+
+
+def run(engine, seconds, readers, writers):
+    stop = time.monotonic() + seconds
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+
+    def reader(n):
+        done = errors = 0
+        while time.monotonic() < stop:
+            try:
+                with engine.connect() as conn:
+                    conn.execute(
+                        text(
+                            "SELECT * FROM complaint WHERE community_id = :c"
+                            " ORDER BY timestamp DESC, id DESC LIMIT 50"
+                        ),
+                        {"c": f"c{(done + n) % COMMUNITIES}"},
+                    ).fetchall()
+                done += 1
+            except OperationalError:
+                errors += 1
+        with lock:
+            counts["reads"] += done
+            counts["errors"] += errors
+
+    def writer(n):
+        done = errors = 0
+        while time.monotonic() < stop:
+            try:
+                with engine.begin() as conn:
+                    conn.execute(
+                        text(
+                            "INSERT INTO complaint VALUES (:id, 'u', 'title', 'description',"
+                            " '2025-06-01 00:00:00', NULL, :c, 0)"
+                        ),
+                        {"id": str(uuid.uuid4()), "c": f"c{(done + n) % COMMUNITIES}"},
+                    )
+                done += 1
+            except OperationalError:
+                errors += 1
+        with lock:
+            counts["writes"] += done
+            counts["errors"] += errors
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads += [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return {k: v / seconds if k != "errors" else v for k, v in counts.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        profiles = {
+            "stock": lambda url: create_engine(url, connect_args={"check_same_thread": False}),
+            "tuned": lambda url: make_engine(url),
+        }
+        print(f"{'profile':<8} {'reads/s':>10} {'writes/s':>10} {'errors':>8}")
+        for name, factory in profiles.items():
+            url = f"sqlite:///{os.path.join(tmp, name + '.db')}"
+            engine = factory(url)
+            seed(engine)
+            result = run(engine, args.seconds, args.readers, args.writers)
+            engine.dispose()
+            print(f"{name:<8} {result['reads']:>10.0f} {result['writes']:>10.0f} {result['errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Move one community's rows to another shard and pin it there.
+
+Usage: python -m scripts.move_community <community_id> <target_shard> [--batch-size 1000]
+                                         [--keep-source] [--dry-run]
+
+Uses the same DATABASE_SHARDS / DATABASE_SHARD_URLS settings as the app.
+Steps: copy every sharded table (idempotent, so a failed run can be repeated),
+verify row counts, write the community_shard placement, then delete the
+source rows once SHARD_PLACEMENT_TTL_SECONDS has passed. Until then workers
+may still route to the old shard, so run this while the community is quiet
+(or with its writers stopped); writes landing on the old shard in between
+are not carried over.
+"""
+import argparse
+import sys
+import time
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.sqlite import insert
+
+from src.backend.models import FTS_ROWID, CommunityShard
+from src.backend.shards import SHARDED_MODELS, community_filter, shard_router
+from src.backend.timezones import utc_now
+
+
+def _count(conn, model, community_id: str) -> int:
+    return conn.execute(
+        select(func.count()).select_from(model.__table__).where(community_filter(model, community_id))
+    ).scalar_one()
+
+
+# Upsert keeps re-runs after a partial copy idempotent. Unlike INSERT OR REPLACE it
+# fires UPDATE triggers, so the full-text indexes on the target stay in step.
+def _upsert(table):
+    statement = insert(table)
+    primary_key = [column.name for column in table.primary_key]
+    others = {column.name: statement.excluded[column.name] for column in _copied(table) if not column.primary_key}
+    if not others:
+        return statement.on_conflict_do_nothing(index_elements=primary_key)
+    return statement.on_conflict_do_update(index_elements=primary_key, set_=others)
+
+
+# search_rowid numbers rows within one database; the target's insert trigger assigns its own
+def _copied(table):
+    return [column for column in table.columns if column.name != FTS_ROWID]
+
+
+def copy_rows(source, target, community_id: str, batch_size: int) -> None:
+    with source.connect() as src, target.begin() as dst:
+        for model in SHARDED_MODELS:
+            table = model.__table__
+            start = time.perf_counter()
+            total = 0
+            result = src.execution_options(yield_per=batch_size).execute(
+                select(*_copied(table)).where(community_filter(model, community_id))
+            )
+            for batch in result.mappings().partitions():
+                dst.execute(_upsert(table), [dict(row) for row in batch])
+                total += len(batch)
+            print(f"  copied {table.name}: {total:,} rows in {time.perf_counter() - start:.1f}s")
+
+
+def verify(source, target, community_id: str) -> bool:
+    ok = True
+    with source.connect() as src, target.connect() as dst:
+        for model in SHARDED_MODELS:
+            expected, actual = _count(src, model, community_id), _count(dst, model, community_id)
+            if expected != actual:
+                print(f"  ❌ {model.__table__.name}: source {expected:,} rows, target {actual:,}")
+                ok = False
+    return ok
+
+
+def pin(community_id: str, shard_name: str) -> None:
+    statement = insert(CommunityShard.__table__).values(
+        community_id=community_id, shard=shard_name, moved_at=utc_now()
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=["community_id"],
+        set_={"shard": statement.excluded.shard, "moved_at": statement.excluded.moved_at},
+    )
+    with shard_router.directory_engine.begin() as conn:
+        conn.execute(statement)
+
+
+def delete_rows(engine, community_id: str) -> None:
+    # Children before parents
+    with engine.begin() as conn:
+        for model in reversed(SHARDED_MODELS):
+            conn.execute(delete(model.__table__).where(community_filter(model, community_id)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("community_id")
+    parser.add_argument("target_shard", help=f"one of: {', '.join(shard_router.shards)}")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--keep-source", action="store_true", help="leave the copied rows on the old shard")
+    parser.add_argument("--dry-run", action="store_true", help="report row counts and stop")
+    args = parser.parse_args()
+
+    if args.target_shard not in shard_router.shards:
+        sys.exit(f"Unknown shard {args.target_shard!r}; configured: {', '.join(shard_router.shards)}")
+
+    shard_router.refresh_placements()
+    source = shard_router.shard_for(args.community_id)
+    target = shard_router.shards[args.target_shard]
+    if source.name == target.name:
+        print(f"Community {args.community_id} already lives on {target.name}.")
+        return
+
+    print(f"Moving community {args.community_id}: {source.name} -> {target.name}")
+    with source.engine.connect() as conn:
+        for model in SHARDED_MODELS:
+            print(f"  {model.__table__.name}: {_count(conn, model, args.community_id):,} rows")
+    if args.dry_run:
+        return
+
+    shard_router.init_schema()
+    copy_rows(source.engine, target.engine, args.community_id, args.batch_size)
+    if not verify(source.engine, target.engine, args.community_id):
+        sys.exit("Row counts differ; placement unchanged. Re-run to retry the copy.")
+
+    pin(args.community_id, target.name)
+    print(f"✅ Placement updated; workers switch within {shard_router.placement_ttl:g}s")
+
+    if not args.keep_source:
+        # Let every worker's placement cache expire before the old copy disappears
+        time.sleep(shard_router.placement_ttl)
+        delete_rows(source.engine, args.community_id)
+        print(f"🧹 Removed source rows from {source.name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,36 +1,201 @@
-from sqlmodel import Session
-from src.backend.models import User, Message, Complaint, ActivityLog
-from src.backend.database import engine
-
-with Session(engine) as session:
-    user = User(email="sample@example.com", role="resident", tier="solo", community_id="00001", verified=True)
-    session.add(user)
-
-    message = Message(
-        subject="Pool Access",
-        body="When does the pool open?",
-        user_id=user.id,
-        community_id=user.community_id
-    )
-    session.add(message)
-
-    complaint = Complaint(
-        title="Broken Sprinkler",
-        description="Front yard sprinkler leaking.",
-        user_id=user.id,
-        community_id=user.community_id
-    )
-    session.add(complaint)
-
-    log = ActivityLog(
-        user_id=user.id,
-        action="Test Login",
-        endpoint="/login",
-        ip_address="127.0.0.1",
-        user_agent="curl",
-        community_id=user.community_id
-    )
-    session.add(log)
-
-    session.commit()
+"""Bulk synthetic data generator for production-scale query plans.
 
+Usage: python -m scripts.seed_test_data [--communities 500] [--users 2000] [--complaints 3]
+                                         [--messages 2] [--activity 5] [--seed 1]
+                                         [--database-url sqlite:///hoainfo_seed.db]
+
+Every synthetic user shares one pre-computed bcrypt hash of SEED_PASSWORD,
+so bcrypt runs once per invocation instead of once per user.
+"""
+import argparse
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List
+
+import bcrypt
+from sqlmodel import SQLModel
+
+from src.backend.database import SQLITE_PRAGMAS, make_engine
+from src.backend.models import ActivityLog, Complaint, InboxCounter, Message, User
+
+SEED_PASSWORD = "Test1234!"
+ROLES = ["resident"] * 90 + ["board"] * 8 + ["admin"] * 2
+TIERS = ["solo"] * 70 + ["household"] * 20 + ["landlord"] * 10
+COMPLAINTS = [
+    ("Broken Sprinkler", "Front yard sprinkler leaking."),
+    ("Gate Still Broken", "Gate not opening for deliveries."),
+    ("Pool Light Out", "The deep-end light has been out all week."),
+    ("Noise After Hours", "Construction noise well past 9pm."),
+    ("Trash Pickup Missed", "Bins on our street were skipped again."),
+]
+MESSAGES = [
+    ("Pool Access", "When does the pool open?"),
+    ("Parking Permit", "How do I get a guest parking permit?"),
+    ("Dues Question", "Is the quarterly assessment changing?"),
+]
+ENDPOINTS = ["/login", "/complaints", "/board/requests", "/upgrade", "/ai/helpdesk"]
+AGENTS = ["Mozilla/5.0 (iPhone)", "Mozilla/5.0 (Macintosh)", "Mozilla/5.0 (Android)", "curl/8.4"]
+EPOCH = datetime(2024, 1, 1)
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+# Naive UTC, like every timestamp column
+def _timestamp(rng: random.Random) -> datetime:
+    return EPOCH + timedelta(seconds=rng.randrange(2 * 365 * 86400))
+
+
+def _users(args) -> Iterator[tuple]:
+    # Replayable: every stream regenerates the same (id, community_id) sequence
+    # instead of holding a million user ids in memory
+    rng = random.Random(args.seed)
+    for c in range(args.communities):
+        community_id = f"{c:05d}"
+        for u in range(args.users):
+            yield u, _uuid(rng), community_id
+
+
+def generate(args, password_hash: str) -> Dict[str, Iterator[dict]]:
+    # Separate streams per table so each can be inserted in its own batches
+    def user_rows() -> Iterator[dict]:
+        rng = random.Random(args.seed + 4)
+        for u, user_id, community_id in _users(args):
+            yield {
+                "id": user_id,
+                "email": f"user{u:06d}@c{community_id}.example.com",
+                "password_hash": password_hash,
+                "role": rng.choice(ROLES),
+                "tier": rng.choice(TIERS),
+                "community_id": community_id,
+            }
+
+    def complaint_rows() -> Iterator[dict]:
+        rng = random.Random(args.seed + 1)
+        for _, user_id, community_id in _users(args):
+            for _ in range(args.complaints):
+                title, description = rng.choice(COMPLAINTS)
+                yield {
+                    "id": _uuid(rng),
+                    "user_id": user_id,
+                    "title": title,
+                    "description": description,
+                    "timestamp": _timestamp(rng),
+                    "photo_url": None,
+                    "community_id": community_id,
+                    "read": rng.random() < 0.5,
+                }
+
+    def message_rows() -> Iterator[dict]:
+        rng = random.Random(args.seed + 2)
+        for u, user_id, community_id in _users(args):
+            # Each resident writes to the previous one; the first writes to the HOA
+            recipient_id = None if u == 0 else previous_id
+            previous_id = user_id
+            for _ in range(args.messages):
+                subject, body = rng.choice(MESSAGES)
+                yield {
+                    "id": _uuid(rng),
+                    "user_id": user_id,
+                    "recipient_id": recipient_id,
+                    "subject": subject,
+                    "body": body,
+                    "timestamp": _timestamp(rng),
+                    "read": rng.random() < 0.5,
+                    "response": None,
+                    "community_id": community_id,
+                }
+
+    def inbox_counter_rows() -> Iterator[dict]:
+        # Replays the message stream one community at a time so the badges match the seeded inboxes
+        unread: Dict[str, int] = {}
+        community_id = None
+        for message in message_rows():
+            if message["community_id"] != community_id:
+                yield from ({"user_id": k, "community_id": community_id, "unread": v} for k, v in unread.items())
+                unread, community_id = {}, message["community_id"]
+            if message["recipient_id"] and not message["read"]:
+                unread[message["recipient_id"]] = unread.get(message["recipient_id"], 0) + 1
+        yield from ({"user_id": k, "community_id": community_id, "unread": v} for k, v in unread.items())
+
+    def activity_rows() -> Iterator[dict]:
+        rng = random.Random(args.seed + 3)
+        for _, user_id, community_id in _users(args):
+            for _ in range(args.activity):
+                endpoint = rng.choice(ENDPOINTS)
+                yield {
+                    "id": _uuid(rng),
+                    "user_id": user_id,
+                    "action": f"request {endpoint}",
+                    "endpoint": endpoint,
+                    "ip_address": f"10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}",
+                    "user_agent": rng.choice(AGENTS),
+                    "timestamp": _timestamp(rng),
+                    "community_id": community_id,
+                }
+
+    return {
+        User.__tablename__: user_rows(),
+        Complaint.__tablename__: complaint_rows(),
+        Message.__tablename__: message_rows(),
+        InboxCounter.__tablename__: inbox_counter_rows(),
+        ActivityLog.__tablename__: activity_rows(),
+    }
+
+
+def _batches(rows: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--communities", type=int, default=500)
+    parser.add_argument("--users", type=int, default=2000, help="users per community")
+    parser.add_argument("--complaints", type=int, default=3, help="complaints per user")
+    parser.add_argument("--messages", type=int, default=2, help="messages per user")
+    parser.add_argument("--activity", type=int, default=5, help="activity-log rows per user")
+    parser.add_argument("--batch-size", type=int, default=5000, help="rows per executemany")
+    parser.add_argument("--commit-every", type=int, default=50, help="batches per transaction")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--database-url", default="sqlite:///hoainfo_seed.db")
+    args = parser.parse_args()
+
+    # Bulk load only: durability per transaction is not worth the fsyncs here
+    pragmas = dict(SQLITE_PRAGMAS, synchronous="OFF")
+    engine = make_engine(args.database_url, pragmas=pragmas)
+    SQLModel.metadata.create_all(engine)
+
+    password_hash = bcrypt.hashpw(SEED_PASSWORD.encode(), bcrypt.gensalt()).decode()
+    tables = SQLModel.metadata.tables
+
+    for table_name, rows in generate(args, password_hash).items():
+        table = tables[table_name]
+        start = time.perf_counter()
+        total = 0
+        conn = engine.connect()
+        transaction = conn.begin()
+        for n, batch in enumerate(_batches(rows, args.batch_size), start=1):
+            conn.execute(table.insert(), batch)
+            total += len(batch)
+            if n % args.commit_every == 0:
+                transaction.commit()
+                transaction = conn.begin()
+        transaction.commit()
+        conn.close()
+        elapsed = time.perf_counter() - start
+        print(f"✅ {table_name}: {total:,} rows in {elapsed:.1f}s ({total / max(elapsed, 1e-9):,.0f} rows/s)")
+
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
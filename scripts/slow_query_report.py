@@ -0,0 +1,50 @@
+"""Summarize the slow-query log: worst statements first, full-table scans marked.
+
+Usage: python -m scripts.slow_query_report [slow_queries.log ...] [--top 20]
+
+Reads rotated files too (pass them explicitly, e.g. slow_queries.log*).
+Statements are grouped by SQL text; bound values never reach the log.
+"""
+import argparse
+import json
+from collections import defaultdict
+
+from src.backend.slow_query import SLOW_QUERY_LOG_PATH
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", default=[SLOW_QUERY_LOG_PATH])
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    groups = defaultdict(lambda: {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "routes": set(), "scans": set(), "plan": []})
+    for path in args.paths:
+        with open(path, encoding="utf-8") as fh:
+            for line in fh:
+                entry = json.loads(line)
+                group = groups[entry["sql"]]
+                group["count"] += 1
+                group["total_ms"] += entry["elapsed_ms"]
+                group["max_ms"] = max(group["max_ms"], entry["elapsed_ms"])
+                if entry.get("route"):
+                    group["routes"].add(entry["route"])
+                group["scans"].update(scan["table"] for scan in entry["full_scans"] if scan["flagged"])
+                group["plan"] = entry["plan"]
+
+    ranked = sorted(groups.items(), key=lambda item: item[1]["total_ms"], reverse=True)[: args.top]
+    for sql, group in ranked:
+        marker = "🚩" if group["scans"] else "  "
+        print(
+            f"{marker} {group['count']:>6}x  total {group['total_ms']:>10.1f} ms"
+            f"  max {group['max_ms']:>8.1f} ms  {', '.join(sorted(group['routes'])) or '-'}"
+        )
+        print(f"     {sql[:200]}")
+        for detail in group["plan"]:
+            print(f"       {detail}")
+        if group["scans"]:
+            print(f"     full scan of: {', '.join(sorted(group['scans']))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+from typing import List, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.backend.models import ActivityLog
+from src.backend.timezones import utc_now
+
+load_dotenv()
+ACTIVITY_LOG_ENABLED = os.getenv("ACTIVITY_LOG_ENABLED", "1") == "1"
+ACTIVITY_LOG_QUEUE_SIZE = int(os.getenv("ACTIVITY_LOG_QUEUE_SIZE", "10000"))
+ACTIVITY_LOG_BATCH_SIZE = int(os.getenv("ACTIVITY_LOG_BATCH_SIZE", "500"))
+ACTIVITY_LOG_FLUSH_SECONDS = float(os.getenv("ACTIVITY_LOG_FLUSH_SECONDS", "1.0"))
+# "spill" appends overflow to ACTIVITY_LOG_SPILL_PATH; "drop" discards it
+ACTIVITY_LOG_OVERFLOW = os.getenv("ACTIVITY_LOG_OVERFLOW", "spill")
+# Overflow waits here for the writer thread; past this it is dropped and counted
+ACTIVITY_LOG_SPILL_QUEUE_SIZE = int(os.getenv("ACTIVITY_LOG_SPILL_QUEUE_SIZE", "10000"))
+ACTIVITY_LOG_SPILL_PATH = os.getenv("ACTIVITY_LOG_SPILL_PATH", "activity_log_spill.jsonl")
+ACTIVITY_LOG_SKIP_PATHS = {"/", "/metrics"}
+
+
+# 📝 Bounded queue + background thread that writes ActivityLog rows in batches
+class ActivityLogWriter:
+    def __init__(
+        self,
+        engine,
+        queue_size: int = ACTIVITY_LOG_QUEUE_SIZE,
+        batch_size: int = ACTIVITY_LOG_BATCH_SIZE,
+        flush_seconds: float = ACTIVITY_LOG_FLUSH_SECONDS,
+        overflow: str = ACTIVITY_LOG_OVERFLOW,
+        spill_path: str = ACTIVITY_LOG_SPILL_PATH,
+        spill_queue_size: int = ACTIVITY_LOG_SPILL_QUEUE_SIZE,
+    ):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.overflow = overflow
+        self.spill_path = spill_path
+        self._queue: "queue.Queue[dict]" = queue.Queue(maxsize=queue_size)
+        self._overflow: "queue.Queue[dict]" = queue.Queue(maxsize=spill_queue_size)
+        self._spill_lock = threading.Lock()
+        # Counters are bumped from request threads and the writer thread alike
+        self._stats_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.written = 0
+        self.spilled = 0
+        self.dropped = 0
+
+    def start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="activity-log-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._flush(self._drain(None))
+        self._spill(self._drain(None, self._overflow))
+
+    # Never blocks and never touches the disk: the request path only pays for a put_nowait,
+    # even under backpressure. Spilling to the file happens on the writer thread.
+    def submit(self, record: dict) -> None:
+        try:
+            self._queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+        if self.overflow == "spill":
+            try:
+                self._overflow.put_nowait(record)
+                return
+            except queue.Full:
+                pass
+        with self._stats_lock:
+            self.dropped += 1
+
+    def _drain(self, limit: Optional[int], source: Optional[queue.Queue] = None) -> List[dict]:
+        source = self._queue if source is None else source
+        rows = []
+        while limit is None or len(rows) < limit:
+            try:
+                rows.append(source.get_nowait())
+            except queue.Empty:
+                break
+        return rows
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            deadline = time.monotonic() + self.flush_seconds
+            batch: List[dict] = []
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+                batch.extend(self._drain(self.batch_size - len(batch)))
+            self._flush(batch)
+            self._spill(self._drain(self.batch_size, self._overflow))
+
+    def _flush(self, rows: List[dict]) -> None:
+        if not rows:
+            return
+        try:
+            # One transaction per batch, one executemany per transaction
+            with self.engine.begin() as conn:
+                conn.execute(ActivityLog.__table__.insert(), rows)
+            with self._stats_lock:
+                self.written += len(rows)
+        except SQLAlchemyError:
+            self._spill(rows)
+
+    def _spill(self, rows: List[dict]) -> None:
+        if not rows:
+            return
+        with self._spill_lock:
+            with open(self.spill_path, "a", encoding="utf-8") as fh:
+                for row in rows:
+                    fh.write(json.dumps(row, default=str) + "\n")
+        with self._stats_lock:
+            self.spilled += len(rows)
+
+
+# 🛰️ Pure ASGI middleware: records the request after the response has started
+class ActivityLogMiddleware:
+    def __init__(self, app, writer: ActivityLogWriter):
+        self.app = app
+        self.writer = writer
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in ACTIVITY_LOG_SKIP_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.writer.submit(self._record(scope, status["code"]))
+
+    @staticmethod
+    def _record(scope, status_code: int) -> dict:
+        # verify_token leaves the resolved principal in scope["state"]
+        principal = scope.get("state", {}).get("principal")
+        route = scope.get("route")
+        headers = dict(scope.get("headers") or [])
+        client = scope.get("client")
+        return {
+            "id": str(uuid.uuid4()),
+            "user_id": principal.id if principal else "",
+            "action": f"{scope['method']} {status_code}",
+            "endpoint": getattr(route, "path", scope["path"]),
+            "ip_address": client[0] if client else "",
+            "user_agent": headers.get(b"user-agent", b"").decode("latin-1")[:512],
+            "timestamp": utc_now(),
+            "community_id": principal.community_id if principal else "",
+        }
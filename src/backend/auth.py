@@ -3,7 +3,7 @@ from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from src.backend.models import User
 from src.backend.database import get_session
-from sqlmodel import select
+from sqlmodel import select, Session
 import os
 from dotenv import load_dotenv
 
@@ -14,7 +14,7 @@ ALGORITHM = "HS256"
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
-def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_session)) -> User:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email = payload.get("sub")
@@ -23,9 +23,7 @@ def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
     except JWTError:
         raise HTTPException(status_code=401, detail="Token verification failed")
 
-    db = get_session()
     user = db.exec(select(User).where(User.email == email)).first()
-    db.close()
 
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
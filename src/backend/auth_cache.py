@@ -0,0 +1,186 @@
+import asyncio
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
+
+from src.backend.database import engine
+from src.backend.models import User
+from src.backend.timezones import utc_now
+
+load_dotenv()
+# Access tokens carry their own claims, so this bounds how stale a role or tier can be
+ACCESS_TOKEN_EXPIRE_MINUTES = float(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "15"))
+# How often each worker reloads the token versions bumped by other workers
+TOKEN_VERSION_REFRESH_SECONDS = float(os.getenv("TOKEN_VERSION_REFRESH_SECONDS", "5"))
+# Covers clock drift between the worker that issued a token and the one checking it
+TOKEN_CLOCK_SKEW_SECONDS = 60
+
+logger = logging.getLogger(__name__)
+
+
+# 🪪 Detached, read-only view of a User — built from verified token claims
+@dataclass(frozen=True)
+class UserPrincipal:
+    id: str
+    email: str
+    role: Optional[str]
+    tier: Optional[str]
+    community_id: str
+    token_version: int = 0
+
+    @classmethod
+    def from_user(cls, user) -> "UserPrincipal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            role=user.role,
+            tier=user.tier,
+            community_id=user.community_id,
+            token_version=user.token_version or 0,
+        )
+
+    @classmethod
+    def from_claims(cls, claims: dict) -> "UserPrincipal":
+        # KeyError on a token minted before these claims existed; callers treat it as invalid
+        return cls(
+            id=claims["id"],
+            email=claims["sub"],
+            role=claims["role"],
+            tier=claims["tier"],
+            community_id=claims["community_id"],
+            token_version=claims["ver"],
+        )
+
+    def claims(self) -> dict:
+        return {
+            "sub": self.email,
+            "id": self.id,
+            "role": self.role,
+            "tier": self.tier,
+            "community_id": self.community_id,
+            "ver": self.token_version,
+        }
+
+
+# 🔢 user id -> current token_version, for users revoked within one token lifetime.
+# Older revocations need no entry: every token they could reject has expired.
+# Reloaded by SnapshotReloader; is_current only reads memory.
+class TokenVersions:
+    name = "token_versions"
+
+    def __init__(self, refresh_seconds: float, window_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self.window_seconds = window_seconds
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.reloads = 0
+        self.rejected = 0
+
+    def is_current(self, user_id: str, version: int) -> bool:
+        # Always answered from memory: a hit
+        self.hits += 1
+        if version < self._versions.get(user_id, 0):
+            self.rejected += 1
+            return False
+        return True
+
+    # Applies a bump on this worker immediately; the others see it on their next reload
+    def bump(self, user_id: str, version: int) -> None:
+        with self._lock:
+            if version > self._versions.get(user_id, 0):
+                self._versions = {**self._versions, user_id: version}
+
+    def refresh(self) -> None:
+        since = utc_now() - timedelta(seconds=self.window_seconds)
+        with engine.connect() as conn:
+            rows = conn.execute(
+                select(User.id, User.token_version).where(User.token_revoked_at >= since)
+            ).all()
+        # Swap in a fresh dict so readers never see a half-built map
+        self._versions = {user_id: version for user_id, version in rows}
+        self.reloads += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._versions = {}
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._versions),
+            "hits": self.hits,
+            "misses": 0,
+            "reloads": self.reloads,
+            "rejected": self.rejected,
+        }
+
+
+token_versions = TokenVersions(
+    TOKEN_VERSION_REFRESH_SECONDS, ACCESS_TOKEN_EXPIRE_MINUTES * 60 + TOKEN_CLOCK_SKEW_SECONDS
+)
+
+
+# ♻️ Reloads each snapshot every refresh_seconds in the threadpool, off the request path.
+# Anything with refresh_seconds and a blocking refresh() qualifies.
+class SnapshotReloader:
+    def __init__(self, *snapshots):
+        self.snapshots = snapshots
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        # Load once before serving, so no request sees an empty snapshot
+        for snapshot in self.snapshots:
+            await run_in_threadpool(snapshot.refresh)
+        self._tasks = [asyncio.create_task(self._run(snapshot)) for snapshot in self.snapshots]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _run(self, snapshot) -> None:
+        while True:
+            await asyncio.sleep(snapshot.refresh_seconds)
+            try:
+                await run_in_threadpool(snapshot.refresh)
+            except Exception:
+                # Keep serving the previous snapshot and try again next interval
+                logger.exception("reload of %s failed", type(snapshot).__name__)
+
+
+# 🔄 Call on any change to a user's role, tier or community, before committing it;
+# returns the new version to hand to token_versions.bump once the commit succeeds
+def revoke_tokens(user) -> int:
+    user.token_version = (user.token_version or 0) + 1
+    user.token_revoked_at = utc_now()
+    return user.token_version
+
+
+# 📈 Prometheus text exposition for the snapshots verify_token reads.
+# A hit is a check answered from memory, a miss one that had to ask the database.
+def render_metrics(*snapshots) -> str:
+    snapshots = snapshots or (token_versions,)
+    stats = {snapshot.name: snapshot.stats() for snapshot in snapshots}
+    lines = []
+    for metric, kind, key, help_text in (
+        ("hoainfo_auth_cache_hits_total", "counter", "hits", "Token checks answered from an in-memory snapshot."),
+        ("hoainfo_auth_cache_misses_total", "counter", "misses", "Token checks that fell through to the database."),
+        ("hoainfo_auth_cache_entries", "gauge", "entries", "Entries currently held by each snapshot."),
+        ("hoainfo_auth_cache_reloads_total", "counter", "reloads", "Reloads of each snapshot from the database."),
+    ):
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"]
+        lines += [f'{metric}{{snapshot="{name}"}} {values[key]}' for name, values in stats.items()]
+    lines += [
+        "# HELP hoainfo_tokens_rejected_total Access tokens rejected because their version was revoked.",
+        "# TYPE hoainfo_tokens_rejected_total counter",
+        f"hoainfo_tokens_rejected_total {token_versions.rejected}",
+    ]
+    return "\n".join(lines) + "\n"
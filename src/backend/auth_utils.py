@@ -1,45 +1,56 @@
 import os
-from datetime import datetime, timedelta
+import time
+from typing import Optional
 from dotenv import load_dotenv
-from fastapi import HTTPException, Security, Depends
+from fastapi import HTTPException, Request, Security
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
-from sqlmodel import select, Session
 
-from src.backend.models import User
-from src.backend.database import get_session
+from src.backend.auth_cache import ACCESS_TOKEN_EXPIRE_MINUTES, UserPrincipal, token_versions
+from src.backend.metrics import record_timing
+from src.backend.refresh_tokens import revoked_families
 
 # Load .env values
 load_dotenv()
 SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret")
 ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
 bearer_scheme = HTTPBearer()
 
-# ✅ Token verification for protected routes
-def verify_token(
-    credentials: HTTPAuthorizationCredentials = Security(bearer_scheme),
-    session: Session = Depends(get_session)
-) -> User:
-    token = credentials.credentials
+# ✅ Token verification for protected routes — claims only, no database round trip
+async def verify_token(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Security(bearer_scheme)
+) -> UserPrincipal:
+    start = time.perf_counter()
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email = payload.get("sub")
-        if not email:
-            raise HTTPException(status_code=401, detail="Token missing subject (email)")
+        # jose rejects an expired exp claim
+        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
+        principal = UserPrincipal.from_claims(payload)
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid JWT token")
+    except KeyError:
+        raise HTTPException(status_code=401, detail="Token missing claims; sign in again")
+    record_timing("jwt_decode", time.perf_counter() - start)
 
-    user = session.exec(select(User).where(User.email == email)).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    return user
-
-# ✅ Token creation for login and OTP flow
-def create_access_token(email: str) -> str:
-    expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode = {"sub": email, "exp": expire}
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    if not token_versions.is_current(principal.id, principal.token_version):
+        raise HTTPException(status_code=401, detail="Token revoked; sign in again")
+    # Signed out or replayed refresh family; the Bloom filter answers "no" without the database
+    family_id = payload.get("fam")
+    if family_id and await revoked_families.is_revoked(family_id):
+        raise HTTPException(status_code=401, detail="Session signed out; sign in again")
+    request.state.principal = principal
+    request.state.token_family = family_id
+    return principal
 
+# ✅ Token creation for login, OTP and refresh flows; family_id ties it to a refresh token
+def create_access_token(principal: UserPrincipal, family_id: Optional[str] = None) -> str:
+    issued_at = int(time.time())
+    to_encode = {
+        **principal.claims(),
+        "iat": issued_at,
+        "exp": issued_at + int(ACCESS_TOKEN_EXPIRE_MINUTES * 60),
+    }
+    if family_id:
+        to_encode["fam"] = family_id
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
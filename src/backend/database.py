@@ -1,14 +1,104 @@
+import os
+from typing import AsyncIterator, Iterator
+
+from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlmodel import SQLModel, create_engine, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.backend.metrics import instrument_engine
+from src.backend.otp_store import create_otp_store
+from src.backend.slow_query import SLOW_QUERY_LOG_ENABLED, attach_slow_query_log
+
+# ⚙️ Database settings — live in .env next to SECRET_KEY
+load_dotenv()
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///hoainfo.db")
+ASYNC_DATABASE_URL = os.getenv(
+    "ASYNC_DATABASE_URL", DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    # Negative cache_size is KiB rather than pages
+    "cache_size": -int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536")),
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "temp_store": os.getenv("SQLITE_TEMP_STORE", "MEMORY"),
+}
+
+
+def _apply_sqlite_pragmas(sync_engine: Engine, pragmas: dict) -> None:
+    @event.listens_for(sync_engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+# 🏭 Engine factory: WAL, pragmas at connect time, sized connection pool
+def make_engine(url: str = DATABASE_URL, pragmas: dict = SQLITE_PRAGMAS, **kwargs) -> Engine:
+    options = dict(echo=False)
+    if url.startswith("sqlite") and ":memory:" not in url:
+        options.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            connect_args={"check_same_thread": False},
+        )
+    options.update(kwargs)
+    new_engine = create_engine(url, **options)
+    if url.startswith("sqlite"):
+        _apply_sqlite_pragmas(new_engine, pragmas)
+    instrument_engine(new_engine)
+    if SLOW_QUERY_LOG_ENABLED:
+        attach_slow_query_log(new_engine)
+    return new_engine
+
+
+def make_async_engine(url: str = ASYNC_DATABASE_URL, pragmas: dict = SQLITE_PRAGMAS, **kwargs) -> AsyncEngine:
+    options = dict(echo=False)
+    if url.startswith("sqlite") and ":memory:" not in url:
+        options.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+        )
+    options.update(kwargs)
+    new_engine = create_async_engine(url, **options)
+    if url.startswith("sqlite"):
+        _apply_sqlite_pragmas(new_engine.sync_engine, pragmas)
+    instrument_engine(new_engine.sync_engine)
+    if SLOW_QUERY_LOG_ENABLED:
+        attach_slow_query_log(new_engine.sync_engine)
+    return new_engine
+
 
-DATABASE_URL = "sqlite:///hoainfo.db"
-engine = create_engine(DATABASE_URL, echo=False)
+engine = make_engine()
+async_engine = make_async_engine()
 
 def init_db():
     SQLModel.metadata.create_all(engine)
 
-def get_session():
-    return Session(engine)
+# 🔌 One session per request; closed (and rolled back if uncommitted) when the request ends
+def get_session() -> Iterator[Session]:
+    with Session(engine) as session:
+        yield session
 
-# (Optional) In-memory OTP store
-otp_store = {}
+# ⚡ Async twin for handlers that should not hold a threadpool thread
+async def get_async_session() -> AsyncIterator[AsyncSession]:
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
 
+# 🔑 OTP store — memory by default, OTP_STORE_BACKEND=sqlite to share across workers
+otp_store = create_otp_store()
@@ -1,11 +1,16 @@
+from typing import AsyncIterator, Iterator
+
 from fastapi import Depends, HTTPException
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from starlette.status import HTTP_403_FORBIDDEN
-from src.backend.models import User
+from src.backend.auth_cache import UserPrincipal
 from src.backend.auth_utils import verify_token  # ✅ use this version only
+from src.backend.shards import shard_router
 
 # 🔐 Require a single specific role (e.g. "admin")
 def require_role(required_role: str):
-    def checker(user: User = Depends(verify_token)):
+    def checker(user: UserPrincipal = Depends(verify_token)):
         if user.role != required_role:
             raise HTTPException(
                 status_code=HTTP_403_FORBIDDEN,
@@ -16,7 +21,7 @@ def require_role(required_role: str):
 
 # 🔐 Require ANY one of multiple roles (e.g. "board" or "admin")
 def require_any_role(*roles):
-    def checker(user: User = Depends(verify_token)):
+    def checker(user: UserPrincipal = Depends(verify_token)):
         if user.role not in roles:
             raise HTTPException(
                 status_code=HTTP_403_FORBIDDEN,
@@ -27,7 +32,7 @@ def require_any_role(*roles):
 
 # 💳 Require a specific subscription tier (e.g. "landlord", "household")
 def require_tier(*tiers):
-    def checker(user: User = Depends(verify_token)):
+    def checker(user: UserPrincipal = Depends(verify_token)):
         if user.tier not in tiers:
             raise HTTPException(
                 status_code=HTTP_403_FORBIDDEN,
@@ -36,3 +41,16 @@ def require_tier(*tiers):
         return user
     return checker
 
+
+# 🗂️ Sessions on the shard holding the caller's community (complaints, messages, board data)
+def get_community_session(user: UserPrincipal = Depends(verify_token)) -> Iterator[Session]:
+    with shard_router.session(user.community_id) as session:
+        yield session
+
+async def get_async_community_session(user: UserPrincipal = Depends(verify_token)) -> AsyncIterator[AsyncSession]:
+    async with shard_router.async_session(user.community_id) as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
@@ -0,0 +1,112 @@
+import logging
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from dotenv import load_dotenv
+
+from src.backend.uploads import HEIC_SUPPORTED, UPLOAD_DIR, photo_store
+
+load_dotenv()
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))
+THUMBNAIL_SIZE = int(os.getenv("THUMBNAIL_SIZE", "320"))
+WEB_RENDITION_SIZE = int(os.getenv("WEB_RENDITION_SIZE", "1600"))
+RENDITION_DIR = os.getenv("RENDITION_DIR", os.path.join(UPLOAD_DIR, "renditions"))
+
+# name -> longest edge in pixels
+RENDITIONS = {"thumbnail": THUMBNAIL_SIZE, "web": WEB_RENDITION_SIZE}
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ProcessPoolExecutor] = None
+_lock = threading.Lock()
+_in_flight: Set[str] = set()
+
+
+def rendition_path(digest: str, name: str) -> Path:
+    return Path(RENDITION_DIR) / name / digest[:2] / digest[2:4] / f"{digest}.jpg"
+
+
+# 🔎 Which renditions of a photo are already on disk. Stats the filesystem: not on the event loop.
+def available_renditions(digest: Optional[str]) -> Dict[str, bool]:
+    if not digest:
+        return {name: False for name in RENDITIONS}
+    return {name: rendition_path(digest, name).is_file() for name in RENDITIONS}
+
+
+# 🔎 The same for a page of photos at once, so a listing pays one threadpool hop
+def renditions_for(digests: Iterable[Optional[str]]) -> Dict[str, Dict[str, bool]]:
+    return {digest: available_renditions(digest) for digest in set(digests) if digest}
+
+
+# ⚙️ Worker-side: runs in a separate process, so Pillow's CPU work never touches the event loop
+def _render(source: str, targets: List[Tuple[int, str]]) -> None:
+    from PIL import Image, ImageOps
+
+    if HEIC_SUPPORTED:
+        from pillow_heif import register_heif_opener
+
+        register_heif_opener()
+
+    with Image.open(source) as original:
+        # Bake the orientation into pixels; re-encoding without exif= drops every tag (GPS included)
+        image = ImageOps.exif_transpose(original).convert("RGB")
+
+    for size, target in targets:
+        rendition = image.copy()
+        rendition.thumbnail((size, size), Image.LANCZOS)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        tmp = f"{target}.{os.getpid()}.tmp"
+        rendition.save(tmp, "JPEG", quality=82, optimize=True, progressive=True)
+        os.replace(tmp, target)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=IMAGE_WORKERS)
+        return _executor
+
+
+def _done(digest: str, future: Future) -> None:
+    with _lock:
+        _in_flight.discard(digest)
+    if future.cancelled():
+        return
+    error = future.exception()
+    if error is not None:
+        logger.error("rendition failed for %s", digest, exc_info=error)
+
+
+# 🖼️ Fire-and-forget: queue thumbnail + web renditions for a stored photo
+def schedule_renditions(digest: str) -> Optional[Future]:
+    missing = [
+        (RENDITIONS[name], str(rendition_path(digest, name)))
+        for name, ready in available_renditions(digest).items()
+        if not ready
+    ]
+    if not missing:
+        return None
+    with _lock:
+        if digest in _in_flight:
+            return None
+        _in_flight.add(digest)
+    try:
+        future = _get_executor().submit(_render, str(photo_store.path_for(digest)), missing)
+    except Exception:
+        with _lock:
+            _in_flight.discard(digest)
+        raise
+    future.add_done_callback(lambda f: _done(digest, f))
+    return future
+
+
+def shutdown() -> None:
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
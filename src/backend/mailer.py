@@ -0,0 +1,282 @@
+import asyncio
+import json
+import os
+import random
+import time
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import List, Optional
+
+import httpx
+from dotenv import load_dotenv
+from sqlalchemy import insert, select, update
+
+from src.backend.models import OutboundEmail
+
+load_dotenv()
+RESEND_API_KEY = os.getenv("RESEND_API_KEY")
+MAIL_FROM = os.getenv("MAIL_FROM", "onboarding@resend.dev")
+# resend | file | console — console keeps the old print-the-code behaviour for local dev
+MAIL_TRANSPORT = os.getenv("MAIL_TRANSPORT", "resend" if RESEND_API_KEY else "console")
+MAIL_SPOOL_DIR = os.getenv("MAIL_SPOOL_DIR", "mail_spool")
+MAIL_CONCURRENCY = int(os.getenv("MAIL_CONCURRENCY", "8"))
+MAIL_RATE_PER_SECOND = float(os.getenv("MAIL_RATE_PER_SECOND", "10"))
+MAIL_BATCH_SIZE = int(os.getenv("MAIL_BATCH_SIZE", "50"))
+MAIL_POLL_SECONDS = float(os.getenv("MAIL_POLL_SECONDS", "1.0"))
+MAIL_MAX_ATTEMPTS = int(os.getenv("MAIL_MAX_ATTEMPTS", "6"))
+MAIL_BACKOFF_BASE_SECONDS = float(os.getenv("MAIL_BACKOFF_BASE_SECONDS", "2"))
+MAIL_BACKOFF_MAX_SECONDS = float(os.getenv("MAIL_BACKOFF_MAX_SECONDS", "600"))
+MAIL_HTTP_TIMEOUT_SECONDS = float(os.getenv("MAIL_HTTP_TIMEOUT_SECONDS", "10"))
+# A claimed message whose sender died becomes claimable again after this long
+MAIL_CLAIM_LEASE_SECONDS = 300.0
+
+outbox = OutboundEmail.__table__
+
+
+class PermanentMailError(Exception):
+    """The provider rejected the message; retrying will not help."""
+
+
+# ✉️ Transports — the sender only needs send()
+class MailTransport(ABC):
+    async def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    @abstractmethod
+    async def send(self, recipient: str, subject: str, html: str) -> None:
+        ...
+
+
+class ResendTransport(MailTransport):
+    url = "https://api.resend.com/emails"
+
+    def __init__(self, api_key: Optional[str] = RESEND_API_KEY, sender: str = MAIL_FROM):
+        self.api_key = api_key
+        self.sender = sender
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def start(self) -> None:
+        # One pooled keep-alive client for the life of the sender
+        self._client = httpx.AsyncClient(
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            timeout=MAIL_HTTP_TIMEOUT_SECONDS,
+            limits=httpx.Limits(max_connections=MAIL_CONCURRENCY, max_keepalive_connections=MAIL_CONCURRENCY),
+        )
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def send(self, recipient: str, subject: str, html: str) -> None:
+        if self._client is None:
+            await self.start()
+        response = await self._client.post(
+            self.url, json={"from": self.sender, "to": recipient, "subject": subject, "html": html}
+        )
+        if response.status_code == 429 or response.status_code >= 500:
+            response.raise_for_status()
+        if response.status_code >= 400:
+            raise PermanentMailError(f"{response.status_code}: {response.text[:200]}")
+
+
+class FileTransport(MailTransport):
+    """Writes each message as JSON into a spool directory — the local/test stand-in for a provider."""
+
+    def __init__(self, spool_dir: str = MAIL_SPOOL_DIR):
+        self.spool_dir = Path(spool_dir)
+
+    async def send(self, recipient: str, subject: str, html: str) -> None:
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps({"to": recipient, "subject": subject, "html": html})
+        name = f"{time.time_ns()}-{random.getrandbits(32):08x}.json"
+        await asyncio.to_thread((self.spool_dir / name).write_text, payload)
+
+
+class ConsoleTransport(MailTransport):
+    async def send(self, recipient: str, subject: str, html: str) -> None:
+        print(f"[MAIL] {recipient}: {subject} — {html}")
+
+
+def create_transport(name: str = MAIL_TRANSPORT) -> MailTransport:
+    if name == "resend":
+        return ResendTransport()
+    if name == "file":
+        return FileTransport()
+    if name == "console":
+        return ConsoleTransport()
+    raise ValueError(f"Unknown MAIL_TRANSPORT: {name}")
+
+
+# 🪣 Per-provider token bucket, shared by every concurrent send
+class RateLimiter:
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = burst or max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def backoff_seconds(attempts: int) -> float:
+    delay = min(MAIL_BACKOFF_MAX_SECONDS, MAIL_BACKOFF_BASE_SECONDS * (2 ** (attempts - 1)))
+    # Full jitter so a provider outage doesn't produce synchronized retry waves
+    return random.uniform(delay / 2, delay)
+
+
+# 📥 Request-path API: one INSERT, no network
+def enqueue_email(engine, recipient: str, subject: str, html: str) -> None:
+    now = time.time()
+    with engine.begin() as conn:
+        conn.execute(insert(outbox).values(
+            id=str(uuid.uuid4()),
+            recipient=recipient,
+            subject=subject,
+            html=html,
+            status="pending",
+            attempts=0,
+            next_attempt_at=now,
+            created_at=now,
+        ))
+    mail_sender.wake()
+
+
+def enqueue_otp_email(engine, recipient: str, otp_code: str) -> None:
+    enqueue_email(
+        engine,
+        recipient,
+        "Your OTP Code",
+        f"<p>Your one-time password is: <strong>{otp_code}</strong></p>",
+    )
+
+
+# 📤 Background sender: claims due rows, sends with bounded concurrency, reschedules failures
+class MailSender:
+    def __init__(self, transport: Optional[MailTransport] = None):
+        self.transport = transport
+        self.engine = None
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._limiter: Optional[RateLimiter] = None
+
+    async def start(self, engine) -> None:
+        self.engine = engine
+        self.transport = self.transport or create_transport()
+        await self.transport.start()
+        # asyncio primitives are bound to the loop that starts the sender
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._slots = asyncio.Semaphore(MAIL_CONCURRENCY)
+        self._limiter = RateLimiter(MAIL_RATE_PER_SECOND)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._loop = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.transport is not None:
+            await self.transport.close()
+
+    # Safe to call from request threads as well as the event loop
+    def wake(self) -> None:
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                batch = await self._claim()
+                if batch:
+                    await asyncio.gather(*(self._deliver(row) for row in batch))
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                print(f"[MAIL] sender loop error: {exc!r}")
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), MAIL_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _claim(self) -> List:
+        now = time.time()
+        due = (
+            select(outbox.c.id)
+            .where(outbox.c.status.in_(("pending", "sending")), outbox.c.next_attempt_at <= now)
+            .order_by(outbox.c.next_attempt_at)
+            .limit(MAIL_BATCH_SIZE)
+        )
+        claim = (
+            update(outbox)
+            .where(outbox.c.id.in_(due.scalar_subquery()))
+            .values(status="sending", next_attempt_at=now + MAIL_CLAIM_LEASE_SECONDS)
+            .returning(outbox.c.id, outbox.c.recipient, outbox.c.subject, outbox.c.html, outbox.c.attempts)
+        )
+
+        def run():
+            with self.engine.begin() as conn:
+                return conn.execute(claim).all()
+
+        return await asyncio.to_thread(run)
+
+    async def _deliver(self, row) -> None:
+        async with self._slots:
+            await self._limiter.acquire()
+            try:
+                await self.transport.send(row.recipient, row.subject, row.html)
+            except PermanentMailError as exc:
+                await self._finish(row.id, status="failed", attempts=row.attempts + 1, error=str(exc))
+            except Exception as exc:
+                attempts = row.attempts + 1
+                if attempts >= MAIL_MAX_ATTEMPTS:
+                    await self._finish(row.id, status="failed", attempts=attempts, error=repr(exc))
+                else:
+                    await self._finish(
+                        row.id,
+                        status="pending",
+                        attempts=attempts,
+                        error=repr(exc),
+                        next_attempt_at=time.time() + backoff_seconds(attempts),
+                    )
+            else:
+                # Don't keep one-time codes at rest once delivered
+                await self._finish(row.id, status="sent", attempts=row.attempts + 1, html="")
+
+    async def _finish(self, message_id: str, **values) -> None:
+        values["last_error"] = values.pop("error", None)
+        statement = update(outbox).where(outbox.c.id == message_id).values(**values)
+
+        def run():
+            with self.engine.begin() as conn:
+                conn.execute(statement)
+
+        await asyncio.to_thread(run)
+
+
+mail_sender = MailSender()
@@ -3,23 +3,33 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from dotenv import load_dotenv
 from sqlmodel import select, Session
-from starlette.responses import JSONResponse
-from jose import jwt
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse, PlainTextResponse
 
-import bcrypt
-import os
 import random
-import threading
-import time
 
 # 🔐 Local imports
 from src.backend.database import otp_store
-from src.backend.auth_utils import verify_token
+from src.backend.otp_store import OTPCheck
+from src.backend.auth_cache import SnapshotReloader, render_metrics, token_versions
+from src.backend.rate_limit import Limit, SlidingWindow, TokenBucket, rate_limit
+from src.backend.rate_limit import render_metrics as render_rate_limit_metrics
+from src.backend.metrics import MetricsMiddleware, render_http_metrics
+from src.backend import image_jobs, password_pool
+from src.backend.mailer import enqueue_otp_email, mail_sender
+from src.backend.activity_log import ACTIVITY_LOG_ENABLED, ActivityLogMiddleware, ActivityLogWriter
 from src.backend.otp_routes import router as otp_router
-from src.backend.database import init_db, get_session
+from src.backend.database import init_db, get_session, engine, async_engine
+from src.backend.shards import shard_router
 from src.backend.models import User
 from src.backend.secure_routes import router as secure_router
 from src.backend.routes import router as core_router
+from src.backend.media_routes import router as media_router
+from src.backend.message_routes import router as message_router
+from src.backend.search_routes import router as search_router
+from src.backend.token_routes import issue_tokens, router as token_router
+from src.backend.refresh_tokens import revoked_families
 
 # 🌐 Initialize FastAPI app
 app = FastAPI()
@@ -33,16 +43,39 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 📝 Request audit trail, written off the request path in batches
+activity_writer = ActivityLogWriter(engine)
+if ACTIVITY_LOG_ENABLED:
+    app.add_middleware(ActivityLogMiddleware, writer=activity_writer)
+
+# ⏱️ Outermost, so latency covers every other middleware too
+app.add_middleware(MetricsMiddleware)
+
+# ♻️ Revocation snapshots verify_token reads; reloaded in the background, never per request
+snapshot_reloader = SnapshotReloader(token_versions, revoked_families)
+
 # 👇 Guarantee table creation at startup
 @app.on_event("startup")
-def startup():
+async def startup():
     init_db()
-
-# 🔐 Load secret settings
+    shard_router.init_schema()
+    if ACTIVITY_LOG_ENABLED:
+        activity_writer.start()
+    await mail_sender.start(engine)
+    await snapshot_reloader.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await snapshot_reloader.stop()
+    activity_writer.stop()
+    await mail_sender.stop()
+    password_pool.shutdown()
+    image_jobs.shutdown()
+    await shard_router.dispose()
+    await async_engine.dispose()
+
+# 🔐 Load settings
 load_dotenv()
-SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret")
-ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
 
 
@@ -57,78 +90,96 @@ class LoginModel(BaseModel):
     password: str
     otp: str
 
-# 🧠 OTP store — memory-based
-
-def cleanup_expired_otps():
-    while True:
-        time.sleep(60)
-        now = time.time()
-        expired = [email for email, (otp, ts, attempts) in otp_store.items() if now - ts > 300]
-        for email in expired:
-            del otp_store[email]
+# 📨 OTP delivery — only enqueues; mailer.MailSender does the network I/O
+# Benchmarks/tests set otp_delivery_hook to capture codes instead
+otp_delivery_hook = None
 
-# Start cleanup thread
-threading.Thread(target=cleanup_expired_otps, daemon=True).start()
+def deliver_otp(email: str, otp_code: str) -> None:
+    if otp_delivery_hook is not None:
+        otp_delivery_hook(email, otp_code)
+        return
+    enqueue_otp_email(engine, email, otp_code)
 
 # 🧾 Registration route
-@app.post("/register")
-def register(user: RegisterModel, session: Session = Depends(get_session)):
-    existing = session.exec(select(User).where(User.email == user.email)).first()
-    if existing:
+# Only the bcrypt await runs on the event loop; the commit, the OTP store (BEGIN IMMEDIATE
+# on the SQLite backend) and the outbox insert can wait on locks, so they go to the threadpool
+def _create_user(session: Session, user: RegisterModel, hashed_pw: str) -> None:
+    session.add(User(email=user.email, password_hash=hashed_pw, community_id=user.community_id))
+    # One INSERT; the unique index on user.email is the duplicate check
+    try:
+        session.commit()
+    except IntegrityError:
+        session.rollback()
         raise HTTPException(status_code=400, detail="Email already registered")
-    
-    hashed_pw = bcrypt.hashpw(user.password.encode(), bcrypt.gensalt()).decode()
-    new_user = User(email=user.email, password_hash=hashed_pw, community_id=user.community_id)
-    session.add(new_user)
-    session.commit()
-    session.refresh(new_user)
 
     otp_code = str(random.randint(100000, 999999))
-    otp_store[user.email] = (otp_code, time.time(), 0)
-    print(f"[OTP] {user.email}: {otp_code}")  # Replace with email sender in prod
+    otp_store.put(user.email, otp_code)
+    deliver_otp(user.email, otp_code)
 
+@app.post("/register")
+async def register(user: RegisterModel, session: Session = Depends(get_session)):
+    hashed_pw = await password_pool.hash_password(user.password)
+    await run_in_threadpool(_create_user, session, user, hashed_pw)
     return {"message": "User registered. OTP sent."}
 
 # 🔐 Login route with OTP verification
-@app.post("/login")
-def login(credentials: LoginModel, session: Session = Depends(get_session)):
-    user = session.exec(select(User).where(User.email == credentials.email)).first()
-    if not user or not bcrypt.checkpw(credentials.password.encode(), user.password_hash.encode()):
-        raise HTTPException(status_code=401, detail="Invalid credentials")
+def _user_by_email(session: Session, email: str):
+    return session.exec(select(User).where(User.email == email)).first()
 
-    otp_entry = otp_store.get(credentials.email)
-    if not otp_entry:
+def _complete_login(session: Session, user: User, credentials: LoginModel) -> dict:
+    result = otp_store.check(credentials.email, credentials.otp)
+    if result is OTPCheck.MISSING:
         raise HTTPException(status_code=401, detail="OTP expired or not found")
-    
-    otp_code, timestamp, attempts = otp_entry
-    if attempts >= 3:   
+    if result is OTPCheck.LOCKED:
         raise HTTPException(status_code=403, detail="Too many OTP attempts")
- 
-    if credentials.otp != otp_code:
-        otp_store[credentials.email] = (otp_code, timestamp, attempts + 1)
+    if result is OTPCheck.INVALID:
         raise HTTPException(status_code=401, detail="Invalid OTP")
 
-    # ✅ OTP passed — issue JWT
-    del otp_store[credentials.email]
-    payload = {"sub": user.email}
-    token = jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
-    return {"access_token": token, "token_type": "bearer"}
-
-@app.post("/resend-otp")
+    # ✅ OTP passed (and consumed) — a short-lived JWT plus a refresh token, so the
+    # client need not repeat bcrypt and OTP every time the JWT expires
+    return issue_tokens(session, user)
+
+# Per IP, and per account from each IP: a tight per-account limit keyed on the email
+# alone would let anyone lock a victim out by failing logins in their name
+@app.post("/login", dependencies=[rate_limit(
+    "login",
+    Limit(SlidingWindow(20, 60), "ip"),
+    Limit(TokenBucket(5, 1 / 60), "email_ip"),
+)])
+async def login(credentials: LoginModel, session: Session = Depends(get_session)):
+    user = await run_in_threadpool(_user_by_email, session, credentials.email)
+    if not user or not await password_pool.verify_password(credentials.password, user.password_hash):
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    return await run_in_threadpool(_complete_login, session, user, credentials)
+
+# Every resend queues an email, so there is a ceiling across all callers as well
+@app.post("/resend-otp", dependencies=[rate_limit(
+    "resend-otp",
+    Limit(SlidingWindow(10, 600), "ip"),
+    Limit(TokenBucket(3, 1 / 120), "email"),
+    Limit(SlidingWindow(600, 60), "route"),
+)])
 def resend_otp(email: str):
-    import time, random
     otp = str(random.randint(100000, 999999))
-    otp_store[email] = (otp, time.time(), 0)
-    print(f"[OTP] {email}: {otp}")
+    otp_store.put(email, otp)
+    deliver_otp(email, otp)
     return {"message": f"OTP reissued for {email}"}
 
 # 🔗 Include routers
 app.include_router(secure_router)
 app.include_router(core_router)
 app.include_router(otp_router)
+app.include_router(media_router)
+app.include_router(message_router)
+app.include_router(search_router)
+app.include_router(token_router)
 
 # 🔍 Root route
 @app.get("/")
 def root():
     return {"message": "HOAinfo API is live"}
 
+# 📈 Scrape endpoint for in-process counters
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return render_http_metrics() + render_metrics(*snapshot_reloader.snapshots) + render_rate_limit_metrics()
@@ -0,0 +1,61 @@
+import os
+from typing import Optional
+
+import anyio
+from fastapi import APIRouter, HTTPException, Path, Request
+from starlette.responses import FileResponse, Response
+
+from src.backend.image_jobs import RENDITIONS, rendition_path
+from src.backend.uploads import photo_store, sniff_image_type
+
+router = APIRouter()
+
+# Content-addressed bytes never change, so caches may keep them forever
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+MEDIA_KINDS = {"photo", *RENDITIONS}
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+# 🖼️ Stored complaint photos and their renditions, addressed by SHA-256 digest
+@router.api_route("/media/{kind}/{digest}", methods=["GET", "HEAD"])
+async def serve_media(
+    request: Request,
+    kind: str,
+    digest: str = Path(..., pattern="^[0-9a-f]{64}$"),
+):
+    if kind not in MEDIA_KINDS:
+        raise HTTPException(status_code=404, detail="Not found")
+
+    path = photo_store.path_for(digest) if kind == "photo" else rendition_path(digest, kind)
+    etag = f'"{digest}"' if kind == "photo" else f'"{digest}-{kind}"'
+
+    try:
+        stat_result = await anyio.to_thread.run_sync(os.stat, path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Not found")
+
+    # Only once the file is known to exist: "*" matches any current representation, not none
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"etag": etag, "cache-control": IMMUTABLE_CACHE_CONTROL})
+
+    if kind == "photo":
+        async with await anyio.open_file(path, mode="rb") as file:
+            media_type = sniff_image_type(await file.read(16)) or "application/octet-stream"
+    else:
+        media_type = "image/jpeg"
+
+    # Starlette's FileResponse handles HEAD, Range and If-Range; the digest-derived ETag replaces
+    # its mtime/size one. Bytes are streamed in chunks: uvicorn offers no pathsend/zero-copy
+    # extension, so large-file offload belongs in the reverse proxy (X-Accel-Redirect/sendfile).
+    return FileResponse(
+        str(path),
+        media_type=media_type,
+        stat_result=stat_result,
+        headers={"etag": etag, "cache-control": IMMUTABLE_CACHE_CONTROL},
+    )
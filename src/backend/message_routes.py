@@ -0,0 +1,238 @@
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+from sqlalchemy import func, tuple_, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.backend.auth_cache import UserPrincipal
+from src.backend.auth_utils import verify_token
+from src.backend.database import get_async_session
+from src.backend.dependencies import get_async_community_session, require_any_role
+from src.backend.models import InboxCounter, Message, User
+from src.backend.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, cursor_datetime, decode_cursor, encode_cursor
+from src.backend.timezones import to_local
+
+router = APIRouter()
+
+
+class SendMessageModel(BaseModel):
+    # None addresses the HOA itself; its board members read those at GET /messages/hoa
+    receiver_email: Optional[str] = None
+    subject: str
+    body: str
+
+
+class MessageRead(BaseModel):
+    id: str
+    sender_id: str
+    sender_email: Optional[str]
+    recipient_id: Optional[str]
+    recipient_email: Optional[str]
+    subject: str
+    body: str
+    timestamp: datetime
+    read: bool
+    response: Optional[str]
+
+
+class MessagePage(BaseModel):
+    items: List[MessageRead]
+    next_cursor: Optional[str] = None
+    unread: int
+
+
+def _adjust_unread(user_id: str, community_id: str, delta: int):
+    # Upsert so a recipient's first message creates their counter row
+    statement = insert(InboxCounter.__table__).values(
+        user_id=user_id, community_id=community_id, unread=max(delta, 0)
+    )
+    return statement.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={"unread": func.max(InboxCounter.__table__.c.unread + delta, 0)},
+    )
+
+
+async def _unread(session: AsyncSession, user_id: str) -> int:
+    # Primary-key read; the badge never counts the inbox itself
+    count = (await session.exec(select(InboxCounter.unread).where(InboxCounter.user_id == user_id))).first()
+    return count or 0
+
+
+async def _emails(users: AsyncSession, user_ids: Iterable[Optional[str]]) -> Dict[str, str]:
+    # Users live in the directory database, messages on the community's shard: one IN lookup per page
+    ids = {user_id for user_id in user_ids if user_id}
+    if not ids:
+        return {}
+    rows = (await users.exec(select(User.id, User.email).where(User.id.in_(ids)))).all()
+    return {user_id: email for user_id, email in rows}
+
+
+async def _page(session: AsyncSession, query, cursor: Optional[str], limit: int):
+    after = decode_cursor(cursor, 2)
+    if after:
+        after_key = (cursor_datetime(after[0]), after[1])
+        query = query.where(tuple_(Message.timestamp, Message.id) < tuple_(*after_key))
+
+    # One extra row tells us whether another page exists
+    rows = (await session.exec(
+        query.order_by(Message.timestamp.desc(), Message.id.desc()).limit(limit + 1)
+    )).all()
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(last.timestamp.isoformat(), last.id)
+    return items, next_cursor
+
+
+def _read_model(message: Message, emails: Dict[str, str]) -> MessageRead:
+    return MessageRead(
+        id=message.id,
+        sender_id=message.user_id,
+        sender_email=emails.get(message.user_id),
+        recipient_id=message.recipient_id,
+        recipient_email=emails.get(message.recipient_id),
+        subject=message.subject,
+        body=message.body,
+        timestamp=to_local(message.timestamp, message.community_id),
+        read=message.read,
+        response=message.response,
+    )
+
+
+# ✉️ Send a message to another resident of the same community, or to its HOA
+@router.post("/messages/send")
+async def send_message(
+    data: SendMessageModel,
+    user: UserPrincipal = Depends(verify_token),
+    users: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_async_community_session)
+):
+    recipient_id = None
+    if data.receiver_email is not None:
+        recipient = (await users.exec(
+            select(User.id, User.community_id).where(User.email == data.receiver_email)
+        )).first()
+        # Other communities' residents are indistinguishable from unknown addresses
+        if not recipient or recipient.community_id != user.community_id:
+            raise HTTPException(status_code=404, detail="Recipient not found")
+        recipient_id = recipient.id
+
+    message = Message(
+        user_id=user.id,
+        recipient_id=recipient_id,
+        subject=data.subject,
+        body=data.body,
+        community_id=user.community_id
+    )
+    session.add(message)
+    if recipient_id is not None:
+        await session.exec(_adjust_unread(recipient_id, user.community_id, 1))
+    await session.commit()
+    return {"status": "Message sent.", "id": message.id}
+
+
+# 📥 Inbox, newest first, one keyset page at a time
+@router.get("/messages/inbox", response_model=MessagePage)
+async def get_inbox(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    unread: bool = False,
+    user: UserPrincipal = Depends(verify_token),
+    users: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_async_community_session)
+):
+    # unread=true walks (recipient_id, read, timestamp, id), the full inbox
+    # (recipient_id, timestamp, id); both in keyset order
+    query = select(Message).where(Message.recipient_id == user.id)
+    if unread:
+        query = query.where(Message.read == False)  # noqa: E712
+    items, next_cursor = await _page(session, query, cursor, limit)
+    emails = await _emails(users, (message.user_id for message in items))
+    emails[user.id] = user.email
+    return MessagePage(
+        items=[_read_model(message, emails) for message in items],
+        next_cursor=next_cursor,
+        unread=await _unread(session, user.id),
+    )
+
+
+# 📤 Outbox, newest first
+@router.get("/messages/outbox", response_model=MessagePage)
+async def get_outbox(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    user: UserPrincipal = Depends(verify_token),
+    users: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_async_community_session)
+):
+    items, next_cursor = await _page(session, select(Message).where(Message.user_id == user.id), cursor, limit)
+    emails = await _emails(users, (message.recipient_id for message in items))
+    emails[user.id] = user.email
+    return MessagePage(
+        items=[_read_model(message, emails) for message in items],
+        next_cursor=next_cursor,
+        unread=await _unread(session, user.id),
+    )
+
+
+# 🏛️ Messages addressed to the HOA itself, for the community's board, newest first
+@router.get("/messages/hoa", response_model=MessagePage)
+async def get_hoa_mailbox(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    user: UserPrincipal = Depends(require_any_role("board", "admin")),
+    users: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_async_community_session)
+):
+    # IS NULL is an equality for the index: (community_id, recipient_id, timestamp, id) in keyset order
+    query = select(Message).where(Message.community_id == user.community_id, Message.recipient_id.is_(None))
+    items, next_cursor = await _page(session, query, cursor, limit)
+    emails = await _emails(users, (message.user_id for message in items))
+    return MessagePage(
+        items=[_read_model(message, emails) for message in items],
+        next_cursor=next_cursor,
+        unread=await _unread(session, user.id),
+    )
+
+
+# 🔴 Unread badge
+@router.get("/messages/unread")
+async def get_unread_count(
+    user: UserPrincipal = Depends(verify_token),
+    session: AsyncSession = Depends(get_async_community_session)
+):
+    return {"unread": await _unread(session, user.id)}
+
+
+# ✅ Mark one message read; the counter moves in the same transaction
+@router.post("/messages/{message_id}/read")
+async def mark_message_read(
+    message_id: str,
+    user: UserPrincipal = Depends(verify_token),
+    session: AsyncSession = Depends(get_async_community_session)
+):
+    # The read = 0 guard makes repeats no-ops, so the counter is decremented once per message
+    marked = (await session.exec(
+        update(Message)
+        .where(Message.id == message_id, Message.recipient_id == user.id, Message.read == False)  # noqa: E712
+        .values(read=True)
+        .returning(Message.id)
+    )).first()
+    if not marked:
+        exists = (await session.exec(
+            select(Message.id).where(Message.id == message_id, Message.recipient_id == user.id)
+        )).first()
+        if not exists:
+            raise HTTPException(status_code=404, detail="Message not found")
+        return {"read": True, "unread": await _unread(session, user.id)}
+
+    unread = (await session.exec(
+        _adjust_unread(user.id, user.community_id, -1).returning(InboxCounter.__table__.c.unread)
+    )).scalar_one()
+    await session.commit()
+    return {"read": True, "unread": unread}
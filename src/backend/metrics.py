@@ -0,0 +1,240 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Latency buckets in seconds; bcrypt-bound routes land in the upper half
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class _RouteStats:
+    __slots__ = ("buckets", "count", "seconds", "db_queries", "db_seconds")
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.seconds = 0.0
+        self.db_queries = 0
+        self.db_seconds = 0.0
+
+
+# 🧵 One stats block per thread: writers never share a counter, so no locks on the hot path
+class _ThreadStats:
+    __slots__ = ("routes", "statuses", "timings", "in_flight", "queries", "query_seconds")
+
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], _RouteStats] = {}
+        self.statuses: Dict[Tuple[str, str, int], int] = {}
+        self.timings: Dict[str, List[float]] = {}
+        self.in_flight = 0
+        self.queries = 0
+        self.query_seconds = 0.0
+
+
+_local = threading.local()
+_all_stats: List[_ThreadStats] = []
+_registry_lock = threading.Lock()
+
+
+def _stats() -> _ThreadStats:
+    stats = getattr(_local, "stats", None)
+    if stats is None:
+        stats = _local.stats = _ThreadStats()
+        with _registry_lock:
+            _all_stats.append(stats)
+    return stats
+
+
+# Per-request DB tally; copied into threadpool workers along with the rest of the context
+class _RequestDB:
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+
+_request_db: ContextVar[Optional[_RequestDB]] = ContextVar("request_db", default=None)
+_request_scope: ContextVar[Optional[dict]] = ContextVar("request_scope", default=None)
+
+
+# Route template of the request running in this context, for diagnostics like the slow-query log
+def current_route() -> Optional[str]:
+    scope = _request_scope.get()
+    if scope is None:
+        return None
+    route = getattr(scope.get("route"), "path", scope.get("path"))
+    return f"{scope.get('method')} {route}"
+
+
+# 🗄️ Cursor hooks: count and time every statement, globally and for the current request
+def instrument_engine(sync_engine: Engine) -> None:
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        stats = _stats()
+        stats.queries += 1
+        stats.query_seconds += elapsed
+        tally = _request_db.get()
+        if tally is not None:
+            tally.queries += 1
+            tally.seconds += elapsed
+
+
+# ⏲️ Named in-request operations (bcrypt, JWT decode) so route latency can be broken down
+def record_timing(operation: str, seconds: float) -> None:
+    timings = _stats().timings
+    entry = timings.get(operation)
+    if entry is None:
+        entry = timings[operation] = [0, 0.0]
+    entry[0] += 1
+    entry[1] += seconds
+
+
+# ⏱️ Pure ASGI middleware: latency histogram, status counts and in-flight gauge per route
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        tally = _RequestDB()
+        token = _request_db.set(tally)
+        scope_token = _request_scope.set(scope)
+        stats = _stats()
+        stats.in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _request_db.reset(token)
+            _request_scope.reset(scope_token)
+            # The event loop thread started this request, so it also finishes it
+            stats.in_flight -= 1
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            key = (scope["method"], route)
+            route_stats = stats.routes.get(key)
+            if route_stats is None:
+                route_stats = stats.routes[key] = _RouteStats()
+            route_stats.buckets[bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+            route_stats.count += 1
+            route_stats.seconds += elapsed
+            route_stats.db_queries += tally.queries
+            route_stats.db_seconds += tally.seconds
+            status_key = (scope["method"], route, status["code"])
+            stats.statuses[status_key] = stats.statuses.get(status_key, 0) + 1
+
+
+def _labels(method: str, route: str, **extra) -> str:
+    pairs = [("method", method), ("route", route), *extra.items()]
+    return ",".join(f'{name}="{value}"' for name, value in pairs)
+
+
+# 📈 Merge every thread's block at scrape time; only /metrics pays for aggregation
+def render_http_metrics() -> str:
+    with _registry_lock:
+        blocks = list(_all_stats)
+
+    routes: Dict[Tuple[str, str], _RouteStats] = {}
+    statuses: Dict[Tuple[str, str, int], int] = {}
+    timings: Dict[str, List[float]] = {}
+    in_flight = queries = 0
+    query_seconds = 0.0
+    for block in blocks:
+        in_flight += block.in_flight
+        queries += block.queries
+        query_seconds += block.query_seconds
+        for key, count in list(block.statuses.items()):
+            statuses[key] = statuses.get(key, 0) + count
+        for operation, (count, seconds) in list(block.timings.items()):
+            total_timing = timings.setdefault(operation, [0, 0.0])
+            total_timing[0] += count
+            total_timing[1] += seconds
+        for key, source in list(block.routes.items()):
+            total = routes.get(key)
+            if total is None:
+                total = routes[key] = _RouteStats()
+            total.buckets = [a + b for a, b in zip(total.buckets, source.buckets)]
+            total.count += source.count
+            total.seconds += source.seconds
+            total.db_queries += source.db_queries
+            total.db_seconds += source.db_seconds
+
+    lines = [
+        "# HELP hoainfo_http_request_duration_seconds Request latency by route.",
+        "# TYPE hoainfo_http_request_duration_seconds histogram",
+    ]
+    for (method, route), stats in sorted(routes.items()):
+        cumulative = 0
+        for bound, count in zip((*LATENCY_BUCKETS, "+Inf"), stats.buckets):
+            cumulative += count
+            lines.append(
+                f"hoainfo_http_request_duration_seconds_bucket{{{_labels(method, route, le=bound)}}} {cumulative}"
+            )
+        lines.append(f"hoainfo_http_request_duration_seconds_sum{{{_labels(method, route)}}} {stats.seconds:.6f}")
+        lines.append(f"hoainfo_http_request_duration_seconds_count{{{_labels(method, route)}}} {stats.count}")
+
+    lines += [
+        "# HELP hoainfo_http_responses_total Responses by route and status code.",
+        "# TYPE hoainfo_http_responses_total counter",
+    ]
+    for (method, route, code), count in sorted(statuses.items()):
+        lines.append(f"hoainfo_http_responses_total{{{_labels(method, route, status=code)}}} {count}")
+
+    lines += [
+        "# HELP hoainfo_http_requests_in_flight Requests currently being handled.",
+        "# TYPE hoainfo_http_requests_in_flight gauge",
+        f"hoainfo_http_requests_in_flight {in_flight}",
+        "# HELP hoainfo_http_db_queries_total SQL statements executed while handling a route.",
+        "# TYPE hoainfo_http_db_queries_total counter",
+    ]
+    for (method, route), stats in sorted(routes.items()):
+        lines.append(f"hoainfo_http_db_queries_total{{{_labels(method, route)}}} {stats.db_queries}")
+    lines += [
+        "# HELP hoainfo_http_db_seconds_total Time spent in SQL while handling a route.",
+        "# TYPE hoainfo_http_db_seconds_total counter",
+    ]
+    for (method, route), stats in sorted(routes.items()):
+        lines.append(f"hoainfo_http_db_seconds_total{{{_labels(method, route)}}} {stats.db_seconds:.6f}")
+
+    lines += [
+        "# HELP hoainfo_db_queries_total SQL statements executed, including background work.",
+        "# TYPE hoainfo_db_queries_total counter",
+        f"hoainfo_db_queries_total {queries}",
+        "# HELP hoainfo_db_query_seconds_total Time spent executing SQL statements.",
+        "# TYPE hoainfo_db_query_seconds_total counter",
+        f"hoainfo_db_query_seconds_total {query_seconds:.6f}",
+    ]
+    lines += [
+        "# HELP hoainfo_operation_seconds_total Time spent in named operations such as bcrypt and JWT decode.",
+        "# TYPE hoainfo_operation_seconds_total counter",
+    ]
+    for operation, (_, seconds) in sorted(timings.items()):
+        lines.append(f'hoainfo_operation_seconds_total{{operation="{operation}"}} {seconds:.6f}')
+    lines += [
+        "# HELP hoainfo_operations_total Completed named operations.",
+        "# TYPE hoainfo_operations_total counter",
+    ]
+    for operation, (count, _) in sorted(timings.items()):
+        lines.append(f'hoainfo_operations_total{{operation="{operation}"}} {count}')
+    return "\n".join(lines) + "\n"
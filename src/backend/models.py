@@ -1,50 +1,88 @@
-from sqlalchemy import Column
-from sqlalchemy.dialects.sqlite import JSON
-from sqlmodel import SQLModel, Field, Relationship
-from typing import Optional, List
+from sqlalchemy import DDL, Index, event
+from sqlmodel import SQLModel, Field
+from datetime import datetime
+from typing import Optional, List, Tuple
 import uuid
 
+from src.backend.timezones import utc_now
+
 class User(SQLModel, table=True):
     id: Optional[str] = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
-    email: str
+    email: str = Field(index=True, unique=True)
     password_hash: str
     role: Optional[str] = Field(default="resident")
     tier: Optional[str] = Field(default="solo")
     community_id: str
+    # Bumped to revoke every access token issued before; see auth_cache.revoke_tokens
+    token_version: int = Field(default=0)
+    token_revoked_at: Optional[datetime] = Field(default=None, index=True)
 
-    complaints: List["Complaint"] = Relationship(back_populates="user")
-    messages: List["Message"] = Relationship(back_populates="user")
-
+# Complaints, messages and board votes may live on a shard while users stay in the
+# directory database, so their user ids carry no foreign key (see shards.SHARDED_MODELS)
 class Complaint(SQLModel, table=True):
+    # Keyset pagination for GET /complaints walks this index newest-first
+    __table_args__ = (
+        Index("ix_complaint_community_timestamp_id", "community_id", "timestamp", "id"),
+    )
+
     id: Optional[str] = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
-    user_id: str = Field(foreign_key="user.id")
+    user_id: str
     title: str
     description: str
-    timestamp: Optional[str]
+    # Naive UTC; rendered in the community's zone by the API
+    timestamp: datetime = Field(default_factory=utc_now)
     photo_url: Optional[str] = None
     community_id: str
     read: bool = False
-    user: Optional[User] = Relationship(back_populates="complaints")
+    # Key into complaint_fts; assigned by the insert trigger, see FTS_INDEXES
+    search_rowid: Optional[int] = Field(default=None, index=True, unique=True)
 
 class Message(SQLModel, table=True):
+    # Unread-only and full inbox pages, outbox pages and the HOA mailbox each walk
+    # their own index in keyset order, so no page needs a sort
+    __table_args__ = (
+        Index("ix_message_recipient_read_timestamp_id", "recipient_id", "read", "timestamp", "id"),
+        Index("ix_message_recipient_timestamp_id", "recipient_id", "timestamp", "id"),
+        Index("ix_message_sender_timestamp_id", "user_id", "timestamp", "id"),
+        Index("ix_message_community_recipient_timestamp_id", "community_id", "recipient_id", "timestamp", "id"),
+    )
+
     id: Optional[str] = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
-    user_id: str = Field(foreign_key="user.id")
+    # The sender
+    user_id: str
+    # A user.id, or None for messages addressed to the HOA itself; the community's
+    # board members read those at GET /messages/hoa
+    recipient_id: Optional[str] = None
     subject: str
     body: str
-    timestamp: Optional[str]
+    timestamp: datetime = Field(default_factory=utc_now)
     read: bool = False
     response: Optional[str] = None
     community_id: str
-    user: Optional[User] = Relationship(back_populates="messages")
+    # Key into message_fts; assigned by the insert trigger, see FTS_INDEXES
+    search_rowid: Optional[int] = Field(default=None, index=True, unique=True)
+
+# Unread badge per recipient; changed in the same transaction as every send and mark-read
+class InboxCounter(SQLModel, table=True):
+    __tablename__ = "inbox_counter"
+
+    user_id: str = Field(primary_key=True)
+    community_id: str
+    unread: int = Field(default=0)
 
 class ActivityLog(SQLModel, table=True):
+    # Retention and date-range queries scan by time
+    __table_args__ = (
+        Index("ix_activitylog_timestamp", "timestamp"),
+    )
+
     id: Optional[str] = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
     user_id: str
     action: str
     endpoint: str
     ip_address: str
     user_agent: str
-    timestamp: str
+    timestamp: datetime = Field(default_factory=utc_now)
     community_id: str
 
 class TenantInvite(SQLModel, table=True):
@@ -56,8 +94,109 @@ class TenantInvite(SQLModel, table=True):
 
 class BoardVerificationRequest(SQLModel, table=True):
     id: Optional[str] = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
-    user_id: str = Field(foreign_key="user.id")
-    community_id: str
-    approved_by: List[str] = Field(default_factory=list, sa_column=Column(JSON))
+    user_id: str = Field(index=True)
+    community_id: str = Field(index=True)
+    # Maintained in the same transaction as each BoardApproval insert
+    approval_count: int = Field(default=0)
     verified: bool = Field(default=False)
 
+# One row per (candidate request, approving member); the composite key rejects double votes
+class BoardApproval(SQLModel, table=True):
+    __tablename__ = "board_approval"
+
+    request_id: str = Field(foreign_key="boardverificationrequest.id", primary_key=True)
+    approver_id: str = Field(primary_key=True)
+
+
+# Durable outbound mail queue drained by src.backend.mailer
+class OutboundEmail(SQLModel, table=True):
+    __tablename__ = "outbound_email"
+    __table_args__ = (
+        Index("ix_outbound_email_status_next_attempt", "status", "next_attempt_at"),
+    )
+
+    id: Optional[str] = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+    recipient: str
+    subject: str
+    html: str
+    # pending -> sending -> sent | failed
+    status: str = Field(default="pending")
+    attempts: int = Field(default=0)
+    next_attempt_at: float
+    created_at: float
+    last_error: Optional[str] = None
+
+
+# Directory-side placement overrides written by scripts/move_community.py;
+# communities without a row live where the hash ring puts them
+class CommunityShard(SQLModel, table=True):
+    __tablename__ = "community_shard"
+
+    community_id: str = Field(primary_key=True)
+    shard: str
+    moved_at: datetime = Field(default_factory=utc_now)
+
+
+# Opaque refresh tokens, stored as SHA-256 digests. Every rotation adds a row to
+# the same family; presenting an already-rotated token revokes the whole family.
+class RefreshToken(SQLModel, table=True):
+    __tablename__ = "refresh_token"
+
+    id: Optional[str] = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+    token_hash: str = Field(index=True, unique=True)
+    user_id: str = Field(foreign_key="user.id", index=True)
+    family_id: str = Field(index=True)
+    issued_at: datetime = Field(default_factory=utc_now)
+    expires_at: datetime
+    # Set when the token is exchanged; a second exchange is a replay
+    used_at: Optional[datetime] = None
+    # Indexed so workers can reload just the families revoked in the last few minutes
+    revoked_at: Optional[datetime] = Field(default=None, index=True)
+
+
+# 🔎 FTS5 external-content indexes: the text lives once, in the base table, and
+# triggers keep the index in step. community_id is indexed too so /search can
+# restrict the MATCH to one community instead of filtering every hit afterwards.
+# complaint and message have VARCHAR primary keys, so the implicit rowid is not
+# stable: VACUUM and batch "recreate" may renumber it. The index is keyed on an
+# explicit INTEGER column instead, which the insert trigger fills in when the
+# row doesn't bring one. It is local to its database; copy rows without it.
+FTS_ROWID = "search_rowid"
+FTS_INDEXES = {
+    "complaint": ("complaint_fts", ("title", "description", "community_id")),
+    "message": ("message_fts", ("subject", "body", "community_id")),
+}
+
+
+def fts_ddl(table: str, fts: str, columns: Tuple[str, ...]) -> List[str]:
+    return [fts_table_ddl(table, fts, columns)] + fts_trigger_ddl(table, fts, columns)
+
+
+def fts_table_ddl(table: str, fts: str, columns: Tuple[str, ...]) -> str:
+    return f"CREATE VIRTUAL TABLE {fts} USING fts5({', '.join(columns)}, content='{table}', content_rowid='{FTS_ROWID}')"
+
+
+def fts_trigger_ddl(table: str, fts: str, columns: Tuple[str, ...]) -> List[str]:
+    names = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+    return [
+        # MAX() over the unique index is a single seek; writers are serialized, so no two rows get one number
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"UPDATE {table} SET {FTS_ROWID} = (SELECT COALESCE(MAX({FTS_ROWID}), 0) + 1 FROM {table}) "
+        f"WHERE rowid = new.rowid AND new.{FTS_ROWID} IS NULL; "
+        f"INSERT INTO {fts}(rowid, {names}) SELECT {FTS_ROWID}, {names} FROM {table} WHERE rowid = new.rowid; END",
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.{FTS_ROWID}, {old_values}); END",
+        # Only the indexed columns: marking a message read must not re-tokenize it
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {names} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.{FTS_ROWID}, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {names}) VALUES (new.{FTS_ROWID}, {new_values}); END",
+    ]
+
+
+for _table, (_fts, _columns) in FTS_INDEXES.items():
+    _base = SQLModel.metadata.tables[_table]
+    for _statement in fts_ddl(_table, _fts, _columns):
+        event.listen(_base, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+    event.listen(_base, "before_drop", DDL(f"DROP TABLE IF EXISTS {_fts}").execute_if(dialect="sqlite"))
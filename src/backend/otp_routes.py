@@ -1,10 +1,12 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from sqlmodel import Session, select
 
-from src.backend.auth_utils import create_access_token
 from src.backend.models import User
 from src.backend.database import otp_store, get_session
+from src.backend.otp_store import OTPCheck
+from src.backend.rate_limit import Limit, SlidingWindow, TokenBucket, rate_limit
+from src.backend.token_routes import issue_tokens
 
 router = APIRouter()
 
@@ -12,31 +14,27 @@ class OTPVerifyRequest(BaseModel):
     email: str
     otp: str
 
-@router.post("/verify-otp")
-def verify_otp(request: OTPVerifyRequest):
+# Codes lock after OTP_MAX_ATTEMPTS, but resends mint new ones; this caps guesses per account
+@router.post("/verify-otp", dependencies=[rate_limit(
+    "verify-otp",
+    Limit(SlidingWindow(20, 60), "ip"),
+    Limit(TokenBucket(5, 1 / 60), "email"),
+)])
+def verify_otp(request: OTPVerifyRequest, session: Session = Depends(get_session)):
     email = request.email
     otp_input = request.otp
 
-    stored_otp_data = otp_store.get(email)
-
-    if not stored_otp_data:
+    result = otp_store.check(email, otp_input)
+    if result is OTPCheck.MISSING:
         raise HTTPException(status_code=404, detail="OTP not found or expired")
-
-    otp_code, _, _ = stored_otp_data
-
-    if otp_code != otp_input:
+    if result is OTPCheck.LOCKED:
+        raise HTTPException(status_code=403, detail="Too many OTP attempts")
+    if result is OTPCheck.INVALID:
         raise HTTPException(status_code=401, detail="Invalid OTP")
 
-    del otp_store[email]
-
-    with get_session() as session:
-        user = session.exec(select(User).where(User.email == email)).first()
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
+    user = session.exec(select(User).where(User.email == email)).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
 
-        token = create_access_token(user.email)
-        return {
-            "access_token": token,
-            "token_type": "bearer"
-        }
+    return issue_tokens(session, user)
 
@@ -1,8 +1,9 @@
 from fastapi import FastAPI, HTTPException, Form
 from dotenv import load_dotenv
-import os
 import random
-import requests
+
+from src.backend.database import engine
+from src.backend.mailer import enqueue_otp_email
 
 load_dotenv()
 
@@ -14,26 +15,9 @@ otp_store = {}
 def generate_otp():
     return str(random.randint(100000, 999999))
 
+# Queued for mailer.MailSender; delivery and retries happen off the request path
 def send_otp_email(recipient_email, otp_code):
-    print(f"Generated OTP for {recipient_email}: {otp_code}")
-
-    api_key = os.getenv("RESEND_API_KEY")
-    url = "https://api.resend.com/emails"
-
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
-    }
-
-    payload = {
-        "from": "onboarding@resend.dev",
-        "to": recipient_email,
-        "subject": "Your OTP Code",
-        "html": f"<p>Your one-time password is: <strong>{otp_code}</strong></p>"
-    }
-
-    response = requests.post(url, headers=headers, json=payload)
-    print("Resend response:", response.status_code, response.text)
+    enqueue_otp_email(engine, recipient_email, otp_code)
 
 
 @app.post("/login")
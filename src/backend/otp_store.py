@@ -0,0 +1,211 @@
+import heapq
+import itertools
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+OTP_TTL_SECONDS = int(os.getenv("OTP_TTL_SECONDS", "300"))
+OTP_MAX_ATTEMPTS = int(os.getenv("OTP_MAX_ATTEMPTS", "3"))
+OTP_STORE_BACKEND = os.getenv("OTP_STORE_BACKEND", "memory")
+OTP_STORE_PATH = os.getenv("OTP_STORE_PATH", "hoainfo_otp.db")
+
+
+@dataclass(frozen=True)
+class OTPEntry:
+    code: str
+    issued_at: float
+    attempts: int
+
+
+class OTPCheck(Enum):
+    OK = "ok"
+    MISSING = "missing"
+    INVALID = "invalid"
+    LOCKED = "locked"
+
+
+# 🧩 Common interface — every backend must make check() atomic per email
+class OTPStore(ABC):
+    def __init__(self, ttl: int = OTP_TTL_SECONDS, max_attempts: int = OTP_MAX_ATTEMPTS):
+        self.ttl = ttl
+        self.max_attempts = max_attempts
+
+    @abstractmethod
+    def put(self, email: str, code: str) -> None:
+        """Store a fresh code for email, replacing any previous one."""
+
+    @abstractmethod
+    def get(self, email: str) -> Optional[OTPEntry]:
+        """Return the live entry for email, or None if absent or expired."""
+
+    @abstractmethod
+    def delete(self, email: str) -> None:
+        """Forget any code issued to email."""
+
+    @abstractmethod
+    def check(self, email: str, code: str) -> OTPCheck:
+        """Compare code, consuming it on success and counting a failed attempt otherwise."""
+
+
+# 🧠 Single-process backend: dict + min-heap of expiry times, purged lazily
+class MemoryOTPStore(OTPStore):
+    def __init__(self, ttl: int = OTP_TTL_SECONDS, max_attempts: int = OTP_MAX_ATTEMPTS):
+        super().__init__(ttl, max_attempts)
+        self._entries: Dict[str, Tuple[OTPEntry, int]] = {}
+        self._expiry: List[Tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def _purge(self, now: float) -> None:
+        # Only pops heads that are due, so each entry is visited once in total
+        while self._expiry and self._expiry[0][0] <= now:
+            _, seq, email = heapq.heappop(self._expiry)
+            current = self._entries.get(email)
+            if current is not None and current[1] == seq:
+                del self._entries[email]
+
+    def _live(self, email: str, now: float) -> Optional[OTPEntry]:
+        current = self._entries.get(email)
+        if current is None:
+            return None
+        entry = current[0]
+        if now - entry.issued_at >= self.ttl:
+            del self._entries[email]
+            return None
+        return entry
+
+    def put(self, email: str, code: str) -> None:
+        now = time.time()
+        seq = next(self._seq)
+        with self._lock:
+            self._purge(now)
+            self._entries[email] = (OTPEntry(code, now, 0), seq)
+            heapq.heappush(self._expiry, (now + self.ttl, seq, email))
+
+    def get(self, email: str) -> Optional[OTPEntry]:
+        now = time.time()
+        with self._lock:
+            self._purge(now)
+            return self._live(email, now)
+
+    def delete(self, email: str) -> None:
+        with self._lock:
+            self._entries.pop(email, None)
+
+    def check(self, email: str, code: str) -> OTPCheck:
+        now = time.time()
+        with self._lock:
+            self._purge(now)
+            entry = self._live(email, now)
+            if entry is None:
+                return OTPCheck.MISSING
+            if entry.attempts >= self.max_attempts:
+                return OTPCheck.LOCKED
+            if entry.code != code:
+                seq = self._entries[email][1]
+                self._entries[email] = (
+                    OTPEntry(entry.code, entry.issued_at, entry.attempts + 1), seq
+                )
+                return OTPCheck.INVALID
+            del self._entries[email]
+            return OTPCheck.OK
+
+
+# 🗄️ Multi-process backend: one SQLite WAL file shared by every uvicorn worker
+class SQLiteOTPStore(OTPStore):
+    def __init__(
+        self,
+        path: str = OTP_STORE_PATH,
+        ttl: int = OTP_TTL_SECONDS,
+        max_attempts: int = OTP_MAX_ATTEMPTS,
+    ):
+        super().__init__(ttl, max_attempts)
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS otp ("
+                " email TEXT PRIMARY KEY,"
+                " code TEXT NOT NULL,"
+                " issued_at REAL NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " attempts INTEGER NOT NULL DEFAULT 0)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_otp_expires_at ON otp (expires_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # isolation_level=None: we issue BEGIN IMMEDIATE ourselves
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def put(self, email: str, code: str) -> None:
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Range delete over the expiry index — never a full scan
+            conn.execute("DELETE FROM otp WHERE expires_at <= ?", (now,))
+            conn.execute(
+                "INSERT OR REPLACE INTO otp (email, code, issued_at, expires_at, attempts)"
+                " VALUES (?, ?, ?, ?, 0)",
+                (email, code, now, now + self.ttl),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get(self, email: str) -> Optional[OTPEntry]:
+        row = self._connect().execute(
+            "SELECT code, issued_at, attempts FROM otp WHERE email = ? AND expires_at > ?",
+            (email, time.time()),
+        ).fetchone()
+        return OTPEntry(*row) if row else None
+
+    def delete(self, email: str) -> None:
+        self._connect().execute("DELETE FROM otp WHERE email = ?", (email,))
+
+    def check(self, email: str, code: str) -> OTPCheck:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT code, attempts FROM otp WHERE email = ? AND expires_at > ?",
+                (email, time.time()),
+            ).fetchone()
+            if row is None:
+                result = OTPCheck.MISSING
+            elif row[1] >= self.max_attempts:
+                result = OTPCheck.LOCKED
+            elif row[0] != code:
+                conn.execute("UPDATE otp SET attempts = attempts + 1 WHERE email = ?", (email,))
+                result = OTPCheck.INVALID
+            else:
+                conn.execute("DELETE FROM otp WHERE email = ?", (email,))
+                result = OTPCheck.OK
+            conn.execute("COMMIT")
+            return result
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+
+def create_otp_store(backend: str = OTP_STORE_BACKEND) -> OTPStore:
+    if backend == "memory":
+        return MemoryOTPStore()
+    if backend == "sqlite":
+        return SQLiteOTPStore()
+    raise ValueError(f"Unknown OTP_STORE_BACKEND: {backend}")
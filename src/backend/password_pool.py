@@ -0,0 +1,81 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import bcrypt
+from dotenv import load_dotenv
+from fastapi import HTTPException
+
+from src.backend.metrics import record_timing
+
+load_dotenv()
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", str(PASSWORD_HASH_WORKERS * 4)))
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+_pending = 0
+_pending_lock = threading.Lock()
+
+
+# ⚙️ Worker-side functions (module level so the process pool can pickle them)
+def _hashpw(password: bytes) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt())
+
+
+def _checkpw(password: bytes, hashed: bytes) -> bool:
+    return bcrypt.checkpw(password, hashed)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ProcessPoolExecutor(max_workers=PASSWORD_HASH_WORKERS)
+    return _executor
+
+
+def shutdown() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+# 🚦 Admission control: refuse new work instead of queueing behind a login storm
+async def _submit(fn, *args):
+    global _pending
+    with _pending_lock:
+        if _pending >= PASSWORD_HASH_MAX_PENDING:
+            raise HTTPException(
+                status_code=429,
+                detail="Authentication is busy, please retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        _pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), fn, *args)
+    finally:
+        with _pending_lock:
+            _pending -= 1
+
+
+# Timings include time spent queued for a worker, which is what the caller waits for
+async def hash_password(password: str) -> str:
+    start = time.perf_counter()
+    hashed = await _submit(_hashpw, password.encode())
+    record_timing("password_hash", time.perf_counter() - start)
+    return hashed.decode()
+
+
+async def verify_password(password: str, password_hash: str) -> bool:
+    start = time.perf_counter()
+    matched = await _submit(_checkpw, password.encode(), password_hash.encode())
+    record_timing("password_verify", time.perf_counter() - start)
+    return matched
@@ -0,0 +1,323 @@
+import math
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from fastapi import Depends, HTTPException, Request
+from starlette.concurrency import run_in_threadpool
+
+load_dotenv()
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "1") == "1"
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_STORE_PATH = os.getenv("RATE_LIMIT_STORE_PATH", "hoainfo_ratelimit.db")
+# Bounds the in-process backend; the least recently hit keys are evicted first
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+
+# Per-key state, the same three numbers for every policy so backends stay policy-agnostic:
+# (value, stamp, previous) — see each policy for what they mean
+State = Tuple[float, float, float]
+
+
+@dataclass(frozen=True)
+class RateCheck:
+    allowed: bool
+    retry_after: float = 0.0
+
+
+# 🧩 A policy turns (state, now) into (new state, verdict); backends only store state
+class RatePolicy(ABC):
+    @abstractmethod
+    def apply(self, state: Optional[State], now: float) -> Tuple[State, RateCheck]:
+        """Count one hit against state (None for a key never seen or evicted)."""
+
+    @abstractmethod
+    def expires_at(self, state: State) -> float:
+        """When state is indistinguishable from a fresh key and may be dropped."""
+
+
+# 🪣 Allows bursts up to capacity, then refill_per_second on average.
+# State: (tokens left, last update, unused)
+@dataclass(frozen=True)
+class TokenBucket(RatePolicy):
+    capacity: int
+    refill_per_second: float
+
+    def apply(self, state: Optional[State], now: float) -> Tuple[State, RateCheck]:
+        tokens, updated_at = (self.capacity, now) if state is None else state[:2]
+        tokens = min(self.capacity, tokens + (now - updated_at) * self.refill_per_second)
+        if tokens >= 1:
+            return (tokens - 1, now, 0.0), RateCheck(True)
+        return (tokens, now, 0.0), RateCheck(False, (1 - tokens) / self.refill_per_second)
+
+    def expires_at(self, state: State) -> float:
+        tokens, updated_at, _ = state
+        return updated_at + (self.capacity - tokens) / self.refill_per_second
+
+
+# 🪟 At most limit hits in any window_seconds, estimated from two fixed windows:
+# the previous window's count is weighted by how much of it still overlaps.
+# State: (hits in current window, current window start, hits in previous window)
+@dataclass(frozen=True)
+class SlidingWindow(RatePolicy):
+    limit: int
+    window_seconds: float
+
+    def apply(self, state: Optional[State], now: float) -> Tuple[State, RateCheck]:
+        start = math.floor(now / self.window_seconds) * self.window_seconds
+        count, previous = 0.0, 0.0
+        if state is not None:
+            if state[1] == start:
+                count, previous = state[0], state[2]
+            elif state[1] == start - self.window_seconds:
+                previous = state[0]
+        overlap = 1 - (now - start) / self.window_seconds
+        if count + previous * overlap + 1 > self.limit:
+            # Either the current window is full, or wait for the previous one to slide out enough
+            if count + 1 > self.limit or previous == 0:
+                retry_after = start + self.window_seconds - now
+            else:
+                excess = count + previous * overlap + 1 - self.limit
+                retry_after = min(excess / previous * self.window_seconds, start + self.window_seconds - now)
+            return (count, start, previous), RateCheck(False, retry_after)
+        return (count + 1, start, previous), RateCheck(True)
+
+    def expires_at(self, state: State) -> float:
+        return state[1] + 2 * self.window_seconds
+
+
+# 🧩 Common interface — every backend must make hit_all() atomic across its keys
+class RateLimitBackend(ABC):
+    # Backends that wait on I/O or locks are called from the threadpool, never the event loop
+    blocking = False
+
+    @abstractmethod
+    def hit_all(self, hits: List[Tuple[str, RatePolicy]]) -> List[RateCheck]:
+        """Count one hit per key, or none at all if any key rejects it."""
+
+    def hit(self, key: str, policy: RatePolicy) -> RateCheck:
+        return self.hit_all([(key, policy)])[0]
+
+    @abstractmethod
+    def reset(self) -> None:
+        """Forget every key."""
+
+
+# 🧠 Single-process backend: LRU-ordered dict, so memory stays bounded under key churn.
+# An evicted key starts over as fresh, which only errs in the client's favour.
+class MemoryRateLimitBackend(RateLimitBackend):
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._states: "OrderedDict[str, State]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def hit_all(self, hits: List[Tuple[str, RatePolicy]]) -> List[RateCheck]:
+        now = time.time()
+        with self._lock:
+            applied = [(key, *policy.apply(self._states.get(key), now)) for key, policy in hits]
+            checks = [check for _, _, check in applied]
+            allowed = all(check.allowed for check in checks)
+            for key, state, _ in applied:
+                if allowed:
+                    self._states[key] = state
+                # A key still being hit, even rejected, stays recently used: evicting it would reset it
+                if key in self._states:
+                    self._states.move_to_end(key)
+            while len(self._states) > self.max_keys:
+                self._states.popitem(last=False)
+                self.evictions += 1
+            return checks
+
+    def reset(self) -> None:
+        with self._lock:
+            self._states.clear()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+
+# 🗄️ Multi-process backend: one SQLite WAL file shared by every uvicorn worker
+class SQLiteRateLimitBackend(RateLimitBackend):
+    blocking = True
+    # Expired rows are swept at most this often, over the expiry index
+    PURGE_INTERVAL_SECONDS = 60.0
+
+    def __init__(self, path: str = RATE_LIMIT_STORE_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._purged_at = 0.0
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit ("
+                " key TEXT PRIMARY KEY,"
+                " value REAL NOT NULL,"
+                " stamp REAL NOT NULL,"
+                " previous REAL NOT NULL,"
+                " expires_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_rate_limit_expires_at ON rate_limit (expires_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # isolation_level=None: we issue BEGIN IMMEDIATE ourselves
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def hit_all(self, hits: List[Tuple[str, RatePolicy]]) -> List[RateCheck]:
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if now - self._purged_at >= self.PURGE_INTERVAL_SECONDS:
+                conn.execute("DELETE FROM rate_limit WHERE expires_at <= ?", (now,))
+                self._purged_at = now
+            applied = []
+            for key, policy in hits:
+                row = conn.execute(
+                    "SELECT value, stamp, previous FROM rate_limit WHERE key = ? AND expires_at > ?",
+                    (key, now),
+                ).fetchone()
+                applied.append((key, policy, *policy.apply(row, now)))
+            checks = [check for _, _, _, check in applied]
+            if all(check.allowed for check in checks):
+                conn.executemany(
+                    "INSERT INTO rate_limit (key, value, stamp, previous, expires_at) VALUES (?, ?, ?, ?, ?)"
+                    " ON CONFLICT (key) DO UPDATE SET value = excluded.value, stamp = excluded.stamp,"
+                    " previous = excluded.previous, expires_at = excluded.expires_at",
+                    [(key, *state, policy.expires_at(state)) for key, policy, state, _ in applied],
+                )
+            conn.execute("COMMIT")
+            return checks
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def reset(self) -> None:
+        self._connect().execute("DELETE FROM rate_limit")
+
+
+def create_rate_limit_backend(backend: str = RATE_LIMIT_BACKEND) -> RateLimitBackend:
+    if backend == "memory":
+        return MemoryRateLimitBackend()
+    if backend == "sqlite":
+        return SQLiteRateLimitBackend()
+    raise ValueError(f"Unknown RATE_LIMIT_BACKEND: {backend}")
+
+
+# 🚦 Shared by every limited route; tests swap the backend or flip enabled
+class RateLimiter:
+    def __init__(self, backend: RateLimitBackend, enabled: bool = RATE_LIMIT_ENABLED):
+        self.backend = backend
+        self.enabled = enabled
+        self.rejected: Dict[str, int] = {}
+
+    # Checks every limit before counting any, so a rejection by one doesn't spend the others.
+    # Returns the rejection to wait out longest, or None when the request may proceed.
+    def hit_all(self, route: str, hits: List[Tuple[str, str, RatePolicy]]) -> Optional[RateCheck]:
+        checks = self.backend.hit_all([(f"{route}|{scope}|{subject}", policy) for scope, subject, policy in hits])
+        rejected = None
+        for (scope, _, _), check in zip(hits, checks):
+            if check.allowed:
+                continue
+            label = f"{route}|{scope}"
+            self.rejected[label] = self.rejected.get(label, 0) + 1
+            if rejected is None or check.retry_after > rejected.retry_after:
+                rejected = check
+        return rejected
+
+
+rate_limiter = RateLimiter(create_rate_limit_backend())
+
+
+# What a limit is keyed by, besides the route itself. email_ip is one account from one
+# address: it caps guessing without letting anyone else lock that account out.
+SCOPES = ("ip", "email", "email_ip", "route")
+
+
+@dataclass(frozen=True)
+class Limit:
+    policy: RatePolicy
+    scope: str = "ip"
+
+    def __post_init__(self):
+        if self.scope not in SCOPES:
+            raise ValueError(f"Unknown rate limit scope: {self.scope}")
+
+
+async def _email(request: Request) -> Optional[str]:
+    # A query parameter (/resend-otp) or a JSON body field (/login, /verify-otp).
+    # Starlette caches the body, so the route still parses it afterwards.
+    email = request.query_params.get("email")
+    if email is None and request.headers.get("content-type", "").startswith("application/json"):
+        try:
+            body = await request.json()
+        except ValueError:
+            body = None
+        if isinstance(body, dict) and isinstance(body.get("email"), str):
+            email = body["email"]
+    return email.strip().lower() if email else None
+
+
+# The peer address. Behind a reverse proxy that is the proxy's own address, and every
+# client would share one ip bucket: run uvicorn with --proxy-headers and
+# --forwarded-allow-ips=<proxy address> so it takes the client from X-Forwarded-For.
+# Never trust that header from anyone but your own proxy.
+def _client_ip(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+# 🛂 Route dependency: rejects with 429 before the handler (and its bcrypt) runs.
+# Usage: @app.post("/login", dependencies=[rate_limit("login", Limit(SlidingWindow(20, 60)))])
+def rate_limit(route: str, *limits: Limit):
+    async def check(request: Request) -> None:
+        if not rate_limiter.enabled:
+            return
+        needs_email = any(limit.scope in ("email", "email_ip") for limit in limits)
+        email = await _email(request) if needs_email else None
+        hits = []
+        for limit in limits:
+            if limit.scope == "ip":
+                subject = _client_ip(request)
+            elif limit.scope in ("email", "email_ip"):
+                if email is None:
+                    # Nothing to key on; the route rejects the request as malformed anyway
+                    continue
+                subject = email if limit.scope == "email" else f"{email}|{_client_ip(request)}"
+            else:
+                subject = "*"
+            hits.append((limit.scope, subject, limit.policy))
+
+        if rate_limiter.backend.blocking:
+            rejected = await run_in_threadpool(rate_limiter.hit_all, route, hits)
+        else:
+            rejected = rate_limiter.hit_all(route, hits)
+        if rejected is not None:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests; try again later",
+                headers={"Retry-After": str(max(1, math.ceil(rejected.retry_after)))},
+            )
+
+    return Depends(check)
+
+
+# 📈 Prometheus text exposition for rejected requests
+def render_metrics() -> str:
+    lines = [
+        "# HELP hoainfo_rate_limited_total Requests rejected by a rate limit.",
+        "# TYPE hoainfo_rate_limited_total counter",
+    ]
+    for label, count in sorted(rate_limiter.rejected.items()):
+        route, scope = label.split("|")
+        lines.append(f'hoainfo_rate_limited_total{{route="{route}",scope="{scope}"}} {count}')
+    return "\n".join(lines) + "\n"
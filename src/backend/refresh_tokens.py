@@ -0,0 +1,213 @@
+import hashlib
+import math
+import os
+import secrets
+import threading
+from dataclasses import dataclass
+from datetime import timedelta
+from enum import Enum
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import update
+from sqlmodel import Session, select
+from starlette.concurrency import run_in_threadpool
+
+from src.backend.auth_cache import ACCESS_TOKEN_EXPIRE_MINUTES, TOKEN_CLOCK_SKEW_SECONDS
+from src.backend.database import engine
+from src.backend.models import RefreshToken
+from src.backend.timezones import utc_now
+
+load_dotenv()
+REFRESH_TOKEN_EXPIRE_DAYS = float(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "30"))
+# How often each worker rebuilds its filter from families revoked by other workers
+REVOKED_FAMILY_REFRESH_SECONDS = float(os.getenv("REVOKED_FAMILY_REFRESH_SECONDS", "5"))
+REVOKED_FAMILY_FALSE_POSITIVE_RATE = float(os.getenv("REVOKED_FAMILY_FALSE_POSITIVE_RATE", "0.01"))
+
+
+class RefreshCheck(Enum):
+    OK = "ok"
+    INVALID = "invalid"
+    REUSED = "reused"
+
+
+@dataclass(frozen=True)
+class Rotation:
+    token: str
+    user_id: str
+    family_id: str
+
+
+# Tokens are 256 random bits, so a fast digest is enough — no bcrypt on this path
+def hash_refresh_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+# 🌸 Fixed-size set with no false negatives: "not in the filter" is a definite answer
+class BloomFilter:
+    def __init__(self, capacity: int, false_positive_rate: float = REVOKED_FAMILY_FALSE_POSITIVE_RATE):
+        capacity = max(capacity, 1)
+        self.size = max(1024, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    # Double hashing: k positions from one 128-bit digest
+    def _positions(self, item: str) -> Iterator[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "big"), int.from_bytes(digest[8:], "big") | 1
+        for n in range(self.hashes):
+            yield (first + n * second) % self.size
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+# 🚫 Families revoked within one access-token lifetime; older ones have no live access tokens.
+# verify_token asks about every request; only filter hits go to the database, in the threadpool.
+# Reloaded by SnapshotReloader, so the request path never rebuilds the filter.
+class RevokedFamilies:
+    name = "revoked_families"
+
+    def __init__(self, refresh_seconds: float, window_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self.window_seconds = window_seconds
+        self._filter = BloomFilter(0)
+        self._confirmed: Dict[str, bool] = {}
+        self._lock = threading.Lock()
+        self.checks = 0
+        self.lookups = 0
+        self.reloads = 0
+
+    async def is_revoked(self, family_id: str) -> bool:
+        self.checks += 1
+        if family_id not in self._filter:
+            return False
+        # Possibly a false positive: settle it once per reload
+        confirmed = self._confirmed.get(family_id)
+        if confirmed is None:
+            self.lookups += 1
+            confirmed = await run_in_threadpool(self._lookup, family_id)
+            # setdefault: an add() that landed meanwhile wins over this answer
+            confirmed = self._confirmed.setdefault(family_id, confirmed)
+        return confirmed
+
+    @staticmethod
+    def _lookup(family_id: str) -> bool:
+        with engine.connect() as conn:
+            return conn.execute(
+                select(RefreshToken.id)
+                .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_not(None))
+                .limit(1)
+            ).first() is not None
+
+    # Applies a revocation on this worker immediately; the others pick it up on reload
+    def add(self, family_id: str) -> None:
+        with self._lock:
+            self._filter.add(family_id)
+            self._confirmed[family_id] = True
+
+    def refresh(self) -> None:
+        since = utc_now() - timedelta(seconds=self.window_seconds)
+        # De-duplicated here: DISTINCT would steer SQLite onto the family_id index and a full scan
+        with engine.connect() as conn:
+            families = set(conn.execute(
+                select(RefreshToken.family_id).where(RefreshToken.revoked_at >= since)
+            ).scalars())
+        self._filter = self._build(families)
+        self._confirmed = {family_id: True for family_id in families}
+        self.reloads += 1
+
+    @staticmethod
+    def _build(families: Iterable[str]) -> BloomFilter:
+        families = list(families)
+        # Headroom for local additions until the next reload
+        bloom = BloomFilter(2 * len(families) + 64)
+        for family_id in families:
+            bloom.add(family_id)
+        return bloom
+
+    def clear(self) -> None:
+        with self._lock:
+            self._filter = BloomFilter(0)
+            self._confirmed = {}
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": sum(self._confirmed.values()),
+            "hits": self.checks - self.lookups,
+            "misses": self.lookups,
+            "reloads": self.reloads,
+        }
+
+
+revoked_families = RevokedFamilies(
+    REVOKED_FAMILY_REFRESH_SECONDS, ACCESS_TOKEN_EXPIRE_MINUTES * 60 + TOKEN_CLOCK_SKEW_SECONDS
+)
+
+
+# 🎟️ Adds a refresh token to the session (a new family unless one is given); caller commits
+def issue_refresh_token(session: Session, user_id: str, family_id: Optional[str] = None) -> Tuple[str, str]:
+    token = secrets.token_urlsafe(32)
+    row = RefreshToken(
+        token_hash=hash_refresh_token(token),
+        user_id=user_id,
+        family_id=family_id or secrets.token_hex(16),
+        expires_at=utc_now() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+    )
+    session.add(row)
+    return token, row.family_id
+
+
+# 🔁 Exchange a refresh token for its successor; caller commits on OK
+def rotate_refresh_token(session: Session, token: str) -> Tuple[RefreshCheck, Optional[Rotation]]:
+    token_hash = hash_refresh_token(token)
+    now = utc_now()
+    # Consuming is one conditional UPDATE, so two concurrent exchanges can't both succeed
+    consumed = session.exec(
+        update(RefreshToken)
+        .where(
+            RefreshToken.token_hash == token_hash,
+            RefreshToken.used_at.is_(None),
+            RefreshToken.revoked_at.is_(None),
+            RefreshToken.expires_at > now,
+        )
+        .values(used_at=now)
+        .returning(RefreshToken.user_id, RefreshToken.family_id)
+    ).first()
+    if consumed is None:
+        row = session.exec(
+            select(RefreshToken.family_id, RefreshToken.used_at, RefreshToken.revoked_at)
+            .where(RefreshToken.token_hash == token_hash)
+        ).first()
+        if row is not None and row.used_at is not None and row.revoked_at is None:
+            # An already-rotated token came back: whoever holds the family, it isn't only its owner
+            session.rollback()
+            revoke_family(session, row.family_id)
+            return RefreshCheck.REUSED, None
+        session.rollback()
+        return RefreshCheck.INVALID, None
+
+    user_id, family_id = consumed
+    new_token, _ = issue_refresh_token(session, user_id, family_id)
+    return RefreshCheck.OK, Rotation(new_token, user_id, family_id)
+
+
+# 🧯 Revoke every token in a family (sign-out, or replay detected) and commit
+def revoke_family(session: Session, family_id: str) -> None:
+    session.exec(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=utc_now())
+    )
+    session.commit()
+    revoked_families.add(family_id)
+
+
+def family_of(session: Session, token: str) -> Optional[str]:
+    return session.exec(
+        select(RefreshToken.family_id).where(RefreshToken.token_hash == hash_refresh_token(token))
+    ).first()
@@ -1,14 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.exceptions import RequestValidationError
+from sqlalchemy import tuple_
 from sqlmodel import Session, select
-from pydantic import BaseModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+from pydantic import BaseModel, ValidationError
+from dataclasses import replace
 from datetime import datetime
-from typing import List
-import pytz
+from typing import Dict, List, Optional
 
-from src.backend.dependencies import require_role, require_any_role, require_tier
+import anyio
+
+from src.backend.dependencies import require_role, require_any_role, require_tier, get_async_community_session
 from src.backend.database import get_session
-from src.backend.auth_utils import verify_token
+from src.backend.auth_utils import create_access_token, verify_token
+from src.backend.auth_cache import UserPrincipal, revoke_tokens, token_versions
 from src.backend.models import User, Complaint
+from src.backend.uploads import parse_photo_form
+from src.backend.image_jobs import RENDITIONS, renditions_for, schedule_renditions
+from src.backend.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, encode_cursor, decode_cursor, cursor_datetime
+from src.backend.timezones import to_local, to_utc
 
 router = APIRouter()
 
@@ -17,6 +27,29 @@ router = APIRouter()
 def admin_dashboard(user=Depends(require_role("admin"))):
     return {"message": f"Welcome, Admin {user.email}"}
 
+# 🛠️ Admin role assignment
+class RoleModel(BaseModel):
+    role: str
+
+@router.post("/admin/users/{user_id}/role")
+def set_user_role(
+    user_id: str,
+    data: RoleModel,
+    admin=Depends(require_role("admin")),
+    session: Session = Depends(get_session)
+):
+    target = session.get(User, user_id)
+    if not target or target.community_id != admin.community_id:
+        raise HTTPException(status_code=404, detail="User not found")
+    target.role = data.role
+    # Their outstanding tokens still claim the old role
+    version = revoke_tokens(target)
+    message = f"{target.email} is now {target.role}."
+    session.add(target)
+    session.commit()
+    token_versions.bump(target.id, version)
+    return {"message": message}
+
 # 🔐 Board or Admin route
 @router.get("/board/votes")
 def board_votes(user=Depends(require_any_role("board", "admin"))):
@@ -29,42 +62,153 @@ def ai_helpdesk(user=Depends(require_tier("landlord", "household"))):
 
 # 🆙 Simulated plan upgrade route
 @router.post("/upgrade")
-def upgrade_tier(user: User = Depends(verify_token), session: Session = Depends(get_session)):
-    user.tier = "landlord"
+def upgrade_tier(
+    request: Request,
+    user: UserPrincipal = Depends(verify_token),
+    session: Session = Depends(get_session)
+):
+    db_user = session.get(User, user.id)
+    if not db_user:
+        raise HTTPException(status_code=404, detail="User not found")
+    db_user.tier = "landlord"
+    version = revoke_tokens(db_user)
+    session.add(db_user)
     session.commit()
-    return {"message": f"{user.email} upgraded to landlord tier."}
+    token_versions.bump(user.id, version)
+    # The caller's own token was just revoked; hand back one with the new tier
+    upgraded = replace(user, tier="landlord", token_version=version)
+    return {
+        "message": f"{user.email} upgraded to landlord tier.",
+        "access_token": create_access_token(upgraded, request.state.token_family),
+        "token_type": "bearer",
+    }
 
 # 📩 Submit complaint route
 class ComplaintModel(BaseModel):
     title: str
     description: str
 
-@router.post("/complaints")
-def submit_complaint(
-    data: ComplaintModel,
-    user: User = Depends(verify_token),
-    session: Session = Depends(get_session)
+COMPLAINT_UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {"schema": ComplaintModel.model_json_schema()},
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["title", "description"],
+                    "properties": {
+                        "title": {"type": "string"},
+                        "description": {"type": "string"},
+                        "photo": {"type": "string", "format": "binary"},
+                    },
+                }
+            },
+        },
+    }
+}
+
+# JSON for text-only complaints; multipart when a photo is attached (streamed, never buffered)
+@router.post("/complaints", openapi_extra=COMPLAINT_UPLOAD_OPENAPI)
+async def submit_complaint(
+    request: Request,
+    user: UserPrincipal = Depends(verify_token),
+    session: AsyncSession = Depends(get_async_community_session)
 ):
-    tz = pytz.timezone("America/Los_Angeles")
-    local_timestamp = datetime.now(tz).strftime("%Y-%m-%d %H:%M:%S")
+    photo_digest = None
+    if request.headers.get("content-type", "").startswith("multipart/form-data"):
+        fields, photo_digest = await parse_photo_form(request)
+    else:
+        try:
+            fields = await request.json()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid JSON body")
+    try:
+        data = ComplaintModel.model_validate(fields)
+    except ValidationError as exc:
+        raise RequestValidationError(exc.errors())
 
     complaint = Complaint(
         title=data.title,
         description=data.description,
-        timestamp=local_timestamp,
+        photo_url=photo_digest,
         user_id=user.id,
         community_id=user.community_id
     )
     session.add(complaint)
-    session.commit()
-    return {"message": "Complaint submitted."}
+    await session.commit()
+    if photo_digest:
+        await anyio.to_thread.run_sync(schedule_renditions, photo_digest)
+    return {"message": "Complaint submitted.", "id": complaint.id, "photo_url": photo_digest}
 
-@router.get("/complaints", response_model=List[Complaint])
-def get_complaints(
-    user: User = Depends(verify_token),
-    session: Session = Depends(get_session)
+# 📋 List complaints newest-first, one keyset page at a time
+class ComplaintRead(BaseModel):
+    id: str
+    user_id: str
+    title: str
+    description: str
+    timestamp: datetime
+    photo_url: Optional[str]
+    thumbnail_url: Optional[str] = None
+    web_url: Optional[str] = None
+    community_id: str
+    read: bool
+
+    # ready: the complaint's renditions on disk, from image_jobs.renditions_for
+    @classmethod
+    def from_complaint(cls, complaint: Complaint, ready: Optional[Dict[str, bool]] = None) -> "ComplaintRead":
+        # Renditions appear once the image workers have produced them
+        ready = ready or dict.fromkeys(RENDITIONS, False)
+        digest = complaint.photo_url
+        fields = complaint.model_dump()
+        fields["timestamp"] = to_local(complaint.timestamp, complaint.community_id)
+        return cls(
+            **fields,
+            thumbnail_url=f"/media/thumbnail/{digest}" if ready["thumbnail"] else None,
+            web_url=f"/media/web/{digest}" if ready["web"] else None,
+        )
+
+class ComplaintPage(BaseModel):
+    items: List[ComplaintRead]
+    next_cursor: Optional[str] = None
+
+@router.get("/complaints", response_model=ComplaintPage)
+async def get_complaints(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    user: UserPrincipal = Depends(verify_token),
+    session: AsyncSession = Depends(get_async_community_session)
 ):
-    complaints = session.exec(
-        select(Complaint).where(Complaint.community_id == user.community_id)
-    ).all()
-    return complaints
+    query = select(Complaint).where(Complaint.community_id == user.community_id)
+
+    # Date bounds are ranges on the same index the keyset walks
+    if since:
+        query = query.where(Complaint.timestamp >= to_utc(since, user.community_id))
+    if until:
+        query = query.where(Complaint.timestamp < to_utc(until, user.community_id))
+
+    after = decode_cursor(cursor, 2)
+    if after:
+        # Row-value comparison lets SQLite seek straight into the composite index
+        after_key = (cursor_datetime(after[0]), after[1])
+        query = query.where(tuple_(Complaint.timestamp, Complaint.id) < tuple_(*after_key))
+
+    # Fetch one extra row to learn whether another page exists
+    rows = (await session.exec(
+        query.order_by(Complaint.timestamp.desc(), Complaint.id.desc()).limit(limit + 1)
+    )).all()
+
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(last.timestamp.isoformat(), last.id)
+    # One threadpool hop stats every photo on the page
+    digests = [c.photo_url for c in items if c.photo_url]
+    ready = await anyio.to_thread.run_sync(renditions_for, digests) if digests else {}
+    return ComplaintPage(
+        items=[ComplaintRead.from_complaint(c, ready.get(c.photo_url)) for c in items],
+        next_cursor=next_cursor,
+    )
@@ -0,0 +1,149 @@
+import html
+import re
+from datetime import datetime
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+from sqlalchemy import DateTime, Float, Integer, String, bindparam, column, text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.backend.auth_cache import UserPrincipal
+from src.backend.auth_utils import verify_token
+from src.backend.dependencies import get_async_community_session
+from src.backend.models import FTS_ROWID
+from src.backend.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, encode_cursor
+from src.backend.timezones import to_local, to_utc
+
+router = APIRouter()
+
+MAX_SEARCH_TERMS = 16
+SNIPPET_TOKENS = 16
+# Control characters can't occur in escaped text, so markup is added only after escaping
+MARK_OPEN, MARK_CLOSE = "\x02", "\x03"
+
+# Per source: FTS table, base table, bm25 column weights (title-like, body-like, community_id)
+SOURCES = {
+    "complaints": ("complaint_fts", "complaint", "10.0, 1.0, 0.0"),
+    "messages": ("message_fts", "message", "10.0, 1.0, 0.0"),
+}
+
+
+class SearchHit(BaseModel):
+    id: str
+    title: str
+    snippet: str
+    timestamp: datetime
+    score: float
+
+
+class SearchPage(BaseModel):
+    items: List[SearchHit]
+    next_cursor: Optional[str] = None
+
+
+# Free text -> FTS5 query: every word must appear; a trailing * keeps prefix matching.
+# Quoting each term means user input can never be parsed as FTS5 syntax. The community
+# phrase narrows the MATCH but is not exact; search() re-checks the base table.
+def fts_query(q: str, community_id: str) -> str:
+    terms = re.findall(r"\w+\*?", q)[:MAX_SEARCH_TERMS]
+    if not terms:
+        raise HTTPException(status_code=400, detail="Search query has no words")
+    quoted = " ".join(f'"{term.rstrip("*")}"*' if term.endswith("*") else f'"{term}"' for term in terms)
+    community = community_id.replace('"', '""')
+    return f'community_id : "{community}" AND ({quoted})'
+
+
+def render_marked(fragment: Optional[str]) -> str:
+    escaped = html.escape(fragment or "")
+    return escaped.replace(MARK_OPEN, "<mark>").replace(MARK_CLOSE, "</mark>")
+
+
+# 🔎 Ranked full-text search within the caller's community
+@router.get("/search", response_model=SearchPage)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    source: Literal["complaints", "messages"] = Query("complaints", alias="type"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    user: UserPrincipal = Depends(verify_token),
+    session: AsyncSession = Depends(get_async_community_session)
+):
+    fts, table, weights = SOURCES[source]
+    title_column = "title" if source == "complaints" else "subject"
+    params = {"match": fts_query(q, user.community_id), "limit": limit + 1, "community_id": user.community_id}
+
+    # The FTS community_id term is only a pre-filter: it matches tokens, so "oak-ridge" also
+    # matches "oak-ridge-north". The base-table column is what actually scopes the results.
+    filters = ["base.community_id = :community_id"]
+    if source == "messages":
+        # Messages are private to their sender and recipient
+        filters.append("(base.user_id = :user_id OR base.recipient_id = :user_id)")
+        params["user_id"] = user.id
+    if since:
+        filters.append("base.timestamp >= :since")
+        params["since"] = to_utc(since, user.community_id)
+    if until:
+        filters.append("base.timestamp < :until")
+        params["until"] = to_utc(until, user.community_id)
+
+    # Keyset on (score, rowid): bm25 is lower-is-better, rowid breaks ties
+    after = decode_cursor(cursor, 2)
+    if after:
+        if not isinstance(after[0], (int, float)) or not isinstance(after[1], int):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        filters.append("(hits.score, hits.rowid) > (:after_score, :after_rowid)")
+        params.update(after_score=after[0], after_rowid=after[1])
+
+    where = f"WHERE {' AND '.join(filters)}"
+    # Phase one ranks the community's matches and keeps one page of ids
+    ranked = text(
+        f"SELECT hits.rowid, hits.score, base.id, base.{title_column} AS title, base.timestamp "
+        f"FROM (SELECT rowid, bm25({fts}, {weights}) AS score FROM {fts} WHERE {fts} MATCH :match) AS hits "
+        f"JOIN {table} AS base ON base.{FTS_ROWID} = hits.rowid "
+        f"{where} ORDER BY hits.score, hits.rowid LIMIT :limit"
+    ).bindparams(
+        *(bindparam(name, type_=DateTime) for name in ("since", "until") if name in params)
+    ).columns(
+        column("rowid", Integer), column("score", Float), column("id", String),
+        column("title", String), column("timestamp", DateTime),
+    )
+    rows = (await session.execute(ranked, params)).all()
+    page = rows[:limit]
+
+    # Phase two builds snippets for that page only, not for every match
+    fragments = {}
+    if page:
+        fragment_rows = (await session.execute(
+            text(
+                f"SELECT rowid, highlight({fts}, 0, :open, :close), "
+                f"snippet({fts}, 1, :open, :close, '…', {SNIPPET_TOKENS}) "
+                f"FROM {fts} WHERE {fts} MATCH :match AND rowid IN :rowids"
+            ).bindparams(bindparam("rowids", expanding=True)),
+            {
+                "match": params["match"],
+                "open": MARK_OPEN,
+                "close": MARK_CLOSE,
+                "rowids": [row.rowid for row in page],
+            },
+        )).all()
+        fragments = {rowid: (title, snippet) for rowid, title, snippet in fragment_rows}
+
+    items = []
+    for row in page:
+        title, snippet = fragments.get(row.rowid, (row.title, ""))
+        items.append(SearchHit(
+            id=row.id,
+            title=render_marked(title),
+            snippet=render_marked(snippet),
+            timestamp=to_local(row.timestamp, user.community_id),
+            score=row.score,
+        ))
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = page[-1]
+        next_cursor = encode_cursor(last.score, last.rowid)
+    return SearchPage(items=items, next_cursor=next_cursor)
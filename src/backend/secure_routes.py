@@ -1,17 +1,27 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from pydantic import BaseModel
 from typing import Optional, List
-from datetime import datetime
-import pytz
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+import os
 
-from src.backend.dependencies import require_role, require_any_role, require_tier
+from src.backend.dependencies import (
+    require_role,
+    require_any_role,
+    require_tier,
+    get_community_session,
+    get_async_community_session,
+)
 from src.backend.auth_utils import verify_token
-from src.backend.database import get_session
-from src.backend.models import BoardVerificationRequest, User
+from src.backend.auth_cache import UserPrincipal
+from src.backend.models import BoardApproval, BoardVerificationRequest
 
 router = APIRouter()
 
+BOARD_APPROVAL_QUORUM = int(os.getenv("BOARD_APPROVAL_QUORUM", "4"))
+
 # 🤖 AI Helpdesk Access
 @router.get("/ai/helpdesk")
 def ai_helpdesk(user=Depends(require_tier("solo", "household", "landlord"))):
@@ -24,8 +34,8 @@ class BoardRequestModel(BaseModel):
 @router.post("/board/request")
 def board_verification_request(
     data: BoardRequestModel,
-    user: User = Depends(verify_token),
-    session: Session = Depends(get_session)
+    user: UserPrincipal = Depends(verify_token),
+    session: Session = Depends(get_community_session)
 ):
     existing = session.exec(
         select(BoardVerificationRequest).where(BoardVerificationRequest.user_id == user.id)
@@ -36,7 +46,6 @@ def board_verification_request(
     request = BoardVerificationRequest(
         user_id=user.id,
         community_id=data.community_id,
-        approved_by=[],
         verified=False
     )
     session.add(request)
@@ -46,19 +55,19 @@ def board_verification_request(
 
 # 📋 View All Board Requests
 @router.get("/board/requests")
-def list_board_requests(
-    user: User = Depends(verify_token),
-    session: Session = Depends(get_session)
+async def list_board_requests(
+    user: UserPrincipal = Depends(verify_token),
+    session: AsyncSession = Depends(get_async_community_session)
 ):
-    return session.exec(
+    return (await session.exec(
         select(BoardVerificationRequest).where(BoardVerificationRequest.community_id == user.community_id)
-    ).all()
+    )).all()
 
 # 🔍 View My Board Request
 @router.get("/board/requests/my")
 def view_my_board_request(
-    user: User = Depends(verify_token),
-    session: Session = Depends(get_session)
+    user: UserPrincipal = Depends(verify_token),
+    session: Session = Depends(get_community_session)
 ):
     request = session.exec(
         select(BoardVerificationRequest).where(BoardVerificationRequest.user_id == user.id)
@@ -69,33 +78,39 @@ def view_my_board_request(
 
 # ✅ Approve Board Candidate
 @router.post("/board/approve/{candidate_id}")
-def approve_board_candidate(   
+def approve_board_candidate(
     candidate_id: str,
-    user: User = Depends(verify_token),
-    session: Session = Depends(get_session)
+    user: UserPrincipal = Depends(verify_token),
+    session: Session = Depends(get_community_session)
 ):
-    request = session.exec( 
-        select(BoardVerificationRequest).where(BoardVerificationRequest.id == candidate_id)
+    # Bump the counter and settle quorum in one statement; the row lock is held until commit.
+    # Communities share shards, so the id alone would let outsiders vote.
+    counted = session.exec(
+        update(BoardVerificationRequest)
+        .where(
+            BoardVerificationRequest.id == candidate_id,
+            BoardVerificationRequest.community_id == user.community_id,
+        )
+        .values(
+            approval_count=BoardVerificationRequest.approval_count + 1,
+            verified=BoardVerificationRequest.approval_count + 1 >= BOARD_APPROVAL_QUORUM,
+        )
+        .returning(BoardVerificationRequest.approval_count, BoardVerificationRequest.verified)
     ).first()
-    if not request:
+    if not counted:
+        session.rollback()
         raise HTTPException(status_code=404, detail="Candidate request not found")
 
-    if user.id in request.approved_by: 
+    # Single-row insert; the composite primary key is the duplicate check
+    session.add(BoardApproval(request_id=candidate_id, approver_id=user.id))
+    try:
+        session.commit()
+    except IntegrityError:
+        session.rollback()
         raise HTTPException(status_code=400, detail="You have already approved this candidate")
-    
-    # ✅ Explicit reassignment so SQLModel detects JSON change
-    updated_list = list(request.approved_by)
-    updated_list.append(user.id)
-    request.approved_by = updated_list
 
-    if len(request.approved_by) >= 4:
-        request.verified = True
-
-    session.add(request)
-    session.commit()
+    approval_count, verified = counted
     return {
-        "message": f"Approved. Total approvals: {len(request.approved_by)}",
-        "verified": request.verified
+        "message": f"Approved. Total approvals: {approval_count}",
+        "verified": verified
     }
-
-
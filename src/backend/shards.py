@@ -0,0 +1,164 @@
+import bisect
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import Session, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.backend.database import DATABASE_URL, async_engine, engine, make_async_engine, make_engine
+from src.backend.models import (
+    BoardApproval,
+    BoardVerificationRequest,
+    CommunityShard,
+    Complaint,
+    InboxCounter,
+    Message,
+    TenantInvite,
+)
+
+# ⚙️ Shard settings — unset keeps every community in DATABASE_URL
+load_dotenv()
+DATABASE_SHARD_URLS = [url.strip() for url in os.getenv("DATABASE_SHARD_URLS", "").split(",") if url.strip()]
+DATABASE_SHARDS = int(os.getenv("DATABASE_SHARDS", "0"))
+SHARD_VNODES = int(os.getenv("SHARD_VNODES", "64"))
+SHARD_PLACEMENT_TTL_SECONDS = float(os.getenv("SHARD_PLACEMENT_TTL_SECONDS", "30"))
+
+# Rows of these tables live on their community's shard; users, OTPs, the mail
+# queue, the activity log and placements stay in the directory database.
+# Parents come before children so copies never orphan a row.
+SHARDED_MODELS = (BoardVerificationRequest, BoardApproval, Complaint, Message, InboxCounter, TenantInvite)
+
+
+def _shard_urls() -> List[str]:
+    if DATABASE_SHARD_URLS:
+        return DATABASE_SHARD_URLS
+    # DATABASE_SHARDS=4 with sqlite:///hoainfo.db -> sqlite:///hoainfo_shard0.db ... _shard3.db
+    stem, ext = os.path.splitext(DATABASE_URL)
+    return [f"{stem}_shard{n}{ext}" for n in range(DATABASE_SHARDS)]
+
+
+def _async_url(url: str) -> str:
+    return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+
+
+def community_filter(model, community_id: str):
+    if model is BoardApproval:
+        # Approvals inherit their community from the request they vote on
+        requests = select(BoardVerificationRequest.id).where(
+            BoardVerificationRequest.community_id == community_id
+        )
+        return BoardApproval.request_id.in_(requests)
+    return model.community_id == community_id
+
+
+# 💍 Consistent hashing: adding a shard only moves the communities that land on its arcs
+class HashRing:
+    def __init__(self, names: List[str], vnodes: int = SHARD_VNODES):
+        points = sorted(
+            (self._hash(f"{name}#{replica}"), name) for name in names for replica in range(vnodes)
+        )
+        self._keys = [point for point, _ in points]
+        self._names = [name for _, name in points]
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], "big")
+
+    def lookup(self, key: str) -> str:
+        index = bisect.bisect(self._keys, self._hash(key)) % len(self._keys)
+        return self._names[index]
+
+
+@dataclass
+class Shard:
+    name: str
+    url: str
+    engine: Engine
+    async_engine: AsyncEngine
+
+
+# 🗂️ community_id -> shard: explicit placement if the community was moved, else the ring
+class ShardRouter:
+    def __init__(
+        self,
+        shards: List[Shard],
+        directory_engine: Engine,
+        vnodes: int = SHARD_VNODES,
+        placement_ttl: float = SHARD_PLACEMENT_TTL_SECONDS,
+    ):
+        self.shards: Dict[str, Shard] = {shard.name: shard for shard in shards}
+        self.directory_engine = directory_engine
+        self.ring = HashRing(list(self.shards), vnodes)
+        self.placement_ttl = placement_ttl
+        self._placements: Dict[str, str] = {}
+        self._placements_loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "ShardRouter":
+        urls = _shard_urls()
+        if not urls:
+            return cls([Shard("main", DATABASE_URL, engine, async_engine)], engine)
+        shards = [
+            Shard(f"shard{n}", url, make_engine(url), make_async_engine(_async_url(url)))
+            for n, url in enumerate(urls)
+        ]
+        return cls(shards, engine)
+
+    @property
+    def sharded(self) -> bool:
+        return len(self.shards) > 1
+
+    def shard_for(self, community_id: str) -> Shard:
+        if not self.sharded:
+            return next(iter(self.shards.values()))
+        name = self.placements().get(community_id) or self.ring.lookup(community_id)
+        try:
+            return self.shards[name]
+        except KeyError:
+            raise RuntimeError(f"Community {community_id} is placed on unknown shard {name!r}")
+
+    # Placements are a handful of rows; reload the whole map at most once per TTL
+    def placements(self) -> Dict[str, str]:
+        now = time.monotonic()
+        loaded_at = self._placements_loaded_at
+        if loaded_at is None or now - loaded_at >= self.placement_ttl:
+            with self._lock:
+                if self._placements_loaded_at is None or now - self._placements_loaded_at >= self.placement_ttl:
+                    self.refresh_placements()
+        return self._placements
+
+    def refresh_placements(self) -> None:
+        with self.directory_engine.connect() as conn:
+            rows = conn.execute(select(CommunityShard.community_id, CommunityShard.shard)).all()
+        self._placements = {community_id: shard for community_id, shard in rows}
+        self._placements_loaded_at = time.monotonic()
+
+    def session(self, community_id: str) -> Session:
+        return Session(self.shard_for(community_id).engine)
+
+    def async_session(self, community_id: str) -> AsyncSession:
+        return AsyncSession(self.shard_for(community_id).async_engine, expire_on_commit=False)
+
+    # Creates missing tables only; alembic upgrade head migrates the directory and every shard
+    def init_schema(self) -> None:
+        for shard in self.shards.values():
+            if shard.engine is not self.directory_engine:
+                SQLModel.metadata.create_all(shard.engine)
+
+    async def dispose(self) -> None:
+        for shard in self.shards.values():
+            if shard.engine is not self.directory_engine:
+                await shard.async_engine.dispose()
+                shard.engine.dispose()
+
+
+shard_router = ShardRouter.from_env()
@@ -0,0 +1,140 @@
+import json
+import logging
+import os
+import re
+import time
+from logging.handlers import RotatingFileHandler
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.backend.metrics import current_route
+
+# 🐢 Opt-in: SLOW_QUERY_LOG_ENABLED=1
+load_dotenv()
+SLOW_QUERY_LOG_ENABLED = os.getenv("SLOW_QUERY_LOG_ENABLED", "0") == "1"
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "100"))
+SLOW_QUERY_LOG_PATH = os.getenv("SLOW_QUERY_LOG_PATH", "slow_queries.log")
+SLOW_QUERY_LOG_MAX_BYTES = int(os.getenv("SLOW_QUERY_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+SLOW_QUERY_LOG_BACKUPS = int(os.getenv("SLOW_QUERY_LOG_BACKUPS", "5"))
+# A full SCAN of a table at least this big is flagged as a missing-index candidate
+SLOW_QUERY_LARGE_TABLE_ROWS = int(os.getenv("SLOW_QUERY_LARGE_TABLE_ROWS", "10000"))
+TABLE_SIZE_TTL_SECONDS = 300.0
+
+EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+# "SCAN complaint" / "SCAN TABLE complaint" — but not "SCAN complaint USING INDEX ..." nor a
+# virtual table driven by a constraint ("SCAN complaint_fts VIRTUAL TABLE INDEX 0:M3" is a MATCH)
+FULL_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(?!.*(?:\bUSING\b|VIRTUAL TABLE INDEX \d+:\S))")
+
+logger = logging.getLogger(__name__)
+_logger: Optional[logging.Logger] = None
+_table_sizes: Dict[str, Tuple[float, Optional[int]]] = {}
+
+
+def _get_logger() -> logging.Logger:
+    global _logger
+    if _logger is None:
+        logger = logging.getLogger("hoainfo.slow_query")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        handler = RotatingFileHandler(
+            SLOW_QUERY_LOG_PATH, maxBytes=SLOW_QUERY_LOG_MAX_BYTES, backupCount=SLOW_QUERY_LOG_BACKUPS
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        _logger = logger
+    return _logger
+
+
+# Types and sizes only — bound values may be emails, password hashes or OTPs
+def parameter_shape(parameters, executemany: bool):
+    if executemany:
+        rows = list(parameters or [])
+        return {"rows": len(rows), "first": parameter_shape(rows[0], False) if rows else None}
+    if isinstance(parameters, dict):
+        return {name: type(value).__name__ for name, value in parameters.items()}
+    return [type(value).__name__ for value in (parameters or ())]
+
+
+def _explain(dbapi_connection, statement: str, parameters) -> List[str]:
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        # Rows are (id, parent, notused, detail)
+        return [row[-1] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+def _table_size(dbapi_connection, table: str) -> Optional[int]:
+    now = time.monotonic()
+    cached = _table_sizes.get(table)
+    if cached and now - cached[0] < TABLE_SIZE_TTL_SECONDS:
+        return cached[1]
+    cursor = dbapi_connection.cursor()
+    try:
+        # MAX(rowid) is a b-tree seek, unlike COUNT(*); close enough to size a table
+        cursor.execute(f'SELECT MAX(rowid) FROM "{table}"')
+        size = cursor.fetchone()[0] or 0
+    except Exception:
+        size = None
+    finally:
+        cursor.close()
+    _table_sizes[table] = (now, size)
+    return size
+
+
+def _record(conn, statement: str, parameters, executemany: bool, elapsed: float) -> None:
+    plan: List[str] = []
+    full_scans: List[dict] = []
+    if statement.lstrip().upper().startswith(EXPLAINABLE):
+        dbapi_connection = conn.connection.dbapi_connection
+        explain_parameters = (list(parameters)[0] if parameters else ()) if executemany else parameters
+        try:
+            plan = _explain(dbapi_connection, statement, explain_parameters)
+        except Exception as exc:
+            plan = [f"EXPLAIN failed: {exc!r}"]
+        for detail in plan:
+            match = FULL_SCAN.match(detail)
+            if match:
+                table = match.group(1)
+                rows = _table_size(dbapi_connection, table)
+                full_scans.append({
+                    "table": table,
+                    "rows": rows,
+                    # Unknown size is flagged: better a false alarm than a silent scan
+                    "flagged": rows is None or rows >= SLOW_QUERY_LARGE_TABLE_ROWS,
+                })
+
+    _get_logger().info(json.dumps({
+        "ts": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "elapsed_ms": round(elapsed * 1000, 3),
+        "route": current_route(),
+        "database": conn.engine.url.database,
+        "sql": " ".join(statement.split()),
+        "params": parameter_shape(parameters, executemany),
+        "plan": plan,
+        "full_scans": full_scans,
+        "flagged": any(scan["flagged"] for scan in full_scans),
+    }))
+
+
+# 🔎 Engine hooks; statements under the threshold cost two perf_counter calls
+def attach_slow_query_log(sync_engine: Engine, threshold_ms: float = SLOW_QUERY_THRESHOLD_MS) -> None:
+    threshold = threshold_ms / 1000
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["slow_query_start"].pop()
+        if elapsed >= threshold:
+            try:
+                _record(conn, statement, parameters, executemany, elapsed)
+            except Exception:
+                # Diagnostics must never fail the query that triggered them
+                logger.exception("Could not record slow query")
@@ -0,0 +1,46 @@
+import os
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, Optional
+from zoneinfo import ZoneInfo
+
+from dotenv import load_dotenv
+
+load_dotenv()
+DEFAULT_TIMEZONE = os.getenv("DEFAULT_TIMEZONE", "America/Los_Angeles")
+
+
+# "community_id=Area/City,..." — communities outside DEFAULT_TIMEZONE
+def _parse_overrides(raw: str) -> Dict[str, str]:
+    overrides = {}
+    for item in raw.split(","):
+        community_id, _, name = item.partition("=")
+        if community_id.strip() and name.strip():
+            overrides[community_id.strip()] = name.strip()
+    return overrides
+
+
+COMMUNITY_TIMEZONES = _parse_overrides(os.getenv("COMMUNITY_TIMEZONES", ""))
+
+
+# 🕒 Storage is always naive UTC; local time only exists at the API edge
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+@lru_cache(maxsize=1024)
+def community_zone(community_id: str) -> ZoneInfo:
+    return ZoneInfo(COMMUNITY_TIMEZONES.get(community_id, DEFAULT_TIMEZONE))
+
+
+def to_local(value: Optional[datetime], community_id: str) -> Optional[datetime]:
+    if value is None:
+        return None
+    return value.replace(tzinfo=timezone.utc).astimezone(community_zone(community_id))
+
+
+# Naive input is read as the community's wall-clock time, matching what the API renders
+def to_utc(value: datetime, community_id: str) -> datetime:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=community_zone(community_id))
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
@@ -0,0 +1,68 @@
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+from sqlmodel import Session
+
+from src.backend.auth_cache import ACCESS_TOKEN_EXPIRE_MINUTES, UserPrincipal
+from src.backend.auth_utils import create_access_token
+from src.backend.database import get_session
+from src.backend.models import User
+from src.backend.refresh_tokens import (
+    RefreshCheck,
+    family_of,
+    issue_refresh_token,
+    revoke_family,
+    rotate_refresh_token,
+)
+
+router = APIRouter()
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+
+def _token_response(principal: UserPrincipal, refresh_token: str, family_id: str) -> dict:
+    return {
+        "access_token": create_access_token(principal, family_id),
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+        "expires_in": int(ACCESS_TOKEN_EXPIRE_MINUTES * 60),
+    }
+
+
+# 🎫 Called once a full sign-in (password + OTP) succeeds: starts a new refresh family
+def issue_tokens(session: Session, user: User) -> dict:
+    # Snapshot the claims first; committing expires the loaded row
+    principal = UserPrincipal.from_user(user)
+    refresh_token, family_id = issue_refresh_token(session, user.id)
+    session.commit()
+    return _token_response(principal, refresh_token, family_id)
+
+
+# 🔁 New access token from a refresh token — no bcrypt, no OTP
+@router.post("/token/refresh")
+def refresh(data: RefreshRequest, session: Session = Depends(get_session)):
+    result, rotation = rotate_refresh_token(session, data.refresh_token)
+    if result is RefreshCheck.REUSED:
+        raise HTTPException(status_code=401, detail="Refresh token reused; session signed out")
+    if result is RefreshCheck.INVALID:
+        raise HTTPException(status_code=401, detail="Invalid or expired refresh token")
+
+    # Claims come from the current row, so role and tier changes apply on refresh
+    user = session.get(User, rotation.user_id)
+    if not user:
+        session.rollback()
+        raise HTTPException(status_code=401, detail="Invalid or expired refresh token")
+    principal = UserPrincipal.from_user(user)
+    session.commit()
+    return _token_response(principal, rotation.token, rotation.family_id)
+
+
+# 🚪 Sign out: the refresh family and its access tokens stop working
+@router.post("/token/revoke")
+def revoke(data: RefreshRequest, session: Session = Depends(get_session)):
+    family_id = family_of(session, data.refresh_token)
+    # Unknown tokens get the same answer, so this can't be used to probe for valid ones
+    if family_id:
+        revoke_family(session, family_id)
+    return {"status": "Signed out."}
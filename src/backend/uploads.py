@@ -0,0 +1,215 @@
+import hashlib
+import importlib.util
+import os
+import uuid
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import anyio
+from dotenv import load_dotenv
+from fastapi import HTTPException, Request
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+load_dotenv()
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "static/uploads")
+MAX_PHOTO_BYTES = int(os.getenv("MAX_PHOTO_BYTES", str(12 * 1024 * 1024)))
+MAX_FORM_FIELD_BYTES = 64 * 1024
+# Caps text parts too, so a body without Content-Length can't stream fields forever
+MAX_FORM_FIELDS = 32
+# Allowance for boundaries, part headers and the text fields around the photo
+FORM_OVERHEAD_BYTES = 256 * 1024
+
+# HEIC (the iPhone default) decodes only through the pillow-heif plugin. Without it every
+# rendition job would fail, so HEIC is refused rather than stored without a thumbnail.
+HEIC_SUPPORTED = importlib.util.find_spec("pillow_heif") is not None
+ACCEPTED_FORMATS = ["JPEG", "PNG", "GIF", "WebP"] + (["HEIC"] if HEIC_SUPPORTED else [])
+
+
+# 🖼️ Accepted photo formats, identified by magic bytes rather than client-supplied headers
+def sniff_image_type(head: bytes) -> Optional[str]:
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if HEIC_SUPPORTED and head[4:8] == b"ftyp" and head[8:12] in (b"heic", b"heix", b"mif1", b"msf1"):
+        return "image/heic"
+    return None
+
+
+# 🗂️ Content-addressed photo storage: <root>/<ab>/<cd>/<sha256>
+class PhotoStore:
+    def __init__(self, root: str = UPLOAD_DIR, max_bytes: int = MAX_PHOTO_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+
+    def path_for(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest[2:4] / digest
+
+    def exists(self, digest: str) -> bool:
+        return self.path_for(digest).is_file()
+
+    def writer(self) -> "PhotoWriter":
+        return PhotoWriter(self)
+
+
+class PhotoWriter:
+    def __init__(self, store: PhotoStore):
+        self.store = store
+        self.size = 0
+        self._hash = hashlib.sha256()
+        self._head = b""
+        self._tmp_path = store.root / "tmp" / uuid.uuid4().hex
+        self._file = None
+
+    async def write(self, chunk: bytes) -> None:
+        if not chunk:
+            return
+        self.size += len(chunk)
+        if self.size > self.store.max_bytes:
+            await self.abort()
+            raise HTTPException(
+                status_code=413,
+                detail=f"Photo exceeds {self.store.max_bytes / (1024 * 1024):g} MB limit",
+            )
+        if len(self._head) < 16:
+            self._head += chunk[: 16 - len(self._head)]
+        self._hash.update(chunk)
+        if self._file is None:
+            await anyio.Path(self._tmp_path.parent).mkdir(parents=True, exist_ok=True)
+            self._file = await anyio.open_file(self._tmp_path, "wb")
+        await self._file.write(chunk)
+
+    async def commit(self) -> str:
+        if self._file is None:
+            raise HTTPException(status_code=400, detail="Empty photo upload")
+        await self._file.aclose()
+        self._file = None
+        if sniff_image_type(self._head) is None:
+            await anyio.Path(self._tmp_path).unlink(missing_ok=True)
+            raise HTTPException(
+                status_code=415,
+                detail=f"Photo must be {', '.join(ACCEPTED_FORMATS[:-1])} or {ACCEPTED_FORMATS[-1]}",
+            )
+
+        digest = self._hash.hexdigest()
+        final = anyio.Path(self.store.path_for(digest))
+        if await final.is_file():
+            # Same bytes already stored — keep one copy
+            await anyio.Path(self._tmp_path).unlink(missing_ok=True)
+        else:
+            await final.parent.mkdir(parents=True, exist_ok=True)
+            await anyio.to_thread.run_sync(os.replace, self._tmp_path, str(final))
+        return digest
+
+    async def abort(self) -> None:
+        if self._file is not None:
+            await self._file.aclose()
+            self._file = None
+        await anyio.Path(self._tmp_path).unlink(missing_ok=True)
+
+
+photo_store = PhotoStore()
+
+
+# 📤 Streaming multipart parser: text fields in memory, the photo straight to disk
+async def parse_photo_form(
+    request: Request, photo_field: str = "photo", store: PhotoStore = photo_store
+) -> Tuple[Dict[str, str], Optional[str]]:
+    content_length = request.headers.get("content-length")
+    if content_length:
+        try:
+            declared = int(content_length)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid Content-Length header")
+        if declared > store.max_bytes + FORM_OVERHEAD_BYTES:
+            raise HTTPException(status_code=413, detail="Request body too large")
+
+    _, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if not boundary:
+        raise HTTPException(status_code=400, detail="Missing multipart boundary")
+
+    raw_fields: Dict[str, bytearray] = {}
+    state = {
+        "name": None, "header": b"", "value": b"", "disposition": b"", "is_file": False,
+        "files": 0, "fields": 0,
+    }
+    pending = []  # photo bytes handed over by the sync parser callbacks, written async below
+
+    def on_part_begin():
+        state.update(name=None, disposition=b"", is_file=False)
+
+    def on_header_field(data, start, end):
+        state["header"] += data[start:end]
+
+    def on_header_value(data, start, end):
+        state["value"] += data[start:end]
+
+    def on_header_end():
+        if state["header"].lower() == b"content-disposition":
+            state["disposition"] = state["value"]
+        state["header"] = b""
+        state["value"] = b""
+
+    def on_headers_finished():
+        _, options = parse_options_header(state["disposition"])
+        if b"name" not in options:
+            raise HTTPException(status_code=400, detail="Multipart part without a name")
+        state["name"] = options[b"name"].decode("utf-8", "replace")
+        state["is_file"] = b"filename" in options
+        if state["is_file"]:
+            if state["name"] != photo_field:
+                raise HTTPException(status_code=400, detail=f"Unexpected file field: {state['name']}")
+            # A second part would be appended to the same writer and stored as one blob
+            state["files"] += 1
+            if state["files"] > 1:
+                raise HTTPException(status_code=400, detail="Only one photo per upload")
+        else:
+            state["fields"] += 1
+            if state["fields"] > MAX_FORM_FIELDS:
+                raise HTTPException(status_code=413, detail="Too many form fields")
+            raw_fields[state["name"]] = bytearray()
+
+    def on_part_data(data, start, end):
+        if state["is_file"]:
+            pending.append(data[start:end])
+        else:
+            value = raw_fields[state["name"]]
+            value += data[start:end]
+            if len(value) > MAX_FORM_FIELD_BYTES:
+                raise HTTPException(status_code=413, detail=f"Field {state['name']} too large")
+
+    parser = MultipartParser(boundary, {
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+    })
+
+    writer = store.writer()
+    saw_photo = False
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            for data in pending:
+                saw_photo = True
+                await writer.write(data)
+            pending.clear()
+        parser.finalize()
+    except MultipartParseError:
+        await writer.abort()
+        raise HTTPException(status_code=400, detail="Malformed multipart body")
+    except BaseException:
+        await writer.abort()
+        raise
+
+    digest = await writer.commit() if saw_photo and writer.size else None
+    fields = {name: value.decode("utf-8", "replace") for name, value in raw_fields.items()}
+    return fields, digest
@@ -0,0 +1,63 @@
+-- Schema of the databases that predate the Alembic chain (hoainfo.db, database.db),
+-- stamped at MIGRATION_FLOOR; tests/conftest.py upgrades it to head.
+CREATE TABLE user (
+	id VARCHAR NOT NULL,
+	email VARCHAR NOT NULL,
+	password_hash VARCHAR NOT NULL,
+	role VARCHAR,
+	tier VARCHAR,
+	community_id VARCHAR NOT NULL,
+	PRIMARY KEY (id)
+);
+CREATE TABLE activitylog (
+	id VARCHAR NOT NULL,
+	user_id VARCHAR NOT NULL,
+	action VARCHAR NOT NULL,
+	endpoint VARCHAR NOT NULL,
+	ip_address VARCHAR NOT NULL,
+	user_agent VARCHAR NOT NULL,
+	timestamp VARCHAR NOT NULL,
+	community_id VARCHAR NOT NULL,
+	PRIMARY KEY (id)
+);
+CREATE TABLE tenantinvite (
+	id VARCHAR NOT NULL,
+	landlord_email VARCHAR NOT NULL,
+	tenant_email VARCHAR NOT NULL,
+	community_id VARCHAR NOT NULL,
+	verified BOOLEAN NOT NULL,
+	PRIMARY KEY (id)
+);
+CREATE TABLE complaint (
+	id VARCHAR NOT NULL,
+	user_id VARCHAR NOT NULL,
+	title VARCHAR NOT NULL,
+	description VARCHAR NOT NULL,
+	timestamp VARCHAR,
+	photo_url VARCHAR,
+	community_id VARCHAR NOT NULL,
+	read BOOLEAN NOT NULL,
+	PRIMARY KEY (id),
+	FOREIGN KEY(user_id) REFERENCES user (id)
+);
+CREATE TABLE message (
+	id VARCHAR NOT NULL,
+	user_id VARCHAR NOT NULL,
+	subject VARCHAR NOT NULL,
+	body VARCHAR NOT NULL,
+	timestamp VARCHAR,
+	read BOOLEAN NOT NULL,
+	response VARCHAR,
+	community_id VARCHAR NOT NULL,
+	PRIMARY KEY (id),
+	FOREIGN KEY(user_id) REFERENCES user (id)
+);
+CREATE TABLE boardverificationrequest (
+	id VARCHAR NOT NULL,
+	user_id VARCHAR NOT NULL,
+	community_id VARCHAR NOT NULL,
+	approved_by JSON,
+	verified BOOLEAN NOT NULL,
+	PRIMARY KEY (id),
+	FOREIGN KEY(user_id) REFERENCES user (id)
+);
@@ -0,0 +1,181 @@
+import argparse
+import os
+import sqlite3
+import tempfile
+from pathlib import Path
+
+# The app builds its engines at import time, so point everything at a scratch
+# directory before any src.backend module is imported.
+_workdir = Path(tempfile.mkdtemp(prefix="hoainfo-tests-"))
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{_workdir / 'app.db'}",
+    "DATABASE_SHARDS": "0",
+    "DATABASE_SHARD_URLS": "",
+    "OTP_STORE_BACKEND": "memory",
+    "ACTIVITY_LOG_ENABLED": "0",
+    "SLOW_QUERY_LOG_ENABLED": "0",
+    "MAIL_TRANSPORT": "file",
+    "MAIL_SPOOL_DIR": str(_workdir / "mail"),
+    "UPLOAD_DIR": str(_workdir / "uploads"),
+    "PASSWORD_HASH_WORKERS": "1",
+    # Every case signs in from the same client address; test_rate_limit turns limits back on
+    "RATE_LIMIT_ENABLED": "0",
+})
+
+import bcrypt  # noqa: E402
+import pytest  # noqa: E402
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlmodel import Session, SQLModel, select  # noqa: E402
+
+from scripts.seed_test_data import SEED_PASSWORD, generate  # noqa: E402
+from src.backend import database, main  # noqa: E402
+from src.backend.auth_cache import token_versions  # noqa: E402
+from src.backend.database import make_engine  # noqa: E402
+from src.backend.metrics import current_route  # noqa: E402
+from src.backend.models import BoardVerificationRequest, User  # noqa: E402
+from src.backend.refresh_tokens import revoked_families  # noqa: E402
+from tests.plan_utils import REPO_ROOT  # noqa: E402
+
+# Last revision whose downgrade is exercised; everything before it predates the tracked schema
+MIGRATION_FLOOR = "a0804c3f320b"
+BASELINE_SCHEMA = Path(__file__).with_name("baseline_schema.sql")
+SEED = argparse.Namespace(seed=7, communities=20, users=25, complaints=4, messages=1, activity=2)
+
+
+def seed(engine) -> None:
+    password_hash = bcrypt.hashpw(SEED_PASSWORD.encode(), bcrypt.gensalt(rounds=4)).decode()
+    tables = SQLModel.metadata.tables
+    with engine.begin() as conn:
+        users = []
+        for table_name, rows in generate(SEED, password_hash).items():
+            rows = list(rows)
+            conn.execute(tables[table_name].insert(), rows)
+            if table_name == User.__tablename__:
+                users = rows
+        # Half the residents have asked to join their board
+        conn.execute(
+            BoardVerificationRequest.__table__.insert(),
+            [
+                {"id": f"bvr-{n}", "user_id": user["id"], "community_id": user["community_id"],
+                 "approval_count": 0, "verified": False}
+                for n, user in enumerate(users[::2])
+            ],
+        )
+        conn.exec_driver_sql("ANALYZE")
+
+
+def alembic_config(db_url: str) -> Config:
+    config = Config(str(REPO_ROOT / "alembic.ini"), cmd_opts=argparse.Namespace(x=[f"db_url={db_url}"]))
+    config.set_main_option("script_location", str(REPO_ROOT / "alembic"))
+    return config
+
+
+@pytest.fixture(scope="session")
+def metadata_db() -> str:
+    """The app's own database: schema from SQLModel.metadata, then synthetic data."""
+    SQLModel.metadata.create_all(database.engine)
+    seed(database.engine)
+    return database.engine.url.database
+
+
+@pytest.fixture(scope="session")
+def migrated_db() -> str:
+    """A second database upgraded from the baseline schema, then walked down to it and back up."""
+    path = _workdir / "migrated.db"
+    db_url = f"sqlite:///{path}"
+    with sqlite3.connect(path) as conn:
+        conn.executescript(BASELINE_SCHEMA.read_text())
+    config = alembic_config(db_url)
+    command.stamp(config, MIGRATION_FLOOR)
+    command.upgrade(config, "head")
+    command.downgrade(config, MIGRATION_FLOOR)
+    command.upgrade(config, "head")
+    engine = make_engine(db_url)
+    seed(engine)
+    engine.dispose()
+    return str(path)
+
+
+@pytest.fixture(params=["metadata_db", "migrated_db"])
+def schema_db(request) -> str:
+    return request.getfixturevalue(request.param)
+
+
+class StatementLog:
+    """Every statement issued while a request is being handled, tagged with its route."""
+
+    def __init__(self):
+        self.entries = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        route = current_route()
+        if route is not None:
+            self.entries.append((route, statement, parameters))
+
+    def clear(self) -> None:
+        self.entries = []
+
+
+@pytest.fixture(scope="session")
+def statement_log(metadata_db):
+    log = StatementLog()
+    engines = (database.engine, database.async_engine.sync_engine)
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", log)
+    yield log
+    for engine in engines:
+        event.remove(engine, "before_cursor_execute", log)
+
+
+@pytest.fixture(scope="session")
+def otp_codes():
+    codes = {}
+    main.otp_delivery_hook = lambda email, code: codes.__setitem__(email, code)
+    yield codes
+    main.otp_delivery_hook = None
+
+
+@pytest.fixture(scope="session")
+def client(metadata_db, statement_log, otp_codes):
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+
+@pytest.fixture(scope="session")
+def sign_in(client, otp_codes):
+    def sign_in(email: str, community_id: str = "00000", password: str = "pw") -> dict:
+        client.post("/register", json={"email": email, "password": password, "community_id": community_id})
+        if email not in otp_codes:
+            client.post("/resend-otp", params={"email": email})
+        response = client.post("/login", json={"email": email, "password": password, "otp": otp_codes.pop(email)})
+        assert response.status_code == 200, response.text
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    return sign_in
+
+
+@pytest.fixture(scope="session")
+def actors(sign_in):
+    """A resident and an admin in seeded community 00000, plus a board candidate to vote on."""
+    resident = sign_in("resident@tests.example.com")
+    sign_in("admin@tests.example.com")
+    with Session(database.engine) as session:
+        admin_user = session.exec(select(User).where(User.email == "admin@tests.example.com")).one()
+        admin_user.role = "admin"
+        session.add(admin_user)
+        session.commit()
+        candidate = session.exec(
+            select(BoardVerificationRequest).where(BoardVerificationRequest.community_id == "00000")
+        ).first()
+        neighbour = session.exec(
+            select(User).where(User.community_id == "00000", User.email != "admin@tests.example.com")
+        ).first()
+    # Roles travel in the token, so the admin signs in again to pick theirs up
+    admin = sign_in("admin@tests.example.com")
+    token_versions.refresh()
+    revoked_families.refresh()
+    return {"resident": resident, "admin": admin, "candidate_id": candidate.id, "neighbour_id": neighbour.id}
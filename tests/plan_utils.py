@@ -0,0 +1,35 @@
+import re
+import sqlite3
+from pathlib import Path
+from typing import List, Sequence, Tuple
+
+from sqlalchemy.dialects import sqlite
+
+from src.backend.slow_query import FULL_SCAN
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+PLANNED_STATEMENTS = ("SELECT", "UPDATE", "DELETE", "WITH")
+
+
+def explain(db_path: str, statement: str, parameters: Sequence = ()) -> List[str]:
+    with sqlite3.connect(db_path) as conn:
+        return [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {statement}", tuple(parameters or ()))]
+
+
+def compile_sqlite(query) -> Tuple[str, list]:
+    compiled = query.compile(dialect=sqlite.dialect())
+    processors = compiled._bind_processors
+    params = []
+    for name in compiled.positiontup:
+        value = compiled.params[name]
+        processor = processors.get(name)
+        params.append(processor(value) if processor else value)
+    return str(compiled), params
+
+
+def full_scans(plan: List[str]) -> List[str]:
+    return [detail for detail in plan if FULL_SCAN.match(detail)]
+
+
+def normalize(statement: str) -> str:
+    return re.sub(r"\s+", " ", statement).strip()
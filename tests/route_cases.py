@@ -0,0 +1,191 @@
+import itertools
+from typing import Callable, List, Tuple
+
+_emails = (f"case{n}@tests.example.com" for n in itertools.count())
+
+# Each case does its own setup and returns the one request under measurement
+RouteCase = Callable[..., Callable]
+
+
+def _register(client) -> str:
+    email = next(_emails)
+    client.post("/register", json={"email": email, "password": "pw", "community_id": "00000"})
+    return email
+
+
+def register(client, actors, otp_codes):
+    email = next(_emails)
+    return lambda: client.post("/register", json={"email": email, "password": "pw", "community_id": "00000"})
+
+
+def login(client, actors, otp_codes):
+    email = _register(client)
+    return lambda: client.post("/login", json={"email": email, "password": "pw", "otp": otp_codes.pop(email)})
+
+
+def verify_otp(client, actors, otp_codes):
+    email = _register(client)
+    return lambda: client.post("/verify-otp", json={"email": email, "otp": otp_codes.pop(email)})
+
+
+def _refresh_token(client, otp_codes) -> str:
+    email = _register(client)
+    response = client.post("/login", json={"email": email, "password": "pw", "otp": otp_codes.pop(email)})
+    return response.json()["refresh_token"]
+
+
+def refresh_token(client, actors, otp_codes):
+    token = _refresh_token(client, otp_codes)
+    return lambda: client.post("/token/refresh", json={"refresh_token": token})
+
+
+def revoke_token(client, actors, otp_codes):
+    token = _refresh_token(client, otp_codes)
+    return lambda: client.post("/token/revoke", json={"refresh_token": token})
+
+
+def list_complaints(client, actors, otp_codes):
+    return lambda: client.get("/complaints", params={"limit": 2}, headers=actors["resident"])
+
+
+def list_complaints_next_page(client, actors, otp_codes):
+    cursor = client.get("/complaints", params={"limit": 1}, headers=actors["admin"]).json()["next_cursor"]
+    return lambda: client.get(
+        "/complaints", params={"limit": 1, "cursor": cursor, "since": "2020-01-01T00:00:00"},
+        headers=actors["admin"],
+    )
+
+
+def submit_complaint(client, actors, otp_codes):
+    return lambda: client.post(
+        "/complaints", json={"title": "Gate", "description": "Stuck open"}, headers=actors["resident"]
+    )
+
+
+def upgrade(client, actors, otp_codes):
+    # Upgrading revokes the caller's token, so use a throwaway account
+    email = _register(client)
+    token = client.post("/login", json={"email": email, "password": "pw", "otp": otp_codes.pop(email)})
+    headers = {"Authorization": f"Bearer {token.json()['access_token']}"}
+    return lambda: client.post("/upgrade", headers=headers)
+
+
+def board_request(client, actors, otp_codes):
+    return lambda: client.post("/board/request", json={"community_id": "00000"}, headers=actors["resident"])
+
+
+def board_requests(client, actors, otp_codes):
+    return lambda: client.get("/board/requests", headers=actors["admin"])
+
+
+def my_board_request(client, actors, otp_codes):
+    return lambda: client.get("/board/requests/my", headers=actors["resident"])
+
+
+def approve(client, actors, otp_codes):
+    return lambda: client.post(f"/board/approve/{actors['candidate_id']}", headers=actors["admin"])
+
+
+def set_role(client, actors, otp_codes):
+    return lambda: client.post(
+        f"/admin/users/{actors['neighbour_id']}/role", json={"role": "board"}, headers=actors["admin"]
+    )
+
+
+def admin_dashboard(client, actors, otp_codes):
+    return lambda: client.get("/admin/dashboard", headers=actors["admin"])
+
+
+def board_votes(client, actors, otp_codes):
+    return lambda: client.get("/board/votes", headers=actors["admin"])
+
+
+def send_message(client, actors, otp_codes):
+    return lambda: client.post(
+        "/messages/send",
+        json={"receiver_email": "resident@tests.example.com", "subject": "Dues", "body": "Due Friday"},
+        headers=actors["admin"],
+    )
+
+
+def inbox(client, actors, otp_codes):
+    return lambda: client.get("/messages/inbox", headers=actors["resident"])
+
+
+def unread_inbox(client, actors, otp_codes):
+    return lambda: client.get("/messages/inbox", params={"unread": True, "limit": 5}, headers=actors["resident"])
+
+
+def hoa_mailbox(client, actors, otp_codes):
+    client.post("/messages/send", json={"subject": "Fence", "body": "Loose panel"}, headers=actors["resident"])
+    return lambda: client.get("/messages/hoa", headers=actors["admin"])
+
+
+def outbox(client, actors, otp_codes):
+    return lambda: client.get("/messages/outbox", headers=actors["admin"])
+
+
+def unread_count(client, actors, otp_codes):
+    return lambda: client.get("/messages/unread", headers=actors["resident"])
+
+
+def mark_read(client, actors, otp_codes):
+    message_id = client.post(
+        "/messages/send",
+        json={"receiver_email": "resident@tests.example.com", "subject": "Pool", "body": "Opens at 9"},
+        headers=actors["admin"],
+    ).json()["id"]
+    return lambda: client.post(f"/messages/{message_id}/read", headers=actors["resident"])
+
+
+def search_complaints(client, actors, otp_codes):
+    return lambda: client.get(
+        "/search", params={"q": "gate", "since": "2024-06-01T00:00:00", "limit": 2}, headers=actors["admin"]
+    )
+
+
+def search_complaints_next_page(client, actors, otp_codes):
+    cursor = client.get("/search", params={"q": "gate", "limit": 1}, headers=actors["admin"]).json()["next_cursor"]
+    return lambda: client.get("/search", params={"q": "gate", "limit": 1, "cursor": cursor}, headers=actors["admin"])
+
+
+def search_messages(client, actors, otp_codes):
+    return lambda: client.get("/search", params={"q": "pool", "type": "messages"}, headers=actors["resident"])
+
+
+ROUTE_CASES: List[Tuple[str, RouteCase]] = [
+    ("POST /register", register),
+    ("POST /login", login),
+    ("POST /verify-otp", verify_otp),
+    ("POST /token/refresh", refresh_token),
+    ("POST /token/revoke", revoke_token),
+    ("GET /complaints", list_complaints),
+    ("GET /complaints", list_complaints_next_page),
+    ("POST /complaints", submit_complaint),
+    ("POST /upgrade", upgrade),
+    ("POST /board/request", board_request),
+    ("GET /board/requests", board_requests),
+    ("GET /board/requests/my", my_board_request),
+    ("POST /board/approve/{candidate_id}", approve),
+    ("POST /admin/users/{user_id}/role", set_role),
+    ("GET /admin/dashboard", admin_dashboard),
+    ("GET /board/votes", board_votes),
+    ("POST /messages/send", send_message),
+    ("GET /messages/inbox", inbox),
+    ("GET /messages/inbox", unread_inbox),
+    ("GET /messages/outbox", outbox),
+    ("GET /messages/hoa", hoa_mailbox),
+    ("GET /messages/unread", unread_count),
+    ("POST /messages/{message_id}/read", mark_read),
+    ("GET /search", search_complaints),
+    ("GET /search", search_complaints_next_page),
+    ("GET /search", search_messages),
+]
+
+
+def run_case(case: RouteCase, client, actors, otp_codes, statement_log):
+    """Run one case; returns (response, statements tagged with its route)."""
+    request = case(client, actors, otp_codes)
+    start = len(statement_log.entries)
+    response = request()
+    return response, statement_log.entries[start:]
@@ -0,0 +1,32 @@
+from sqlalchemy import func, select
+from sqlmodel import SQLModel
+
+from src.backend.activity_log import ActivityLogWriter
+from src.backend.database import make_engine
+from src.backend.models import ActivityLog
+from src.backend.timezones import utc_now
+
+
+def _record(n: int) -> dict:
+    return {
+        "id": f"log-{n}", "user_id": "", "action": "GET 200", "endpoint": "/complaints",
+        "ip_address": "", "user_agent": "", "timestamp": utc_now(), "community_id": "",
+    }
+
+
+def test_overflow_is_spilled_by_the_writer_not_the_caller(tmp_path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'log.db'}")
+    SQLModel.metadata.create_all(engine, tables=[ActivityLog.__table__])
+    spill = tmp_path / "spill.jsonl"
+    writer = ActivityLogWriter(engine, queue_size=1, spill_path=str(spill), spill_queue_size=1)
+
+    for n in range(3):
+        writer.submit(_record(n))
+    # One queued, one waiting to be spilled, one dropped — and no file I/O yet
+    assert not spill.exists()
+    assert writer.dropped == 1
+
+    writer.stop()
+    assert len(spill.read_text().splitlines()) == 1
+    with engine.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(ActivityLog)).scalar() == 1
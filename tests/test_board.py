@@ -0,0 +1,50 @@
+from sqlmodel import Session, select
+
+from src.backend import database
+from src.backend.models import BoardApproval, BoardVerificationRequest
+from src.backend.secure_routes import BOARD_APPROVAL_QUORUM
+
+
+def _approvals(candidate_id: str) -> int:
+    with Session(database.engine) as session:
+        return session.exec(
+            select(BoardVerificationRequest.approval_count).where(BoardVerificationRequest.id == candidate_id)
+        ).one()
+
+
+# Every community on a shard shares the table; only the candidate's neighbours may vote
+def test_outsider_cannot_approve_candidate(client, actors, sign_in):
+    outsider = sign_in("outsider@tests.example.com", community_id="99999")
+    candidate_id = actors["candidate_id"]
+    before = _approvals(candidate_id)
+
+    response = client.post(f"/board/approve/{candidate_id}", headers=outsider)
+    assert response.status_code == 404
+    assert _approvals(candidate_id) == before
+
+
+def test_quorum_verifies_and_each_resident_counts_once(client, sign_in):
+    community = "quorum-test"
+    candidate = sign_in(f"candidate@{community}.example.com", community_id=community)
+    assert client.post("/board/request", json={"community_id": community}, headers=candidate).status_code == 200
+    candidate_id = client.get("/board/requests/my", headers=candidate).json()["id"]
+    voters = [
+        sign_in(f"voter{n}@{community}.example.com", community_id=community)
+        for n in range(BOARD_APPROVAL_QUORUM)
+    ]
+
+    for count, voter in enumerate(voters, start=1):
+        response = client.post(f"/board/approve/{candidate_id}", headers=voter)
+        assert response.status_code == 200, response.text
+        assert response.json()["verified"] == (count == BOARD_APPROVAL_QUORUM)
+        assert _approvals(candidate_id) == count
+
+    # The composite key rejects the second vote and rolls the counter bump back with it
+    response = client.post(f"/board/approve/{candidate_id}", headers=voters[0])
+    assert response.status_code == 400
+    assert _approvals(candidate_id) == BOARD_APPROVAL_QUORUM
+    with Session(database.engine) as session:
+        assert len(session.exec(select(BoardApproval).where(BoardApproval.request_id == candidate_id)).all()) == (
+            BOARD_APPROVAL_QUORUM
+        )
+        assert session.get(BoardVerificationRequest, candidate_id).verified
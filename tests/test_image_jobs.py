@@ -0,0 +1,65 @@
+import io
+import logging
+from concurrent.futures import Future
+
+import pytest
+from PIL import Image
+
+from src.backend import image_jobs
+from src.backend.uploads import ACCEPTED_FORMATS, HEIC_SUPPORTED, sniff_image_type
+
+PILLOW_FORMATS = {"JPEG": "JPEG", "PNG": "PNG", "GIF": "GIF", "WebP": "WEBP", "HEIC": "HEIF"}
+
+
+def _encode(label: str) -> bytes:
+    if label == "HEIC":
+        from pillow_heif import register_heif_opener
+
+        register_heif_opener()
+    buffer = io.BytesIO()
+    Image.new("RGB", (640, 480), "teal").save(buffer, PILLOW_FORMATS[label])
+    return buffer.getvalue()
+
+
+# Every format the upload sniffer accepts must also produce renditions
+@pytest.mark.parametrize("label", ACCEPTED_FORMATS)
+def test_every_accepted_format_renders(tmp_path, label):
+    data = _encode(label)
+    assert sniff_image_type(data[:16]) is not None
+
+    source = tmp_path / "original"
+    source.write_bytes(data)
+    targets = [(size, str(tmp_path / name / "out.jpg")) for name, size in image_jobs.RENDITIONS.items()]
+    image_jobs._render(str(source), targets)
+
+    for size, target in targets:
+        with Image.open(target) as rendition:
+            assert rendition.format == "JPEG"
+            assert max(rendition.size) == min(size, 640)
+
+
+@pytest.mark.skipif(HEIC_SUPPORTED, reason="pillow-heif installed; HEIC is accepted")
+def test_heic_refused_without_decoder():
+    assert sniff_image_type(b"\x00\x00\x00\x18ftypheic\x00\x00\x00\x00") is None
+
+
+def test_renditions_for_reports_each_photo_on_a_page(tmp_path, monkeypatch):
+    monkeypatch.setattr(image_jobs, "RENDITION_DIR", str(tmp_path))
+    ready, pending = "ab" * 32, "cd" * 32
+    thumbnail = image_jobs.rendition_path(ready, "thumbnail")
+    thumbnail.parent.mkdir(parents=True)
+    thumbnail.write_bytes(b"jpeg")
+
+    assert image_jobs.renditions_for([ready, pending, None, ready]) == {
+        ready: {"thumbnail": True, "web": False},
+        pending: {"thumbnail": False, "web": False},
+    }
+
+
+def test_failed_rendition_is_logged(caplog):
+    future = Future()
+    future.set_exception(OSError("disk full"))
+    with caplog.at_level(logging.ERROR, logger=image_jobs.__name__):
+        image_jobs._done("ef" * 32, future)
+    assert "rendition failed for " + "ef" * 32 in caplog.text
+    assert "disk full" in caplog.text
@@ -0,0 +1,77 @@
+import hashlib
+
+import pytest
+
+from src.backend.uploads import photo_store
+
+PHOTO = b"\xff\xd8\xff\xe0" + bytes(range(256)) * 4
+
+
+@pytest.fixture(scope="module")
+def photo_url():
+    digest = hashlib.sha256(PHOTO).hexdigest()
+    path = photo_store.path_for(digest)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(PHOTO)
+    return f"/media/photo/{digest}", f'"{digest}"'
+
+
+def test_full_response_carries_digest_etag(client, photo_url):
+    url, etag = photo_url
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.content == PHOTO
+    assert response.headers["etag"] == etag
+    assert response.headers["content-type"] == "image/jpeg"
+    assert "immutable" in response.headers["cache-control"]
+    assert response.headers["accept-ranges"] == "bytes"
+
+
+def test_head_has_headers_without_body(client, photo_url):
+    url, etag = photo_url
+    response = client.head(url)
+    assert response.status_code == 200
+    assert response.content == b""
+    assert response.headers["content-length"] == str(len(PHOTO))
+
+
+def test_single_range(client, photo_url):
+    url, etag = photo_url
+    response = client.get(url, headers={"Range": "bytes=4-13"})
+    assert response.status_code == 206
+    assert response.content == PHOTO[4:14]
+    assert response.headers["content-range"] == f"bytes 4-13/{len(PHOTO)}"
+
+
+def test_if_range_with_stale_etag_sends_whole_file(client, photo_url):
+    url, _ = photo_url
+    response = client.get(url, headers={"Range": "bytes=0-9", "If-Range": '"stale"'})
+    assert response.status_code == 200
+    assert response.content == PHOTO
+
+
+def test_unsatisfiable_range(client, photo_url):
+    url, _ = photo_url
+    assert client.get(url, headers={"Range": f"bytes={len(PHOTO) + 10}-"}).status_code == 416
+
+
+@pytest.mark.parametrize("if_none_match", ["{etag}", "W/{etag}", '"other", {etag}', "*"])
+def test_revalidation_returns_304(client, photo_url, if_none_match):
+    url, etag = photo_url
+    response = client.get(url, headers={"If-None-Match": if_none_match.format(etag=etag)})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+def test_unknown_kind_and_missing_digest_are_404(client, photo_url):
+    url, _ = photo_url
+    assert client.get(url.replace("/photo/", "/original/")).status_code == 404
+    assert client.get(f"/media/photo/{'0' * 64}").status_code == 404
+
+
+@pytest.mark.parametrize("if_none_match", ['"{digest}"', "*"])
+def test_revalidating_a_missing_digest_is_404(client, if_none_match):
+    digest = "0" * 64
+    response = client.get(f"/media/photo/{digest}", headers={"If-None-Match": if_none_match.format(digest=digest)})
+    assert response.status_code == 404
@@ -0,0 +1,30 @@
+from sqlmodel import Session, select
+
+from src.backend import database
+from src.backend.models import User
+
+
+# Messages without a recipient are addressed to the HOA; its board reads them
+def test_hoa_mailbox_is_for_the_board(client, sign_in):
+    community = "hoa-mailbox"
+    resident = sign_in(f"resident@{community}.example.com", community_id=community)
+    response = client.post("/messages/send", json={"subject": "Fence", "body": "Loose panel"}, headers=resident)
+    assert response.status_code == 200, response.text
+    message_id = response.json()["id"]
+
+    assert client.get("/messages/hoa", headers=resident).status_code == 403
+    sign_in(f"board@{community}.example.com", community_id=community)
+    with Session(database.engine) as session:
+        member = session.exec(select(User).where(User.email == f"board@{community}.example.com")).one()
+        member.role = "board"
+        session.add(member)
+        session.commit()
+    # Roles travel in the token, so the member signs in again to pick theirs up
+    board = sign_in(f"board@{community}.example.com", community_id=community)
+
+    response = client.get("/messages/hoa", headers=board)
+    assert response.status_code == 200, response.text
+    items = response.json()["items"]
+    assert [item["id"] for item in items] == [message_id]
+    assert items[0]["sender_email"] == f"resident@{community}.example.com"
+    assert items[0]["recipient_id"] is None
@@ -0,0 +1,43 @@
+import pytest
+
+from tests.route_cases import ROUTE_CASES, run_case
+
+# Most statements one request may issue; authorization itself comes from token claims.
+# Raise a budget only alongside the change that needs it.
+QUERY_BUDGETS = {
+    "POST /register": 1,
+    "POST /login": 2,
+    "POST /verify-otp": 2,
+    "POST /token/refresh": 3,
+    "POST /token/revoke": 2,
+    "GET /complaints": 1,
+    "POST /complaints": 1,
+    "POST /upgrade": 2,
+    "POST /board/request": 3,
+    "GET /board/requests": 1,
+    "GET /board/requests/my": 1,
+    "POST /board/approve/{candidate_id}": 2,
+    "POST /admin/users/{user_id}/role": 3,
+    "GET /admin/dashboard": 0,
+    "GET /board/votes": 0,
+    "POST /messages/send": 3,
+    "GET /messages/inbox": 3,
+    "GET /messages/outbox": 3,
+    "GET /messages/hoa": 3,
+    "GET /messages/unread": 1,
+    "POST /messages/{message_id}/read": 2,
+    "GET /search": 2,
+}
+
+
+@pytest.mark.parametrize("route,case", ROUTE_CASES, ids=[f"{route} ({case.__name__})" for route, case in ROUTE_CASES])
+def test_route_stays_within_query_budget(client, actors, otp_codes, statement_log, route, case):
+    response, statements = run_case(case, client, actors, otp_codes, statement_log)
+    assert response.status_code < 500 and response.status_code not in (401, 403), response.text
+
+    issued = [statement for tagged, statement, _ in statements if tagged == route]
+    assert len(issued) <= QUERY_BUDGETS[route], f"{route} issued {len(issued)} statements:\n" + "\n".join(issued)
+
+
+def test_every_route_case_has_a_budget():
+    assert {route for route, _ in ROUTE_CASES} <= set(QUERY_BUDGETS)
@@ -0,0 +1,179 @@
+import sqlite3
+from datetime import datetime
+
+import pytest
+from sqlalchemy import tuple_, update
+from sqlmodel import select
+
+from src.backend.models import BoardVerificationRequest, Complaint, InboxCounter, Message, RefreshToken, User
+from tests.plan_utils import PLANNED_STATEMENTS, compile_sqlite, explain, full_scans, normalize
+from tests.route_cases import ROUTE_CASES, run_case
+
+# The lookups each route depends on, written the way the routes write them
+NAMED_QUERIES = {
+    # main.login, auth_utils.verify_token and the OTP user lookup in otp_routes.verify_otp
+    "user by email": (
+        select(User).where(User.email == "user000001@c00000.example.com"),
+        "ix_user_email",
+    ),
+    # routes.set_user_role, routes.upgrade_tier (session.get)
+    "user by id": (
+        select(User).where(User.id == "00000000-0000-4000-8000-000000000000"),
+        "sqlite_autoindex_user_1",
+    ),
+    # routes.get_complaints, first page
+    "complaints by community": (
+        select(Complaint)
+        .where(Complaint.community_id == "00003")
+        .order_by(Complaint.timestamp.desc(), Complaint.id.desc())
+        .limit(51),
+        "ix_complaint_community_timestamp_id",
+    ),
+    # routes.get_complaints, following pages and date bounds
+    "complaints by community after cursor": (
+        select(Complaint)
+        .where(
+            Complaint.community_id == "00003",
+            Complaint.timestamp >= datetime(2024, 3, 1),
+            tuple_(Complaint.timestamp, Complaint.id) < tuple_(datetime(2025, 1, 1), "zzz"),
+        )
+        .order_by(Complaint.timestamp.desc(), Complaint.id.desc())
+        .limit(51),
+        "ix_complaint_community_timestamp_id",
+    ),
+    # secure_routes.board_verification_request, view_my_board_request
+    "board request by user": (
+        select(BoardVerificationRequest).where(BoardVerificationRequest.user_id == "someone"),
+        "ix_boardverificationrequest_user_id",
+    ),
+    # secure_routes.list_board_requests
+    "board requests by community": (
+        select(BoardVerificationRequest).where(BoardVerificationRequest.community_id == "00003"),
+        "ix_boardverificationrequest_community_id",
+    ),
+    # secure_routes.approve_board_candidate
+    "approve candidate": (
+        update(BoardVerificationRequest)
+        .where(BoardVerificationRequest.id == "bvr-1", BoardVerificationRequest.community_id == "00003")
+        .values(approval_count=BoardVerificationRequest.approval_count + 1),
+        "sqlite_autoindex_boardverificationrequest_1",
+    ),
+    # auth_cache.TokenVersions.refresh
+    "recently revoked users": (
+        select(User.id, User.token_version).where(User.token_revoked_at >= datetime(2026, 1, 1)),
+        "ix_user_token_revoked_at",
+    ),
+    # refresh_tokens.rotate_refresh_token, family_of
+    "refresh token by digest": (
+        update(RefreshToken)
+        .where(RefreshToken.token_hash == "digest", RefreshToken.used_at.is_(None))
+        .values(used_at=datetime(2026, 1, 1)),
+        "ix_refresh_token_token_hash",
+    ),
+    # refresh_tokens.revoke_family
+    "refresh family": (
+        update(RefreshToken)
+        .where(RefreshToken.family_id == "family", RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime(2026, 1, 1)),
+        "ix_refresh_token_family_id",
+    ),
+    # refresh_tokens.RevokedFamilies.refresh
+    "recently revoked families": (
+        select(RefreshToken.family_id).where(RefreshToken.revoked_at >= datetime(2026, 1, 1)),
+        "ix_refresh_token_revoked_at",
+    ),
+    # message_routes.get_inbox with unread=true
+    "unread inbox": (
+        select(Message)
+        .where(Message.recipient_id == "someone", Message.read == False)  # noqa: E712
+        .order_by(Message.timestamp.desc(), Message.id.desc())
+        .limit(51),
+        "ix_message_recipient_read_timestamp_id",
+    ),
+    # message_routes.get_inbox, the full inbox
+    "inbox": (
+        select(Message)
+        .where(
+            Message.recipient_id == "someone",
+            tuple_(Message.timestamp, Message.id) < tuple_(datetime(2025, 1, 1), "zzz"),
+        )
+        .order_by(Message.timestamp.desc(), Message.id.desc())
+        .limit(51),
+        "ix_message_recipient_timestamp_id",
+    ),
+    # message_routes.get_hoa_mailbox
+    "hoa mailbox": (
+        select(Message)
+        .where(Message.community_id == "00003", Message.recipient_id.is_(None))
+        .order_by(Message.timestamp.desc(), Message.id.desc())
+        .limit(51),
+        "ix_message_community_recipient_timestamp_id",
+    ),
+    # message_routes.get_outbox
+    "outbox": (
+        select(Message)
+        .where(
+            Message.user_id == "someone",
+            tuple_(Message.timestamp, Message.id) < tuple_(datetime(2025, 1, 1), "zzz"),
+        )
+        .order_by(Message.timestamp.desc(), Message.id.desc())
+        .limit(51),
+        "ix_message_sender_timestamp_id",
+    ),
+    # message_routes._unread
+    "unread badge": (
+        select(InboxCounter.unread).where(InboxCounter.user_id == "someone"),
+        "sqlite_autoindex_inbox_counter_1",
+    ),
+}
+
+
+@pytest.mark.parametrize("name", NAMED_QUERIES)
+def test_named_query_uses_expected_index(schema_db, name):
+    query, index = NAMED_QUERIES[name]
+    statement, params = compile_sqlite(query)
+    plan = explain(schema_db, statement, params)
+
+    assert not full_scans(plan), f"{name}: {plan}"
+    assert any(index in detail for detail in plan), f"{name} should use {index}: {plan}"
+    # Keyset pages must come out of the index already ordered
+    assert not any("TEMP B-TREE" in detail for detail in plan), f"{name} sorts in memory: {plan}"
+
+
+def _indexes(db_path):
+    # Indexes with their columns, the full-text tables and the triggers that keep them in step
+    with sqlite3.connect(db_path) as conn:
+        objects = set()
+        for kind, table, name, sql in conn.execute(
+            "SELECT type, tbl_name, name, sql FROM sqlite_master"
+            " WHERE (type IN ('index', 'trigger') AND name NOT LIKE 'sqlite_autoindex%')"
+            " OR sql LIKE 'CREATE VIRTUAL TABLE%'"
+        ):
+            if kind == "index":
+                columns = tuple(row[2] for row in conn.execute(f"PRAGMA index_info('{name}')"))
+                unique = sql.lstrip().upper().startswith("CREATE UNIQUE")
+                objects.add((kind, table, name, columns, unique))
+            else:
+                objects.add((kind, table, name, " ".join(sql.split())))
+        return objects
+
+
+def test_schema_indexes_match_migrations(metadata_db, migrated_db):
+    assert _indexes(metadata_db) == _indexes(migrated_db)
+
+
+def test_every_route_statement_is_indexed(client, actors, otp_codes, statement_log, metadata_db, migrated_db):
+    captured = []
+    for _, case in ROUTE_CASES:
+        _, statements = run_case(case, client, actors, otp_codes, statement_log)
+        captured += statements
+
+    problems = set()
+    for route, statement, params in captured:
+        if not statement.lstrip().upper().startswith(PLANNED_STATEMENTS):
+            continue
+        for db_path in (metadata_db, migrated_db):
+            plan = explain(db_path, statement, params)
+            if full_scans(plan):
+                problems.add(f"{route}: {normalize(statement)[:160]} -> {plan}")
+    assert not problems, "\n".join(sorted(problems))
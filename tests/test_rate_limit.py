@@ -0,0 +1,142 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.backend import main
+from src.backend.rate_limit import (
+    MemoryRateLimitBackend,
+    RateLimiter,
+    SlidingWindow,
+    SQLiteRateLimitBackend,
+    TokenBucket,
+    rate_limiter,
+)
+
+
+@pytest.fixture
+def limits_on(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "backend", MemoryRateLimitBackend())
+    monkeypatch.setattr(rate_limiter, "enabled", True)
+    return rate_limiter
+
+
+def test_token_bucket_allows_burst_then_refills():
+    bucket = TokenBucket(3, 1.0)
+    state, results = None, []
+    for _ in range(4):
+        state, check = bucket.apply(state, 100.0)
+        results.append(check.allowed)
+    assert results == [True, True, True, False]
+    assert check.retry_after == pytest.approx(1.0)
+    assert bucket.apply(state, 101.0)[1].allowed
+
+
+def test_sliding_window_weights_the_previous_window():
+    window = SlidingWindow(10, 60)
+    state = None
+    for _ in range(10):
+        state, check = window.apply(state, 60.0)
+        assert check.allowed
+    assert not window.apply(state, 119.0)[1].allowed
+    # Halfway into the next window, half of the previous 10 hits still count
+    state, check = window.apply(state, 150.0)
+    assert check.allowed
+    assert state == (1, 120.0, 10)
+    for _ in range(4):
+        state, check = window.apply(state, 150.0)
+        assert check.allowed
+    assert not window.apply(state, 150.0)[1].allowed
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryRateLimitBackend(max_keys=2)
+    policy = TokenBucket(1, 0.001)
+    backend.hit("a", policy)
+    backend.hit("b", policy)
+    assert not backend.hit("a", policy).allowed
+    backend.hit("c", policy)
+    assert len(backend) == 2 and backend.evictions == 1
+    # "b" was least recently used, so it starts over
+    assert backend.hit("b", policy).allowed
+
+
+def test_sqlite_backend_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "limits.db")
+    first, second = SQLiteRateLimitBackend(path), SQLiteRateLimitBackend(path)
+    policy = SlidingWindow(2, 3600)
+    assert first.hit("login|ip|1.2.3.4", policy).allowed
+    assert second.hit("login|ip|1.2.3.4", policy).allowed
+    assert not first.hit("login|ip|1.2.3.4", policy).allowed
+    assert second.hit("login|ip|5.6.7.8", policy).allowed
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+def test_rejection_spends_no_other_limit(tmp_path, backend):
+    limiter = RateLimiter(
+        MemoryRateLimitBackend() if backend == "memory" else SQLiteRateLimitBackend(str(tmp_path / "limits.db")),
+        enabled=True,
+    )
+    roomy, tight = SlidingWindow(3, 3600), SlidingWindow(1, 3600)
+    assert limiter.hit_all("login", [("ip", "1.2.3.4", roomy), ("email", "a@x", tight)]) is None
+    for _ in range(3):
+        rejected = limiter.hit_all("login", [("ip", "1.2.3.4", roomy), ("email", "a@x", tight)])
+        assert rejected is not None and rejected.retry_after > 0
+    # The rejected attempts above didn't count against the ip limit
+    assert limiter.hit_all("login", [("ip", "1.2.3.4", roomy), ("email", "b@x", tight)]) is None
+    assert limiter.hit_all("login", [("ip", "1.2.3.4", roomy), ("email", "c@x", tight)]) is None
+    assert limiter.rejected == {"login|email": 3}
+
+
+def test_login_is_limited_per_email_before_bcrypt(client, limits_on):
+    attempt = {"email": "Nobody@Tests.example.com", "password": "wrong", "otp": "000000"}
+    statuses = [client.post("/login", json=attempt).status_code for _ in range(6)]
+    assert statuses == [401] * 5 + [429]
+
+    rejected = client.post("/login", json={**attempt, "email": "nobody@tests.example.com"})
+    assert rejected.status_code == 429
+    assert int(rejected.headers["Retry-After"]) >= 1
+    assert client.post("/login", json={**attempt, "email": "somebody@tests.example.com"}).status_code == 401
+    assert 'hoainfo_rate_limited_total{route="login",scope="email_ip"}' in client.get("/metrics").text
+
+
+def test_failed_logins_cannot_lock_out_the_account_elsewhere(client, limits_on):
+    attempt = {"email": "victim@tests.example.com", "password": "wrong", "otp": "000000"}
+    statuses = [client.post("/login", json=attempt).status_code for _ in range(6)]
+    assert statuses[-1] == 429
+
+    elsewhere = TestClient(main.app, client=("203.0.113.9", 50000))
+    assert elsewhere.post("/login", json=attempt).status_code == 401
+
+
+def test_resend_otp_is_limited_per_email(client, limits_on):
+    statuses = [client.post("/resend-otp", params={"email": "spam@tests.example.com"}).status_code for _ in range(4)]
+    assert statuses == [200, 200, 200, 429]
+
+
+def test_verify_otp_is_limited_per_ip(client, limits_on):
+    statuses = [
+        client.post("/verify-otp", json={"email": f"guess{n}@tests.example.com", "otp": "000000"}).status_code
+        for n in range(21)
+    ]
+    assert 429 not in statuses[:20] and statuses[20] == 429
+
+
+def test_sqlite_backend_runs_off_the_event_loop(client, limits_on, monkeypatch, tmp_path):
+    backend = SQLiteRateLimitBackend(str(tmp_path / "limits.db"))
+    on_loop = []
+
+    def hit_all(hits):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        return SQLiteRateLimitBackend.hit_all(backend, hits)
+
+    monkeypatch.setattr(backend, "hit_all", hit_all)
+    monkeypatch.setattr(rate_limiter, "backend", backend)
+
+    statuses = [client.post("/resend-otp", params={"email": "shared@tests.example.com"}).status_code for _ in range(4)]
+    assert statuses == [200, 200, 200, 429]
+    assert on_loop and not any(on_loop)
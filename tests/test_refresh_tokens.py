@@ -0,0 +1,85 @@
+import secrets
+
+from jose import jwt
+from sqlalchemy import update
+from sqlmodel import Session
+
+from src.backend.database import engine
+from src.backend.models import RefreshToken
+from src.backend.refresh_tokens import BloomFilter, revoked_families
+from src.backend.timezones import utc_now
+from tests.route_cases import _register
+
+
+def _login(client, otp_codes):
+    email = _register(client)
+    response = client.post("/login", json={"email": email, "password": "pw", "otp": otp_codes.pop(email)})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _bearer(tokens):
+    return {"Authorization": f"Bearer {tokens['access_token']}"}
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(500, 0.01)
+    members = [secrets.token_hex(16) for _ in range(500)]
+    for member in members:
+        bloom.add(member)
+    assert all(member in bloom for member in members)
+    strangers = sum(secrets.token_hex(16) in bloom for _ in range(5000))
+    assert strangers < 5000 * 0.05
+
+
+def test_refresh_rotates_and_detects_reuse(client, otp_codes):
+    tokens = _login(client, otp_codes)
+    rotated = client.post("/token/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert rotated.status_code == 200, rotated.text
+    rotated = rotated.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+    assert client.get("/messages/unread", headers=_bearer(rotated)).status_code == 200
+
+    # Replaying the first token signs the whole family out, rotated tokens included
+    replay = client.post("/token/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert replay.status_code == 401
+    assert client.post("/token/refresh", json={"refresh_token": rotated["refresh_token"]}).status_code == 401
+    assert client.get("/messages/unread", headers=_bearer(rotated)).status_code == 401
+
+
+def test_revoke_signs_out_access_token(client, otp_codes):
+    tokens = _login(client, otp_codes)
+    assert client.get("/messages/unread", headers=_bearer(tokens)).status_code == 200
+    assert client.post("/token/revoke", json={"refresh_token": tokens["refresh_token"]}).status_code == 200
+    assert client.get("/messages/unread", headers=_bearer(tokens)).status_code == 401
+    assert client.post("/token/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 401
+
+
+def test_unknown_refresh_token_is_rejected(client):
+    assert client.post("/token/refresh", json={"refresh_token": "not-a-token"}).status_code == 401
+    assert client.post("/token/revoke", json={"refresh_token": "not-a-token"}).status_code == 200
+
+
+def test_filter_false_positive_is_settled_by_lookup(client, otp_codes):
+    tokens = _login(client, otp_codes)
+    family_id = jwt.get_unverified_claims(tokens["access_token"])["fam"]
+    # As if the family collided with a revoked one in the filter
+    revoked_families._filter.add(family_id)
+    lookups = revoked_families.lookups
+    assert client.get("/messages/unread", headers=_bearer(tokens)).status_code == 200
+    assert client.get("/messages/unread", headers=_bearer(tokens)).status_code == 200
+    assert revoked_families.lookups == lookups + 1
+    metrics = client.get("/metrics").text
+    assert f'hoainfo_auth_cache_misses_total{{snapshot="revoked_families"}} {lookups + 1}' in metrics
+    assert 'hoainfo_auth_cache_hits_total{snapshot="token_versions"}' in metrics
+
+
+def test_revocation_by_another_worker_applies_on_reload(client, otp_codes):
+    tokens = _login(client, otp_codes)
+    family_id = jwt.get_unverified_claims(tokens["access_token"])["fam"]
+    with Session(engine) as session:
+        session.exec(update(RefreshToken).where(RefreshToken.family_id == family_id).values(revoked_at=utc_now()))
+        session.commit()
+    assert client.get("/messages/unread", headers=_bearer(tokens)).status_code == 200
+    revoked_families.refresh()
+    assert client.get("/messages/unread", headers=_bearer(tokens)).status_code == 401
@@ -0,0 +1,46 @@
+# Community ids tokenize into FTS terms, so one id can be a phrase inside another
+def test_search_is_scoped_to_exact_community(client, sign_in):
+    near = sign_in("near@oak-ridge.example.com", community_id="oak-ridge")
+    far = sign_in("far@oak-ridge-north.example.com", community_id="oak-ridge-north")
+    for headers, title in ((near, "Gate near"), (far, "Gate far")):
+        response = client.post("/complaints", json={"title": title, "description": "Gate stuck"}, headers=headers)
+        assert response.status_code == 200, response.text
+
+    for headers, title in ((near, "<mark>Gate</mark> near"), (far, "<mark>Gate</mark> far")):
+        response = client.get("/search", params={"q": "gate"}, headers=headers)
+        assert response.status_code == 200, response.text
+        assert [hit["title"] for hit in response.json()["items"]] == [title]
+
+
+def test_search_survives_rowids_moving(tmp_path):
+    from sqlalchemy import text
+    from sqlmodel import SQLModel
+
+    from src.backend.database import make_engine
+    from src.backend.models import Complaint
+
+    engine = make_engine(f"sqlite:///{tmp_path / 'fts.db'}")
+    SQLModel.metadata.create_all(engine, tables=[Complaint.__table__])
+    match = text("SELECT c.id FROM complaint_fts JOIN complaint AS c ON c.search_rowid = complaint_fts.rowid"
+                 " WHERE complaint_fts MATCH 'gate'")
+    with engine.begin() as conn:
+        conn.execute(Complaint.__table__.insert(), [
+            {"id": "c-1", "title": "Gate", "description": "Stuck", "user_id": "u", "community_id": "x"},
+            {"id": "c-2", "title": "Pool", "description": "Cold", "user_id": "u", "community_id": "x"},
+        ])
+        assert conn.exec_driver_sql("SELECT id, search_rowid FROM complaint ORDER BY id").all() == [
+            ("c-1", 1), ("c-2", 2),
+        ]
+        # What VACUUM or a batch recreate can do to the implicit rowid
+        for rowid, complaint_id in ((100, "c-1"), (1, "c-2"), (2, "c-1")):
+            conn.exec_driver_sql("UPDATE complaint SET rowid = ? WHERE id = ?", (rowid, complaint_id))
+        assert conn.execute(match).scalars().all() == ["c-1"]
+
+        conn.execute(Complaint.__table__.insert(), [
+            {"id": "c-3", "title": "Gate", "description": "Again", "user_id": "u", "community_id": "x"},
+        ])
+        conn.exec_driver_sql("DELETE FROM complaint WHERE id = 'c-1'")
+        assert conn.execute(match).scalars().all() == ["c-3"]
+        # Raises if the index and the content table disagree
+        conn.exec_driver_sql("INSERT INTO complaint_fts(complaint_fts, rank) VALUES ('integrity-check', 1)")
+    engine.dispose()
@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from src.backend.uploads import MAX_FORM_FIELDS, PhotoStore, parse_photo_form
+
+BOUNDARY = "testboundary"
+JPEG = b"\xff\xd8\xff\xe0" + b"\x00" * 64
+
+
+def _part(name: str, value: bytes, filename: str = None) -> bytes:
+    disposition = f'form-data; name="{name}"' + (f'; filename="{filename}"' if filename else "")
+    return f"--{BOUNDARY}\r\nContent-Disposition: {disposition}\r\n\r\n".encode() + value + b"\r\n"
+
+
+def _body(*parts: bytes) -> bytes:
+    return b"".join(parts) + f"--{BOUNDARY}--\r\n".encode()
+
+
+def _parse(body: bytes, store: PhotoStore, content_length="auto"):
+    headers = [(b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode())]
+    if content_length == "auto":
+        content_length = str(len(body))
+    if content_length is not None:
+        headers.append((b"content-length", content_length.encode()))
+    chunks = [body[i:i + 1024] for i in range(0, len(body), 1024)] or [b""]
+
+    async def receive():
+        chunk = chunks.pop(0)
+        return {"type": "http.request", "body": chunk, "more_body": bool(chunks)}
+
+    request = Request({"type": "http", "method": "POST", "headers": headers}, receive)
+    return asyncio.run(parse_photo_form(request, store=store))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PhotoStore(str(tmp_path))
+
+
+def test_parses_fields_and_photo(store):
+    fields, digest = _parse(_body(_part("title", b"Gate"), _part("photo", JPEG, "a.jpg")), store)
+    assert fields == {"title": "Gate"}
+    assert store.exists(digest)
+
+
+def test_non_numeric_content_length_is_a_bad_request(store):
+    with pytest.raises(HTTPException) as error:
+        _parse(_body(_part("title", b"Gate")), store, content_length="lots")
+    assert error.value.status_code == 400
+
+
+def test_second_photo_part_is_rejected(store):
+    body = _body(_part("photo", JPEG, "a.jpg"), _part("photo", JPEG, "b.jpg"))
+    with pytest.raises(HTTPException) as error:
+        _parse(body, store)
+    assert error.value.status_code == 400
+    assert not any(path.is_file() for path in store.root.rglob("*"))
+
+
+def test_field_count_is_capped_without_content_length(store):
+    body = _body(*(_part(f"field{n}", b"x") for n in range(MAX_FORM_FIELDS + 1)))
+    with pytest.raises(HTTPException) as error:
+        _parse(body, store, content_length=None)
+    assert error.value.status_code == 413